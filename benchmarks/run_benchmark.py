@@ -0,0 +1,224 @@
+"""
+End-to-end benchmark of enrich_from_csv against local stand-in backends.
+
+For each size, a synthetic Airtable-like CSV is generated (with duplicated
+people written in different LinkedIn URL forms, and rows without LinkedIn),
+then `enrich_from_csv.main()` runs in a fresh process against the BrightData and
+OpenAI stand-ins of stub_servers.py, with empty caches. Reported per run:
+rows/s, p50/p95 row latency, peak RSS and the number of backend requests.
+
+Usage:
+    python benchmarks/run_benchmark.py [--sizes 1000,10000,100000] [--time-scale 0.01]
+                                       [--profile benchmarks/latency_profile.json] [--json report.json]
+                                       [--method llm|tiered|embedding|manual]
+
+Latencies of the profile are multiplied by --time-scale (BrightData polling
+interval and timeout included), so 0.01 turns a 20 s snapshot into 0.2 s.
+Client-side rate limits are disabled unless --keep-rate-limits is given, since
+they are not scaled. Pipeline settings (ENRICH_WORKERS, SCRAPER_CONCURRENCY,
+LLM_GENERATION_MODE, ...) are taken from the environment as usual.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from stub_servers import BrightDataStub, OpenAIStub, load_latency_profile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JOB_TITLES = ["Data Engineer", "Data Scientist", "ML Engineer", "Développeur Web", "Chef de projet data",
+              "Ingénieur MLOps", "Analyste BI", "Chercheur NLP", "CTO", "Product Manager"]
+DOMAINS = ["Santé", "Banque", "Énergie", "Retail", "Industrie", "Assurance", "Tech"]
+
+
+def _url_variant(public_id: str, rng: random.Random) -> str:
+    """The same profile as it shows up in exports: locale subdomains, query strings, bare IDs..."""
+    return rng.choice([
+        f"https://www.linkedin.com/in/{public_id}",
+        f"https://www.linkedin.com/in/{public_id}/",
+        f"https://fr.linkedin.com/in/{public_id}?originalSubdomain=fr",
+        f"linkedin.com/in/{public_id.capitalize()}",
+        public_id,
+    ])
+
+
+def generate_csv(path: str, rows: int, seed: int = 0, linkedin_ratio: float = 0.7, duplicate_ratio: float = 0.2):
+    """
+    Synthetic input: `linkedin_ratio` of the rows have a LinkedIn profile, and about
+    `duplicate_ratio` of the rows repeat a person already present in the file.
+    """
+    rng = random.Random(seed)
+    people = max(1, int(rows * (1 - duplicate_ratio)))
+    records = []
+    for i in range(rows):
+        person = i if i < people else rng.randrange(people)
+        has_linkedin = (person * 7919 % 100) < linkedin_ratio * 100
+        records.append({
+            "Prénom": f"Prenom{person}",
+            "Nom": f"Nom{person}",
+            "Email": f"person{person}@example.com" if i == person or rng.random() < 0.5 else "",
+            "Métier": JOB_TITLES[person % len(JOB_TITLES)],
+            "Intérêt": "",
+            "Domain": DOMAINS[person % len(DOMAINS)],
+            "Description": "",
+            "Linkedin": _url_variant(f"person-{person}", rng) if has_linkedin else "",
+        })
+    rng.shuffle(records)
+    pd.DataFrame(records).to_csv(path, index=False)
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_child(input_csv: str, workdir: str, report_path: str):
+    """Runs inside the benchmark subprocess: one enrich_from_csv run, timed row by row."""
+    import resource
+
+    import enrich_from_csv as enrich
+    from core import runner
+    from utils import metrics
+
+    latencies = []
+
+    def timed_ordered_map(fn, items, workers=8):
+        def timed(item):
+            start = time.perf_counter()
+            try:
+                return fn(item)
+            finally:
+                latencies.append(time.perf_counter() - start)
+        return runner.ordered_map(timed, items, workers)
+
+    enrich.ordered_map = timed_ordered_map
+    enrich.INPUT_CSV = input_csv
+    enrich.OUTPUT_CSV = os.path.join(workdir, "enriched_output.csv")
+    enrich.CHECKPOINT_PATH = os.path.join(workdir, "checkpoint.jsonl")
+
+    start = time.perf_counter()
+    enrich.main()
+    elapsed = time.perf_counter() - start
+
+    output = pd.read_csv(enrich.OUTPUT_CSV, dtype=str, keep_default_na=False)
+    report = {
+        "rows": len(output),
+        "enriched_rows": int((output["Description"] != "").sum()),
+        "seconds": elapsed,
+        "rows_per_second": len(output) / elapsed if elapsed else 0.0,
+        "p50_row_latency": _percentile(latencies, 0.50),
+        "p95_row_latency": _percentile(latencies, 0.95),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stages": metrics.current_run().summary(),
+        "counters": metrics.current_run().counters,
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+
+def run_size(rows: int, args, profile: dict) -> dict:
+    workdir = tempfile.mkdtemp(prefix=f"omni_bench_{rows}_")
+    input_csv = os.path.join(workdir, "input.csv")
+    generate_csv(input_csv, rows, seed=args.seed, linkedin_ratio=args.linkedin_ratio)
+
+    brightdata = BrightDataStub(profile, args.time_scale, seed=args.seed).start()
+    openai = OpenAIStub(profile, args.time_scale, seed=args.seed).start()
+    scale = args.time_scale
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([os.path.join(ROOT, "src"), ROOT]),
+        PYTHON_DOTENV_DISABLED="1",  # never pick up real credentials from .env
+        SCRAPER_TYPE="brightdata",
+        BRIGHTDATA_API_KEY="bench",
+        BRIGHTDATA_DATASET_ID="bench",
+        BRIGHTDATA_API_BASE=brightdata.base_url_v3,
+        BRIGHTDATA_POLL_INTERVAL=str(float(os.getenv("BRIGHTDATA_POLL_INTERVAL", 3)) * scale),
+        BRIGHTDATA_TIMEOUT=str(float(os.getenv("BRIGHTDATA_TIMEOUT", 120)) * scale),
+        HTTP_BACKOFF_FACTOR=str(float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5)) * scale),
+        OPENAI_API_KEY="bench",
+        OPENAI_BASE_URL=openai.base_url_v1,
+        SCRAPE_CACHE_BACKEND="sqlite",
+        SCRAPE_CACHE_PATH=os.path.join(workdir, "scrape_cache.sqlite"),
+        LLM_CACHE_ENABLED="false",
+        RETRY_QUEUE_PATH=os.path.join(workdir, "retry_queue.sqlite"),
+        LOG_DIRECTORY=os.path.join(workdir, "logs"),
+        ENRICH_METHOD=args.method,
+    )
+    if not args.keep_rate_limits:
+        for provider in ("BRIGHTDATA", "OPENAI"):
+            env[f"{provider}_RATE_LIMIT"] = "0"
+
+    report_path = os.path.join(workdir, "report.json")
+    log_path = os.path.join(workdir, "run.log")
+    try:
+        with open(log_path, "w", encoding="utf-8") as log:
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", input_csv, workdir, report_path],
+                env=env, cwd=workdir, stdout=log, stderr=subprocess.STDOUT, check=True,
+            )
+    finally:
+        brightdata.stop()
+        openai.stop()
+
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    report["backend_requests"] = {**brightdata.requests, **openai.requests}
+    report["workdir"] = workdir
+    return report
+
+
+def print_table(reports: list):
+    header = f"{'rows':>8} {'enriched':>9} {'seconds':>9} {'rows/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'RSS MB':>8} {'triggers':>9} {'LLM calls':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in reports:
+        requests = r["backend_requests"]
+        llm_calls = requests.get("openai_chat", 0) + requests.get("openai_completion", 0)
+        print(
+            f"{r['rows']:>8} {r['enriched_rows']:>9} {r['seconds']:>9.1f} {r['rows_per_second']:>9.1f} "
+            f"{r['p50_row_latency'] * 1000:>9.0f} {r['p95_row_latency'] * 1000:>9.0f} {r['peak_rss_mb']:>8.0f} "
+            f"{requests.get('brightdata_trigger', 0):>9} {llm_calls:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark enrich_from_csv against local stand-in backends.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated row counts")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Multiplier applied to every latency")
+    parser.add_argument("--profile", default=None, help="Latency profile JSON (modelled or recorded samples)")
+    parser.add_argument("--linkedin-ratio", type=float, default=0.7, help="Share of rows with a LinkedIn URL")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--method", default="llm", choices=["llm", "tiered", "embedding", "manual"],
+                        help="Tagging method (ENRICH_METHOD)")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="Keep the client-side rate limits")
+    parser.add_argument("--json", default=None, help="Also write the reports to this JSON file")
+    parser.add_argument("--child", nargs=3, metavar=("INPUT_CSV", "WORKDIR", "REPORT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    profile = load_latency_profile(args.profile)
+    reports = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        print(f"▶️ {size} rows...", flush=True)
+        reports.append(run_size(size, args, profile))
+    print_table(reports)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
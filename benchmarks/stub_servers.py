@@ -0,0 +1,251 @@
+"""
+Local stand-in servers for the BrightData dataset API and the OpenAI completions API.
+
+Every endpoint answers after a latency drawn from a latency profile (see
+latency_profile.json) and fails with a configurable error rate, so the pipeline
+can be benchmarked end to end without network access or paid calls.
+
+A profile entry is either modelled or recorded:
+    {"median": 0.8, "sigma": 0.4, "error_rate": 0.01, "error_status": 429}   log-normal
+    {"samples": [0.61, 0.74, 1.9, ...], "error_rate": 0.0}                  replayed at random
+
+All latencies are multiplied by `time_scale` so that long runs stay practical.
+
+Example usage:
+    profile = load_latency_profile()
+    brightdata = BrightDataStub(profile, time_scale=0.01).start()
+    openai = OpenAIStub(profile, time_scale=0.01).start()
+    os.environ["BRIGHTDATA_API_BASE"] = brightdata.base_url
+    os.environ["OPENAI_BASE_URL"] = openai.base_url
+"""
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(__file__), "latency_profile.json")
+
+# Tags the completion stand-in picks from (a subset of core.schema.InterestTag)
+STUB_TAGS = ["Data Engineering", "MLOps", "Machine Learning", "NLP", "Computer Vision", "Data Analytics"]
+
+
+def load_latency_profile(path: Optional[str] = None) -> Dict[str, dict]:
+    with open(path or DEFAULT_PROFILE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LatencyModel:
+    """Latency and error distribution of one endpoint."""
+
+    def __init__(self, spec: dict, time_scale: float = 1.0, rng: Optional[random.Random] = None):
+        self.samples = spec.get("samples")
+        self.median = spec.get("median", 0.0)
+        self.sigma = spec.get("sigma", 0.0)
+        self.error_rate = spec.get("error_rate", 0.0)
+        self.error_status = spec.get("error_status", 500)
+        self.time_scale = time_scale
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def latency(self) -> float:
+        with self._lock:
+            if self.samples:
+                value = self.rng.choice(self.samples)
+            elif self.median:
+                value = self.median * math.exp(self.rng.gauss(0, self.sigma))
+            else:
+                value = 0.0
+        return value * self.time_scale
+
+    def error(self) -> Optional[int]:
+        with self._lock:
+            return self.error_status if self.rng.random() < self.error_rate else None
+
+
+class _StubServer:
+    """ThreadingHTTPServer running in a daemon thread; subclasses implement `route`."""
+
+    endpoints: Tuple[str, ...] = ()
+
+    def __init__(self, profile: Dict[str, dict], time_scale: float = 1.0, seed: int = 0):
+        rng = random.Random(seed)
+        self.models = {
+            name: LatencyModel(profile.get(name, {}), time_scale, random.Random(rng.random()))
+            for name in self.endpoints
+        }
+        self.time_scale = time_scale
+        self.rng = random.Random(rng.random())
+        self.requests = {name: 0 for name in self.endpoints}
+        self._lock = threading.Lock()
+        self._server = None
+        self.base_url = ""
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                endpoint, status, payload = stub.dispatch(self.command, self.path, body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def dispatch(self, method: str, path: str, body) -> Tuple[str, int, object]:
+        endpoint, handler = self.route(method, urlsplit(path).path)
+        if endpoint is None:
+            return "unknown", 404, {"error": f"No stub for {method} {path}"}
+        with self._lock:
+            self.requests[endpoint] += 1
+        model = self.models[endpoint]
+        time.sleep(model.latency())
+        status = model.error()
+        if status is not None:
+            return endpoint, status, {"error": {"message": f"Injected {status}", "type": "stub_error"}}
+        return endpoint, 200, handler(body)
+
+    def route(self, method: str, path: str):
+        raise NotImplementedError
+
+
+class BrightDataStub(_StubServer):
+    """
+    /datasets/v3/trigger, /progress/{id} and /snapshot/{id}. A snapshot becomes ready
+    `snapshot_ready` seconds (sampled per snapshot) after its trigger; a share of the
+    URLs (`dead_page_rate`) come back as dead-page records.
+    """
+
+    endpoints = ("brightdata_trigger", "brightdata_progress", "brightdata_snapshot", "snapshot_ready")
+
+    def __init__(self, profile: Dict[str, dict], time_scale: float = 1.0, seed: int = 0):
+        super().__init__(profile, time_scale, seed)
+        self.dead_page_rate = profile.get("brightdata_snapshot", {}).get("dead_page_rate", 0.0)
+        self.snapshots: Dict[str, dict] = {}
+
+    @property
+    def base_url_v3(self) -> str:
+        return f"{self.base_url}/datasets/v3"
+
+    def route(self, method: str, path: str):
+        if method == "POST" and path.endswith("/trigger"):
+            return "brightdata_trigger", self._trigger
+        snapshot_id = path.rsplit("/", 1)[-1]
+        if "/progress/" in path:
+            return "brightdata_progress", lambda body: self._progress(snapshot_id)
+        if "/snapshot/" in path:
+            return "brightdata_snapshot", lambda body: self._snapshot(snapshot_id)
+        return None, None
+
+    def _trigger(self, body):
+        snapshot_id = f"s_{uuid.uuid4().hex[:12]}"
+        ready_at = time.monotonic() + self.models["snapshot_ready"].latency()
+        with self._lock:
+            self.snapshots[snapshot_id] = {"urls": [item["url"] for item in body or []], "ready_at": ready_at}
+        return {"snapshot_id": snapshot_id}
+
+    def _progress(self, snapshot_id):
+        snapshot = self.snapshots.get(snapshot_id)
+        if snapshot is None:
+            return {"status": "failed"}
+        return {"status": "ready" if time.monotonic() >= snapshot["ready_at"] else "running"}
+
+    def _snapshot(self, snapshot_id):
+        with self._lock:
+            snapshot = self.snapshots.pop(snapshot_id, {"urls": []})
+        records = []
+        for url in snapshot["urls"]:
+            with self._lock:
+                dead = self.rng.random() < self.dead_page_rate
+            if dead:
+                records.append({"input": {"url": url}, "warning_code": "dead_page", "warning": "Page not found"})
+                continue
+            seed = int(hashlib.md5(url.encode("utf-8")).hexdigest(), 16)
+            records.append({
+                "input": {"url": url},
+                "about": f"Passionné par le {STUB_TAGS[seed % len(STUB_TAGS)]} et la data. " * 3,
+                "current_company": {"title": "Data Engineer", "name": f"Company {seed % 500}"},
+            })
+        return records
+
+
+class OpenAIStub(_StubServer):
+    """/v1/chat/completions (JSON answer of the single-call mode) and /v1/completions (split mode)."""
+
+    endpoints = ("openai_chat", "openai_completion")
+
+    @property
+    def base_url_v1(self) -> str:
+        return f"{self.base_url}/v1"
+
+    def route(self, method: str, path: str):
+        if method == "POST" and path.endswith("/chat/completions"):
+            return "openai_chat", self._chat
+        if method == "POST" and path.endswith("/completions"):
+            return "openai_completion", self._completion
+        return None, None
+
+    @staticmethod
+    def _tags_for(text: str) -> list:
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest(), 16)
+        return [STUB_TAGS[seed % len(STUB_TAGS)], STUB_TAGS[(seed >> 8) % len(STUB_TAGS)]]
+
+    @staticmethod
+    def _usage(prompt: str, completion: str) -> dict:
+        prompt_tokens, completion_tokens = len(prompt) // 4 + 1, len(completion) // 4 + 1
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    def _chat(self, body):
+        prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+        tags = list(dict.fromkeys(self._tags_for(prompt)))
+        content = json.dumps({"Intérêt": tags, "Description": f"Profil orienté {' et '.join(tags)}."}, ensure_ascii=False)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": self._usage(prompt, content),
+        }
+
+    def _completion(self, body):
+        prompt = body.get("prompt", "")
+        tags = list(dict.fromkeys(self._tags_for(prompt)))
+        text = ", ".join(tags) if body.get("max_tokens", 0) <= 100 else f"Profil orienté {' et '.join(tags)}."
+        return {
+            "id": f"cmpl-{uuid.uuid4().hex[:12]}",
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{"index": 0, "text": text, "finish_reason": "stop", "logprobs": None}],
+            "usage": self._usage(prompt, text),
+        }
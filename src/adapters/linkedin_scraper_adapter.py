@@ -1,37 +1,140 @@
 # src/adapters/linkedin_scrapper_adapter.py
 import os
+import threading
+from importlib import import_module
+from typing import Dict, List, Optional, Union
 from dotenv import load_dotenv
+from loguru import logger
+from utils.throttle import BackendUnavailable, CircuitOpenError, is_backend_failure
 
-load_dotenv()  # Load environment variables from .env file
+# Scraper name -> (module, class). Modules are imported, and scrapers built
+# (credential checks, SDK logins), only the first time a scraper is used.
+SCRAPER_REGISTRY = {
+    "brightdata": ("scrapers.brightdata_scraper", "BrightDataScraper"),
+    "proxycurl": ("scrapers.proxycurl_scraper", "ProxycurlScraper"),
+    "linkedin_api": ("scrapers.linkedin_api_scraper", "LinkedInApiScraper"),
+    "mock": ("scrapers.mock_scraper", "MockScraper"),
+}
 
-SCRAPER_TYPE = os.getenv("SCRAPER_TYPE", "mock")
+_instances = {}
+_lock = threading.Lock()
+_env_loaded = False
 
-if SCRAPER_TYPE == "proxycurl":
-    from scrapers.proxycurl_scraper import ProxycurlScraper as ActiveScraper
-    scraper = ActiveScraper()
-    def format_url(linkedin_url: str) -> str:
-        return linkedin_url.rstrip("/").split("/")[-1]  # public_id
+ScraperSelection = Optional[Union[str, List[str]]]
 
-elif SCRAPER_TYPE == "linkedin_api":
-    from scrapers.linkedin_api_scraper import LinkedInApiScraper as ActiveScraper
-    li_at_cookie = os.getenv("LINKEDIN_LI_AT")
-    scraper = ActiveScraper(li_at_cookie)
-    def format_url(linkedin_url: str) -> str:
-        return linkedin_url.rstrip("/").split("/")[-1]  # public_id
 
-elif SCRAPER_TYPE == "brightdata":
-    from scrapers.brightdata_scraper import BrightDataScraper as ActiveScraper
-    scraper = ActiveScraper()
-    def format_url(linkedin_url: str) -> str:
-        return linkedin_url.strip()  # full URL, no transformation
+def register_scraper(name: str, module_path: str, class_name: str):
+    """Register (or replace) a scraper implementation under `name`."""
+    with _lock:
+        SCRAPER_REGISTRY[name] = (module_path, class_name)
+        _instances.pop(name, None)
 
-else:
-    from scrapers.mock_scraper import MockScraper as ActiveScraper
-    scraper = ActiveScraper()
-    def format_url(linkedin_url: str) -> str:
-        return linkedin_url.rstrip("/").split("/")[-1]  # fallback to ID
 
+def get_default_scraper_type() -> str:
+    """SCRAPER_TYPE from the environment; unknown values fall back to the mock scraper."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()  # Load environment variables from .env file
+        _env_loaded = True
+    scraper_type = os.getenv("SCRAPER_TYPE", "mock")
+    return scraper_type if scraper_type in SCRAPER_REGISTRY else "mock"
 
-def scrape_linkedin_profile(linkedin_url: str):
-    formatted = format_url(linkedin_url)
-    return scraper.scrape(formatted)
+
+def get_scraper(name: Optional[str] = None):
+    """Return the (lazily constructed, shared) scraper registered under `name`."""
+    name = name or get_default_scraper_type()
+    if name not in SCRAPER_REGISTRY:
+        raise ValueError(f"Unknown scraper: {name}. Available: {', '.join(SCRAPER_REGISTRY)}")
+    with _lock:
+        if name not in _instances:
+            module_path, class_name = SCRAPER_REGISTRY[name]
+            scraper_class = getattr(import_module(module_path), class_name)
+            _instances[name] = scraper_class()
+        return _instances[name]
+
+
+def _selected(scraper_type: ScraperSelection) -> List[str]:
+    if scraper_type is None:
+        return [get_default_scraper_type()]
+    if isinstance(scraper_type, str):
+        return [scraper_type]
+    return list(scraper_type)
+
+
+def scrape_linkedin_profile(linkedin_url: str, scraper_type: ScraperSelection = None):
+    """
+    Scrape one profile. `scraper_type` may be a scraper name or a list of names
+    tried in order until one succeeds (defaults to SCRAPER_TYPE).
+    """
+    errors = []
+    open_circuits = []
+    transient = False
+    for name in _selected(scraper_type):
+        try:
+            # Building the scraper may fail too (missing credentials, import error): try the next one
+            scraper = get_scraper(name)
+            return scraper.scrape(scraper.format_url(linkedin_url))
+        except CircuitOpenError as e:
+            open_circuits.append(e)
+            errors.append(f"{name}: {e}")
+        except Exception as e:
+            transient = transient or is_backend_failure(e)
+            errors.append(f"{name}: {e}")
+    # Only unhealthy backends were tried: the row can be retried once a circuit closes
+    if open_circuits and len(open_circuits) == len(errors):
+        raise open_circuits[0]
+    message = f"All scrapers failed for {linkedin_url}: {'; '.join(errors)}"
+    # A provider was down or rate limited: a later retry may succeed, unlike for a missing profile
+    if transient or open_circuits:
+        raise BackendUnavailable(message)
+    raise ValueError(message)
+
+
+def scrape_linkedin_profiles(linkedin_urls: list, scraper_type: ScraperSelection = None) -> Dict[str, dict]:
+    """
+    Scrape several profiles at once. Scrapers with a native batch API (BrightData)
+    trigger a single snapshot for all cache misses; URLs a scraper could not resolve
+    are passed on to the next selected scraper.
+    Returns:
+        dict: {original linkedin_url: profile dict} for the URLs that could be scraped.
+    """
+    profiles = {}
+    remaining = list(dict.fromkeys(linkedin_urls))
+    for name in _selected(scraper_type):
+        if not remaining:
+            break
+        try:
+            scraper = get_scraper(name)
+            formatted = {linkedin_url: scraper.format_url(linkedin_url) for linkedin_url in remaining}
+            scraped = scraper.scrape_many(list(formatted.values()))
+        except CircuitOpenError as e:
+            logger.warning("⚠️ {}: skipping {} for {} URL(s)", e, name, len(remaining))
+            continue
+        except Exception as e:
+            logger.warning("⚠️ {} failed for {} URL(s): {}", name, len(remaining), e)
+            continue
+        for linkedin_url, key in formatted.items():
+            if key in scraped:
+                profiles[linkedin_url] = scraped[key]
+        remaining = [linkedin_url for linkedin_url in remaining if linkedin_url not in profiles]
+    return profiles
+
+
+def prefetch_linkedin_profiles(linkedin_urls: list, scraper_type: ScraperSelection = None) -> int:
+    """
+    Warm the cache of the selected scrapers that have a native batch API (one BrightData
+    snapshot per batch of cache misses), so that the `scrape_linkedin_profile` calls that
+    follow are cache hits. Other scrapers are left to the per-URL path.
+    Returns:
+        int: Number of profiles available in the cache.
+    """
+    names = []
+    for name in _selected(scraper_type):
+        try:
+            if get_scraper(name).NATIVE_BATCH:
+                names.append(name)
+        except Exception as e:
+            logger.debug("{} unavailable for prefetching: {}", name, e)
+    if not names or not linkedin_urls:
+        return 0
+    return len(scrape_linkedin_profiles(linkedin_urls, names))
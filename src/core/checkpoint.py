@@ -0,0 +1,120 @@
+"""
+Append-only checkpoint journal for CSV enrichment runs.
+
+Every successfully enriched row is appended as one JSON line keyed by the row
+identity, so a crashed run can be restarted: rows found in the journal are not
+processed again and their results are merged into the output.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Columns identifying a contact; the job title and domain are included so that
+# rows without email/LinkedIn are still told apart.
+IDENTITY_COLUMNS = ["Email", "Linkedin", "Prénom", "Nom", "Métier", "Domain"]
+
+
+def row_key(row) -> str:
+    """Stable identity of an input row, independent of its position in the file."""
+    values = []
+    for column in IDENTITY_COLUMNS:
+        value = row.get(column, "")
+        values.append("" if pd.isna(value) else str(value).strip().lower())
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()
+
+
+class CheckpointJournal:
+    """Thread-safe append-only JSONL journal of enriched rows."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._drop_torn_tail()
+
+    def _drop_torn_tail(self):
+        """Cut a last line left incomplete by a crash, so the next entry starts on its own line."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # Walk back to the end of the last complete line
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            f.truncate(end)
+
+    def load(self) -> Dict[str, Dict[str, str]]:
+        """Read all journaled results; the last entry for a key wins, a torn last line is ignored."""
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[entry["key"]] = {"Intérêt": entry["Intérêt"], "Description": entry["Description"]}
+        return done
+
+    def load_offsets(self) -> Dict[str, int]:
+        """
+        Index the journal without keeping results in memory: {key: byte offset of its last entry}.
+        Use `read_at` to fetch a result when it is needed.
+        """
+        offsets = {}
+        if not os.path.exists(self.path):
+            return offsets
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    offsets[json.loads(line)["key"]] = offset
+                except (ValueError, KeyError):
+                    pass
+                offset += len(line)
+        return offsets
+
+    def read_entry_at(self, offset: int) -> Dict:
+        """Whole journal entry (result, "at" timestamp and labels) at `offset`."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def read_at(self, offset: int) -> Dict[str, str]:
+        entry = self.read_entry_at(offset)
+        return {"Intérêt": entry["Intérêt"], "Description": entry["Description"]}
+
+    def append(self, key: str, result: Dict[str, str], extra: Optional[Dict] = None):
+        # Labels never overwrite the fields the journal is read back from
+        entry = dict(extra or {})
+        entry.update({
+            "key": key,
+            "Intérêt": result["Intérêt"],
+            "Description": result["Description"],
+            "at": datetime.now(timezone.utc).isoformat(),
+        })
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
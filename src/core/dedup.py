@@ -0,0 +1,140 @@
+"""
+Cross-row deduplication for the enrichment pipeline.
+
+Airtable exports list the same person several times (one row per event or
+membership). Rows are grouped under an enrichment key:
+    - "url:<canonical LinkedIn URL>" when the row has a LinkedIn profile;
+    - "text:<job title>|<domain>" (accent/case folded) for the fallback text otherwise.
+Each key is scraped and generated once and the result is fanned back out to every
+row of the group.
+
+Example usage:
+    canonicalize_linkedin_url("https://FR.linkedin.com/in/Jane-Doe/?originalSubdomain=fr")
+    # -> "https://www.linkedin.com/in/jane-doe"
+
+    flight = SingleFlight(count_enrichment_keys(rows))
+    result = flight.run(enrichment_key(row), lambda: scrape_and_enrich(row, limits, previous))
+"""
+import re
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, Optional, TypeVar
+from urllib.parse import quote, unquote, urlsplit
+
+import pandas as pd
+
+from core.text_normalization import fold_text
+
+R = TypeVar("R")
+
+LINKEDIN_PROFILE_PREFIX = "https://www.linkedin.com/in/"
+
+# A bare public identifier, as typed in the Airtable "Linkedin" column
+_PUBLIC_ID = re.compile(r"^[\w\-%]+$")
+
+
+def _cell(row, column: str) -> str:
+    value = row.get(column, "")
+    return "" if pd.isna(value) else str(value).strip()
+
+
+def canonicalize_linkedin_url(value: str) -> str:
+    """
+    Canonical form of a LinkedIn profile reference: scheme, locale subdomain (fr., uk., m.),
+    query string, fragment, trailing slash, sub-pages and case are normalized away, and bare
+    public IDs ("jane-doe", "in/jane-doe") become full URLs. Values that are not LinkedIn
+    profile references are returned stripped but otherwise unchanged.
+    """
+    value = (value or "").strip()
+    if not value:
+        return ""
+
+    if _PUBLIC_ID.match(value):
+        public_id = value
+    else:
+        candidate = value if "://" in value else f"https://{value.lstrip('/')}"
+        parts = urlsplit(candidate)
+        host = parts.netloc.lower().split(":")[0]
+        if host == "in" or not (host == "linkedin.com" or host.endswith(".linkedin.com")):
+            # "in/jane-doe" parses with "in" as the host
+            if host == "in" and parts.path.strip("/"):
+                public_id = parts.path.strip("/").split("/")[0]
+            else:
+                return value
+        else:
+            segments = [segment for segment in parts.path.split("/") if segment]
+            if len(segments) < 2 or segments[0].lower() != "in":
+                return value
+            public_id = segments[1]
+
+    public_id = unquote(public_id).strip().lower()
+    return LINKEDIN_PROFILE_PREFIX + quote(public_id, safe="-_.~")
+
+
+def enrichment_key(row) -> Optional[str]:
+    """Key under which rows share one scrape + generation, or None if the row has nothing to enrich."""
+    linkedin_url = canonicalize_linkedin_url(_cell(row, "Linkedin"))
+    if linkedin_url:
+        return f"url:{linkedin_url}"
+
+    job_title, domain = fold_text(_cell(row, "Métier")), fold_text(_cell(row, "Domain"))
+    if job_title or domain:
+        return f"text:{job_title}|{domain}"
+    return None
+
+
+def count_enrichment_keys(rows: Iterable) -> Counter:
+    """Number of rows per enrichment key (rows without a key are not counted)."""
+    counts = Counter()
+    for row in rows:
+        key = enrichment_key(row)
+        if key is not None:
+            counts[key] += 1
+    return counts
+
+
+class SingleFlight:
+    """
+    Run a function once per key and share its result (or error) with every caller of
+    the same key, including callers arriving while it is still running. A result is
+    dropped as soon as its expected number of uses has been served, so memory only
+    holds the results of groups whose duplicates are still ahead in the input.
+    """
+
+    def __init__(self, expected_uses: Optional[Dict[str, int]] = None):
+        self._remaining = dict(expected_uses or {})
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def run(self, key: str, fn: Callable[[], R]) -> R:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if owner:
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+
+        try:
+            return future.result()
+        finally:
+            self._release(key)
+
+    def _release(self, key: str):
+        with self._lock:
+            remaining = self._remaining.get(key, 1) - 1
+            if remaining <= 0:
+                self._remaining.pop(key, None)
+                self._futures.pop(key, None)
+            else:
+                self._remaining[key] = remaining
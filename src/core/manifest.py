@@ -0,0 +1,225 @@
+"""
+Enrichment manifest: fingerprints of the enriched contacts, so that a run only processes what changed.
+
+For every enriched contact and variant of its inputs the manifest stores:
+- the canonical LinkedIn URL and a hash of the enrichment inputs (URL, job title, domain),
+- the generator of the result: enrichment method, LLM generation mode and model,
+- a hash of the profile the result was generated from (scraped profile + CSV extras),
+- when that profile was obtained, and the result itself.
+
+`check(row)` classifies a row as:
+- new        no entry for this contact,
+- changed    its LinkedIn URL, job title and domain match none of the contact's entries
+             for the generator (a manual result does not stand for an LLM one),
+- expired    its scrape is older than the scrape cache TTL (SCRAPE_CACHE_TTL_DAYS),
+- unchanged  the stored result can be reused without any scrape or LLM call.
+
+Contacts are identified by their Airtable record id, else their email, else their
+LinkedIn URL, so that editing a name or an email does not trigger a new enrichment.
+Entries are keyed on the contact, the hash of its inputs and the generator: a contact listed
+on several rows with different job titles keeps one entry per row instead of overwriting a
+single one.
+When an expired contact is scraped again and its profile hash did not move, the stored
+result is kept and only the scrape date is refreshed.
+
+Example usage:
+    manifest = get_manifest()
+    decision = manifest.check(row, generator="llm:single:gpt-4o-mini")
+    if decision.status != UNCHANGED:
+        ...
+        manifest.record(row, result, profile_fingerprint(profile_dict), generator="llm:single:gpt-4o-mini")
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+import pandas as pd
+
+from core.checkpoint import row_key
+from core.dedup import canonicalize_linkedin_url
+from core.text_normalization import fold_text
+
+NEW = "new"
+CHANGED = "changed"
+EXPIRED = "expired"
+UNCHANGED = "unchanged"
+
+
+def _cell(row, column: str) -> str:
+    value = row.get(column, "")
+    return "" if value is None or pd.isna(value) else str(value).strip()
+
+
+def contact_key(row) -> str:
+    """Identity of a contact across runs: Airtable record id, email, LinkedIn URL, else the row identity."""
+    record_id = _cell(row, "Record ID")
+    if record_id:
+        return f"id:{record_id}"
+    email = _cell(row, "Email").casefold()
+    if email:
+        return f"email:{email}"
+    linkedin_url = canonicalize_linkedin_url(_cell(row, "Linkedin"))
+    if linkedin_url:
+        return f"url:{linkedin_url}"
+    return f"row:{row_key(row)}"
+
+
+def inputs_fingerprint(row) -> str:
+    """Hash of the inputs the enrichment depends on: canonical LinkedIn URL, job title and domain."""
+    values = [canonicalize_linkedin_url(_cell(row, "Linkedin")), fold_text(_cell(row, "Métier")), fold_text(_cell(row, "Domain"))]
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()
+
+
+def profile_fingerprint(profile_dict: Dict) -> str:
+    """Hash of the profile dictionary the tags and description are generated from."""
+    payload = json.dumps(profile_dict, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ManifestEntry(NamedTuple):
+    linkedin: str
+    inputs_hash: str
+    profile_hash: str
+    result: Dict[str, str]
+    checked_at: float
+
+
+class ManifestDecision(NamedTuple):
+    status: str
+    key: str
+    entry: Optional[ManifestEntry]
+
+
+class EnrichmentManifest:
+    """SQLite-backed fingerprints and results of the enriched contacts."""
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            " contact TEXT NOT NULL,"
+            " linkedin TEXT NOT NULL,"
+            " inputs_hash TEXT NOT NULL,"
+            " generator TEXT NOT NULL,"
+            " profile_hash TEXT NOT NULL,"
+            " interests TEXT NOT NULL,"
+            " description TEXT NOT NULL,"
+            " checked_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (contact, inputs_hash, generator))"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, inputs_hash: Optional[str] = None, generator: Optional[str] = None) -> Optional[ManifestEntry]:
+        """Latest entry of contact `key`, restricted to `inputs_hash` and `generator` when given."""
+        query = "SELECT linkedin, inputs_hash, profile_hash, interests, description, checked_at FROM manifest WHERE contact = ?"
+        params = (key,)
+        if inputs_hash is not None:
+            query += " AND inputs_hash = ?"
+            params += (inputs_hash,)
+        if generator is not None:
+            query += " AND generator = ?"
+            params += (generator,)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY updated_at DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        linkedin, inputs_hash, profile_hash, interests, description, checked_at = row
+        return ManifestEntry(linkedin, inputs_hash, profile_hash, {"Intérêt": interests, "Description": description}, checked_at)
+
+    def is_expired(self, entry: ManifestEntry, now: Optional[float] = None) -> bool:
+        """Only scraped profiles expire; rows enriched from their job title and domain stay valid."""
+        if not self.ttl_seconds or not entry.linkedin:
+            return False
+        return (time.time() if now is None else now) - entry.checked_at > self.ttl_seconds
+
+    def check(self, row, now: Optional[float] = None, generator: str = "") -> ManifestDecision:
+        """
+        Whether `row` must be enriched (new, changed, expired) or its stored result reused (unchanged)
+        by `generator`; a result of another method, mode or model counts as changed.
+        """
+        key = contact_key(row)
+        entry = self.get(key, inputs_fingerprint(row), generator)
+        if entry is None:
+            # Changed inputs: the latest entry of the same generator may still match the new profile
+            status = NEW if self.get(key) is None else CHANGED
+            entry = self.get(key, generator=generator)
+        elif self.is_expired(entry, now):
+            status = EXPIRED
+        else:
+            status = UNCHANGED
+        return ManifestDecision(status, key, entry)
+
+    def record(
+        self,
+        row,
+        result: Dict[str, str],
+        profile_hash: str = "",
+        checked_at: Optional[float] = None,
+        generator: str = "",
+    ):
+        """
+        Store the fingerprints and result of an enriched row.
+        Args:
+            row: Input row (pandas Series or dict).
+            result (dict): {"Intérêt", "Description"}.
+            profile_hash (str): `profile_fingerprint` of the profile, empty when unknown.
+            checked_at (float): When the profile was obtained (default: now).
+            generator (str): Method, mode and model the result was produced with.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    contact_key(row),
+                    canonicalize_linkedin_url(_cell(row, "Linkedin")),
+                    inputs_fingerprint(row),
+                    generator,
+                    profile_hash,
+                    result["Intérêt"],
+                    result["Description"],
+                    checked_at or now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM manifest").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_manifest: Optional[EnrichmentManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest() -> EnrichmentManifest:
+    """Process-wide manifest at MANIFEST_PATH, expiring scrapes after SCRAPE_CACHE_TTL_DAYS."""
+    global _manifest
+    # Imported here: importing the pipeline must not load the scraper modules
+    from scrapers.cache_store import get_scrape_cache_ttl
+
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = EnrichmentManifest(
+                os.getenv("MANIFEST_PATH", "data/enrich_manifest.sqlite"),
+                ttl_seconds=get_scrape_cache_ttl(),
+            )
+        return _manifest
@@ -1,37 +1,113 @@
+import os
+from typing import List, NamedTuple, Optional
 from core.schema import LinkedInProfile, GeneratedProfileResult
 from core.static_values import CENTER_OF_INTEREST_LIST
 from services.tag_description_builder import build_interest_and_description
+from services.embedding_tagger import build_interest_and_description_embedding, get_default_tagger
 from services.llm_interface import generate_interest_and_description
 from utils.crud import get_profile_text
 from pydantic import ValidationError
+from utils import metrics
+
+def build_profile_text(profile_dict: dict) -> str:
+    """
+    Validate a LinkedIn profile dictionary and flatten it into the text sent to the tagger.
+    """
+    with metrics.stage("text_build"):
+        try:
+            validated_profile = LinkedInProfile(**profile_dict)
+        except ValidationError as e:
+            raise ValueError(f"Profil invalide : {e}")
+
+        return get_profile_text(validated_profile.model_dump())
+
+def validate_result(result: dict) -> dict:
+    """
+    Validate generated interests and description against GeneratedProfileResult.
+    """
+    with metrics.stage("validation"):
+        try:
+            validated_result = GeneratedProfileResult(**result)
+        except ValidationError as e:
+            raise ValueError(f"Résultat invalide : {e}")
+
+        return validated_result.model_dump()
+
+class TierDecision(NamedTuple):
+    tier: str          # "local" (embedding tagger result kept) or "llm" (escalated)
+    reason: str        # "confident", "no_tag", "low_confidence" or "low_coverage"
+    confidence: float  # best tag similarity
+    coverage: float    # share of the profile explained by the tag vocabulary
+    tags: List[str]
+
+def decide_tier(profile_text: str, min_confidence: Optional[float] = None, min_coverage: Optional[float] = None) -> TierDecision:
+    """
+    Run the local embedding tagger and decide whether its tags can be kept or the
+    profile must go to the LLM. Thresholds default to TIERED_MIN_CONFIDENCE (0.15)
+    and TIERED_MIN_COVERAGE (0.3).
+    """
+    if min_confidence is None:
+        min_confidence = float(os.getenv("TIERED_MIN_CONFIDENCE", 0.15))
+    if min_coverage is None:
+        min_coverage = float(os.getenv("TIERED_MIN_COVERAGE", 0.3))
+
+    tagger = get_default_tagger()
+    scored = tagger.score_many([profile_text])
+    scores, coverage = scored.scores[0], float(scored.coverage[0])
+    tags = tagger.select(scores)
+    confidence = float(scores.max()) if scores.size else 0.0
+
+    if not tags:
+        reason = "no_tag"
+    elif confidence < min_confidence:
+        reason = "low_confidence"
+    elif coverage < min_coverage:
+        reason = "low_coverage"
+    else:
+        return TierDecision("local", "confident", confidence, coverage, tags)
+    return TierDecision("llm", reason, confidence, coverage, tags)
+
+def build_tier_description(profile_dict: dict, tags: List[str]) -> str:
+    """Short description of a profile tagged locally: headline and interests, no LLM call."""
+    headline = (profile_dict.get("headline") or "").strip()
+    interests = ", ".join(tags)
+    return f"{headline} – intérêts : {interests}." if headline else f"Intérêts : {interests}."
 
 def process_profile(profile_dict: dict, method: str = "llm") -> dict:
     """
     Process a LinkedIn profile dictionary to generate interests and descriptions.
     Args:
         profile_dict (dict): LinkedIn profile data.
-        method (str): Method to use for generation ("manual" or "llm").
+        method (str): Method to use for generation ("manual", "embedding", "llm", or "tiered":
+            embedding tagger first, LLM only when its result is not confident enough).
     Returns:
         dict: Generated interests and descriptions.
     """
-    
-    try:
-        validated_profile = LinkedInProfile(**profile_dict)
-    except ValidationError as e:
-        raise ValueError(f"Profil invalide : {e}")
+    profile_text = build_profile_text(profile_dict)
 
-    profile_text = get_profile_text(validated_profile.model_dump())
+    if method == "tiered":
+        with metrics.stage("embedding_tagging"):
+            decision = decide_tier(profile_text)
+        # Recorded on the row: metrics JSONL labels and checkpoint journal
+        metrics.incr(f"tier_{decision.tier}")
+        metrics.annotate("tier", decision.tier)
+        metrics.annotate("tier_reason", decision.reason)
+        if decision.tier == "local":
+            return validate_result({
+                "Intérêt": ", ".join(decision.tags),
+                "Description": build_tier_description(profile_dict, decision.tags),
+            })
+        method = "llm"
 
     if method == "llm":
         result = generate_interest_and_description(
             profile_text, CENTER_OF_INTEREST_LIST, provider="openai"
         )
+    elif method == "embedding":
+        with metrics.stage("embedding_tagging"):
+            result = build_interest_and_description_embedding(profile_text)
     else:
-        result = build_interest_and_description(profile_text)
-
-    try:
-        validated_result = GeneratedProfileResult(**result)
-    except ValidationError as e:
-        raise ValueError(f"Résultat invalide : {e}")
+        with metrics.stage("manual_tagging"):
+            result = build_interest_and_description(profile_text)
 
-    return validated_result.model_dump()
+    return validate_result(result)
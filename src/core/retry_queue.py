@@ -0,0 +1,171 @@
+"""
+Durable retry queue for rows whose enrichment failed.
+
+A failed row is stored with its input values, the error class and message, the
+number of attempts and the time of its next retry (exponential backoff, or the
+cooldown of an open circuit). `python src/enrich_from_csv.py retry` drains the
+rows that are due instead of re-running the whole file. After `max_attempts`
+failures, or a failure that retrying cannot fix (`permanent`), a row is parked as
+"dead" and left for manual review.
+
+Example usage:
+    queue = get_retry_queue()
+    queue.push(row_key(row), row.to_dict(), error)
+    for entry in queue.due():
+        ...
+        queue.remove(entry["key"])
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class RetryQueue:
+    """SQLite-backed queue of failed rows with per-row attempt count and next retry time."""
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 5,
+        base_delay: float = 60,
+        max_delay: float = 3600,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS retry_queue ("
+            " key TEXT PRIMARY KEY,"
+            " row TEXT NOT NULL,"
+            " error_class TEXT NOT NULL,"
+            " error_message TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL,"
+            " next_retry_at REAL NOT NULL,"
+            " status TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_retry_queue_due ON retry_queue(status, next_retry_at)")
+        self._conn.commit()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next retry after `attempts` failures."""
+        return min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+
+    def push(
+        self,
+        key: str,
+        row: Dict[str, object],
+        error: BaseException,
+        retry_after: Optional[float] = None,
+        permanent: bool = False,
+    ) -> Dict[str, object]:
+        """
+        Record a failure of `key`: increment its attempts and schedule the next retry.
+        Args:
+            key (str): Row identity (see core.checkpoint.row_key).
+            row (dict): Input values needed to enrich the row again.
+            error (Exception): The failure.
+            retry_after (float): Seconds to wait instead of the backoff (e.g. circuit cooldown).
+            permanent (bool): Park the row as "dead" right away.
+        Returns:
+            dict: The queued entry.
+        """
+        now = time.time()
+        retry_after = retry_after if retry_after is not None else getattr(error, "retry_after", None)
+        with self._lock:
+            existing = self._conn.execute("SELECT attempts, created_at FROM retry_queue WHERE key = ?", (key,)).fetchone()
+            attempts = (existing[0] if existing else 0) + 1
+            delay = retry_after if retry_after is not None else self.backoff(attempts)
+            status = "dead" if permanent or attempts >= self.max_attempts else "pending"
+            self._conn.execute(
+                "INSERT OR REPLACE INTO retry_queue VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(row, ensure_ascii=False, default=str),
+                    type(error).__name__,
+                    str(error),
+                    attempts,
+                    now + delay,
+                    status,
+                    existing[1] if existing else now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+        return {"key": key, "attempts": attempts, "next_retry_at": now + delay, "status": status}
+
+    def remove(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM retry_queue WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """Pending entries whose next retry time has passed, oldest first."""
+        now = time.time() if now is None else now
+        query = (
+            "SELECT key, row, error_class, error_message, attempts, next_retry_at, updated_at FROM retry_queue"
+            " WHERE status = 'pending' AND next_retry_at <= ? ORDER BY next_retry_at"
+        )
+        params = [now]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "key": key,
+                "row": json.loads(row),
+                "error_class": error_class,
+                "error_message": error_message,
+                "attempts": attempts,
+                "next_retry_at": next_retry_at,
+                "failed_at": updated_at,
+            }
+            for key, row, error_class, error_message, attempts, next_retry_at, updated_at in rows
+        ]
+
+    def next_retry_at(self) -> Optional[float]:
+        """Time of the earliest pending retry, or None if nothing is pending."""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(next_retry_at) FROM retry_queue WHERE status = 'pending'").fetchone()
+        return row[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM retry_queue GROUP BY status").fetchall())
+        return {"pending": counts.get("pending", 0), "dead": counts.get("dead", 0)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_queue: Optional[RetryQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_retry_queue() -> RetryQueue:
+    """Process-wide queue configured from RETRY_QUEUE_PATH, RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY and RETRY_MAX_DELAY (seconds)."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RetryQueue(
+                os.getenv("RETRY_QUEUE_PATH", "data/retry_queue.sqlite"),
+                max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", 5)),
+                base_delay=float(os.getenv("RETRY_BASE_DELAY", 60)),
+                max_delay=float(os.getenv("RETRY_MAX_DELAY", 3600)),
+            )
+        return _queue
@@ -0,0 +1,57 @@
+"""
+Concurrent row runner for the enrichment pipeline.
+
+Rows are processed by a bounded thread pool (the work is I/O-bound: scraper and
+LLM HTTP calls) and yielded back in input order. Each backend gets its own
+concurrency limit so that, e.g., many rows can wait on OpenAI while only a few
+scraper calls are in flight.
+"""
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BackendLimits:
+    """Per-backend concurrency limits shared by all workers."""
+
+    def __init__(self, scraper: int = 4, llm: int = 4):
+        self.scraper = threading.BoundedSemaphore(max(1, scraper))
+        self.llm = threading.BoundedSemaphore(max(1, llm))
+
+
+def _resolve(item: T, future: Future) -> Tuple[T, Optional[R], Optional[Exception]]:
+    try:
+        return item, future.result(), None
+    except Exception as e:
+        return item, None, e
+
+
+def ordered_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int = 8,
+) -> Iterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Apply `fn` to every item on a thread pool and yield results in input order.
+    Args:
+        fn (Callable): Function applied to each item.
+        items (Iterable): Input items, consumed lazily.
+        workers (int): Number of worker threads.
+    Returns:
+        Iterator of (item, result, error) tuples; exactly one of result/error is set.
+    """
+    workers = max(1, workers)
+    # Keep a bounded window of submitted items so that memory does not grow with the input
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich") as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(fn, item)))
+            if len(pending) >= window:
+                yield _resolve(*pending.popleft())
+        while pending:
+            yield _resolve(*pending.popleft())
@@ -1,6 +1,10 @@
 from enum import Enum
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
+from loguru import logger
 from pydantic import BaseModel, Field, field_validator, ValidationInfo
 import re
+from core.text_normalization import fold_text
 
 class InterestTag(str, Enum):
     DATA_ENGINEERING = "Data Engineering"
@@ -22,6 +26,67 @@ class InterestTag(str, Enum):
     GEN_AI_TEXT = "Generative AI (text)"
 
 
+# Cleanup of one raw tag, compiled once: drop a "s :" style prefix, surrounding quotes,
+# brackets or list bullets, and trailing punctuation (., ;, :)
+_TAG_CLEANUP = re.compile(r"^\s*(?:\w\s*[:\-–]\s*)?[\"'\[*•\-]*\s*(.*?)[\s\"'\].;:]*$", re.DOTALL)
+
+
+def _tag_key(tag: str) -> str:
+    """Matching key of a tag: case, accents and separators ignored ("ML-Ops" -> "mlops")."""
+    return fold_text(tag).replace(" ", "")
+
+
+class TagNormalizer:
+    """
+    Map free-form tag lists (LLM answers, CSV cells) to canonical tag values:
+    "mlops, Data-Engineering., MLOps" -> ["MLOps", "Data Engineering"]. Duplicates are
+    removed keeping the first occurrence; unknown tags are reported separately.
+    """
+
+    def __init__(self, tags: Iterable[str]):
+        self.tags = list(tags)
+        self._canonical = {_tag_key(tag): tag for tag in self.tags}
+        self.canonical = lru_cache(maxsize=4096)(self._canonical_uncached)
+
+    def _canonical_uncached(self, raw_tag: str) -> Tuple[str, Optional[str]]:
+        """(cleaned tag, canonical tag or None) of one raw tag."""
+        cleaned = _TAG_CLEANUP.match(raw_tag).group(1)
+        return cleaned, self._canonical.get(_tag_key(cleaned))
+
+    def split(self, tags: Union[str, Iterable[str]]) -> Tuple[List[str], List[str]]:
+        """Canonical valid tags and cleaned invalid tags of a comma-separated string or a list, in order."""
+        raw_tags = tags.split(",") if isinstance(tags, str) else tags
+        valid, invalid, seen = [], [], set()
+        for raw_tag in raw_tags:
+            cleaned, canonical = self.canonical(str(raw_tag))
+            if canonical is None:
+                if cleaned:
+                    invalid.append(cleaned)
+            elif canonical not in seen:
+                seen.add(canonical)
+                valid.append(canonical)
+        return valid, invalid
+
+    def normalize(self, tags: Union[str, Iterable[str]]) -> List[str]:
+        return self.split(tags)[0]
+
+    def normalize_many(self, values: Iterable[Union[str, Iterable[str]]]) -> List[List[str]]:
+        return [self.split(tags)[0] for tags in values]
+
+
+TAG_NORMALIZER = TagNormalizer(tag.value for tag in InterestTag)
+
+
+def normalize_tags(tags: Union[str, Iterable[str]]) -> List[str]:
+    """Canonical InterestTag values of a tag list, deduplicated in order (unknown tags dropped)."""
+    return TAG_NORMALIZER.normalize(tags)
+
+
+def normalize_tags_many(values: Iterable[Union[str, Iterable[str]]]) -> List[List[str]]:
+    """Batch version of `normalize_tags`."""
+    return TAG_NORMALIZER.normalize_many(values)
+
+
 class GeneratedProfileResult(BaseModel):
     Intérêt: str = Field(default_factory=str)
     Description: str = Field(..., min_length=10)
@@ -29,22 +94,10 @@ class GeneratedProfileResult(BaseModel):
     @field_validator("Intérêt")
     @classmethod
     def filter_valid_tags(cls, tags: str, info: ValidationInfo) -> str:
-        allowed = {tag.value for tag in InterestTag}
-        raw_tags = [tag.strip() for tag in tags.split(",")]
-
-        cleaned_tags = []
-        for tag in raw_tags:
-            # Supprimer tout préfixe du style "s :" ou autre
-            tag = re.sub(r"^\w\s*[:\-–]", "", tag).strip()
-            # Supprimer les caractères spéciaux en fin (., ;, etc.)
-            tag = tag.rstrip(".;: ")
-            cleaned_tags.append(tag)
-
-        valid = [tag for tag in cleaned_tags if tag in allowed]
-        invalid = [tag for tag in cleaned_tags if tag not in allowed]
+        valid, invalid = TAG_NORMALIZER.split(tags)
 
         if invalid:
-            print(f"[INFO] Tags ignorés car non valides : {invalid}")
+            logger.debug("Tags ignorés car non valides : {}", invalid)
         if not valid:
             raise ValueError("Aucun tag valide trouvé dans la liste fournie.")
 
@@ -31,6 +31,48 @@ AIRTABLE_API_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
 TAG_LIST = ['#CONTACT',"Blacklist","ClubCDO","Star",None]
 JOB_CATEGORY_LIST = ["data scientist","data analyst","data engineer","data architect","data manager","consultant data","CDO/head data","gouvernance data","data owner","transformation data","developer","data/tech/IT/digital manager","freelance","manager","chercheur","consultant","CEO","chief officer","marketing/CRM","professeur","direction","business development","laws & ethics","étudiant","autre","unknown","gestion de projets","engineer",None]
 CENTER_OF_INTEREST_LIST = ["Data Engineering","Data Gouvernance","Data Analytics","Data Infrastructure","MLOps","DevOps","Web","Machine Learning","Time Series","NLP","Computer Vision","Frugal AI","Ethical/Green AI","Explicability","Privacy/Safety","Generative AI (images)","Generative AI (text)", None]
+# Synonyms and translations detected as the corresponding interest tag by the manual matcher.
+# Matching is case-, accent- and separator-insensitive, on whole words only.
+CENTER_OF_INTEREST_ALIASES = {
+    "Data Engineering": ["data engineer", "ingénieur data", "ingénierie des données", "data pipeline", "data pipelines", "ETL"],
+    "Data Gouvernance": ["data governance", "gouvernance des données", "gouvernance data", "data steward"],
+    "Data Analytics": ["data analyst", "data analysis", "analyse de données", "business intelligence", "Power BI"],
+    "Data Infrastructure": ["data platform", "plateforme data", "data warehouse", "data lake", "data lakehouse"],
+    "MLOps": ["ML Ops"],
+    "DevOps": ["Dev Ops", "SRE", "CI/CD", "Kubernetes"],
+    "Web": ["développeur web", "web developer", "frontend", "front end"],
+    "Machine Learning": ["apprentissage automatique", "deep learning", "ML engineer"],
+    "Time Series": ["séries temporelles", "série temporelle", "forecasting"],
+    "NLP": ["natural language processing", "traitement du langage naturel", "traitement automatique des langues"],
+    "Computer Vision": ["vision par ordinateur", "vision artificielle", "image recognition", "reconnaissance d'images"],
+    "Frugal AI": ["IA frugale"],
+    "Ethical/Green AI": ["ethical AI", "green AI", "responsible AI", "IA éthique", "IA responsable", "IA verte"],
+    "Explicability": ["explainability", "explicabilité", "interpretability", "interprétabilité", "XAI"],
+    "Privacy/Safety": ["privacy", "AI safety", "RGPD", "GDPR"],
+    "Generative AI (images)": ["image generation", "génération d'images", "stable diffusion", "diffusion models"],
+    "Generative AI (text)": ["LLM", "LLMs", "large language model", "large language models", "ChatGPT", "RAG"],
+}
+# Vocabulary describing each interest tag, used (with the tag name and its aliases) as the
+# prototype text of the local embedding tagger (services/embedding_tagger.py). Keywords only, FR + EN.
+CENTER_OF_INTEREST_PROTOTYPES = {
+    "Data Engineering": "data engineer engineering ingénieur data pipelines ETL ELT ingestion Spark Airflow dbt Kafka batch streaming SQL Python Databricks",
+    "Data Gouvernance": "data governance gouvernance données data quality qualité des données data catalog catalogue master data MDM data owner data steward lineage conformité",
+    "Data Analytics": "data analyst analytics analyse données business intelligence BI Power BI Tableau Looker reporting dashboard tableaux de bord KPI SQL Excel",
+    "Data Infrastructure": "data platform plateforme data infrastructure data warehouse entrepôt de données data lake lakehouse Snowflake BigQuery Redshift cloud architecture data architect",
+    "MLOps": "MLOps ML Ops machine learning operations model deployment déploiement de modèles model monitoring MLflow Kubeflow feature store industrialisation des modèles",
+    "DevOps": "DevOps SRE site reliability CI/CD Kubernetes Docker Terraform infrastructure as code cloud AWS GCP Azure monitoring automatisation",
+    "Web": "web développeur web developer frontend backend full stack JavaScript TypeScript React Angular Vue Node.js HTML CSS API",
+    "Machine Learning": "machine learning apprentissage automatique deep learning ML engineer data scientist modèles prédictifs scikit-learn PyTorch TensorFlow réseaux de neurones",
+    "Time Series": "time series séries temporelles forecasting prévision prédiction de la demande signal temporal anomaly detection détection d'anomalies",
+    "NLP": "NLP natural language processing traitement du langage naturel traitement automatique des langues text mining analyse de texte transformers BERT chatbot",
+    "Computer Vision": "computer vision vision par ordinateur vision artificielle image recognition reconnaissance d'images object detection détection d'objets segmentation OpenCV imagerie",
+    "Frugal AI": "frugal AI IA frugale sobriété numérique efficient models modèles légers edge AI embarqué faible consommation",
+    "Ethical/Green AI": "ethical AI green AI responsible AI IA éthique IA responsable IA verte biais fairness équité impact environnemental numérique responsable",
+    "Explicability": "explainability explicabilité interpretability interprétabilité XAI SHAP LIME transparence des modèles",
+    "Privacy/Safety": "privacy vie privée AI safety sécurité RGPD GDPR protection des données données personnelles cybersécurité confidentialité",
+    "Generative AI (images)": "generative AI IA générative image generation génération d'images stable diffusion diffusion models GAN Midjourney DALL-E",
+    "Generative AI (text)": "generative AI IA générative LLM LLMs large language models ChatGPT GPT RAG prompt engineering agents LangChain",
+}
 DOMAIN_LIST = ["Health", "Insurance", "Transportation", "Sports", "Marketing", "Environment", "Human Resources", "Tech", "Biology", "Aerospace", "Ocean", "Military", "Finance", "Food", "Supply Chain / Retail", "Cyber", "Creative Industry", "Archives", "Beauty", "Luxury", "Construction", "Audiovisual", "Video Games", "Education", "Management", "Telecom", "Energy", "IT", "Events / Hotels", "Industry", "Automobile", "Media"]
 STATUS_LIST = ["Full Membership","Corporate Membership","Chercheur en résidence","Freelance en résidence","Etudiant en résidence","Ancien membre","Board Member","Partenaire","Journaliste","Prospect","CDO Membership","Contributeur en résidence","Autre",None]
 SLACK_LIST = ["Invité","Accepté","Désinscrit","A inviter","Ne pas inviter","Invité-WIP", None]
@@ -0,0 +1,15 @@
+import re
+import unicodedata
+
+_SEPARATORS = re.compile(r"[\s\-_]+")
+
+
+def fold_text(text: str) -> str:
+    """
+    Accent- and case-insensitive form of a text, used for matching only:
+    "Vision par Ordinateur" and "vision-par-ordinateur" both become "vision par ordinateur".
+    """
+    if not text.isascii():
+        # Decompose accented letters and drop the marks (and any other non-ASCII character)
+        text = unicodedata.normalize("NFKD", text.replace("’", "'")).encode("ascii", "ignore").decode("ascii")
+    return _SEPARATORS.sub(" ", text.lower()).strip()
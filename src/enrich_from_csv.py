@@ -1,18 +1,78 @@
+import os
+import sys
+import json
+import time
+from itertools import islice
+from typing import Optional
 import pandas as pd
-from core.pipeline import process_profile
-from adapters.linkedin_scraper_adapter import scrape_linkedin_profile
+from loguru import logger
+from datetime import datetime, timezone
+from core.pipeline import build_profile_text, process_profile, validate_result
+from core.static_values import CENTER_OF_INTEREST_LIST, is_env_true
+from core.runner import BackendLimits, ordered_map
+from core.checkpoint import CheckpointJournal, row_key
+from core.manifest import NEW, UNCHANGED, ManifestDecision, ManifestEntry, get_manifest, profile_fingerprint
+from core.dedup import SingleFlight, canonicalize_linkedin_url, count_enrichment_keys, enrichment_key
+from core.retry_queue import get_retry_queue
+from adapters.linkedin_scraper_adapter import prefetch_linkedin_profiles, scrape_linkedin_profile
+from services.airtable_sync import get_airtable_client, get_interests_as_list, pull_contacts, push_enrichment
+from services.embedding_tagger import build_interest_and_description_embedding_many, embedding_process_pool
+from services.llm_batch import FINAL_STATUSES, get_batch_backend, parse_batch_results, write_batch_requests
+from services.llm_interface import generation_model
+from utils import metrics
+from utils.http_client import get_http_client
+from utils.logging_config import configure_logging, flush as flush_logs
+from utils.throttle import CircuitOpenError, is_backend_failure
 
 
 INPUT_CSV = "data/airtable_export.csv"
 OUTPUT_CSV = "data/enriched_output.csv"
-METHOD = "llm"  # or "manual"
+METHOD = os.getenv("ENRICH_METHOD", "llm")  # "llm", "tiered", "embedding" or "manual"
+# Results are journaled row by row; delete this file to force a full re-run
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "data/enrich_checkpoint.jsonl")
+
+# Offline batch mode: request/result files and the state of the submitted job
+BATCH_DIR = os.getenv("LLM_BATCH_DIR", "data/llm_batches")
+BATCH_STATE_PATH = os.path.join(BATCH_DIR, "current_batch.json")
+
+# The input is streamed in chunks of this many rows and appended to the output chunk by chunk
+CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", 1000))
+
+# local-tag: profile texts scored together on the process pool (texts only are held in memory)
+LOCAL_TAG_BLOCK_SIZE = int(os.getenv("LOCAL_TAG_BLOCK_SIZE", 20000))
+
+# Concurrency: number of rows in flight, and per-backend limits inside those workers
+WORKERS = int(os.getenv("ENRICH_WORKERS", 8))
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", 4))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 4))
+
+
+class InsufficientDataError(ValueError):
+    """The row has neither a LinkedIn URL nor a job title/domain: retrying cannot help."""
+
+
+def generation_signature(method: Optional[str] = None, mode: Optional[str] = None) -> str:
+    """
+    Method, LLM generation mode and model the results are produced with. Part of the manifest
+    fingerprint: after a first pass with ENRICH_METHOD=manual, a run with llm enriches the rows again.
+    """
+    method = method or METHOD
+    if method not in ("llm", "tiered"):
+        return method
+    mode = mode or os.getenv("LLM_GENERATION_MODE", "single")
+    return f"{method}:{mode}:{generation_model(mode)}"
+
+
+def is_transient(error: BaseException) -> bool:
+    """Open circuits, timeouts, transport errors, 429 and 5xx: a later retry may succeed."""
+    return isinstance(error, CircuitOpenError) or is_backend_failure(error)
+
 
 #def is_row_already_enriched(row) -> bool:
 def is_row_already_enriched(row) -> bool:
     """Check if the row already contains both 'Intérêt' and 'Description'."""
     interet = row.get("Intérêt", "")
     description = row.get("Description", "")
-    print(f"DEBUG Intérêt: {row.get('Intérêt')}, Description: {row.get('Description')}")
     return pd.notna(interet) and str(interet).strip() != "" and \
            pd.notna(description) and str(description).strip() != ""
 
@@ -20,66 +80,598 @@ def build_profile_dict(row) -> dict:
     """
     Build the minimal profile dictionary expected by LinkedInProfile.
     """
-    linkedin_url = str(row.get("Linkedin", "")).strip()
     job_title = str(row.get("Métier", "")).strip()
     domain = str(row.get("Domain", "")).strip()
 
-    # 🔐 Vérification : reconstruire l'URL si un identifiant brut est donné
-    if linkedin_url and not linkedin_url.startswith("http"):
-        linkedin_url = f"https://www.linkedin.com/in/{linkedin_url}"
+    # 🔐 Same profile, same URL: locale subdomains, query strings, case and bare IDs are normalized
+    with metrics.stage("url_normalization"):
+        linkedin_url = canonicalize_linkedin_url(str(row.get("Linkedin", "")))
 
     if not linkedin_url and not (job_title or domain):
-        raise ValueError("Insufficient data to build profile input.")
+        raise InsufficientDataError("Insufficient data to build profile input.")
 
     if linkedin_url:
-        print("Scraping LinkedIn profile from URL:", linkedin_url)
+        logger.debug("Scraping LinkedIn profile from URL: {}", linkedin_url)
         profile_dict = scrape_linkedin_profile(linkedin_url)
 
-        # 💡 Optionally enrich summary
-        enriched_summary = profile_dict.get("summary", "")
-        if job_title or domain:
-            enriched_summary += f" {job_title} {domain}".strip()
+        summary = profile_dict.get("summary") or ""
+        headline = profile_dict.get("headline") or job_title
+
+        # 💡 Enrich the summary with the CSV job title / domain, unless the profile already says it
+        known_text = f"{summary} {headline}".casefold()
+        extras = [value for value in (job_title, domain) if value and value.casefold() not in known_text]
+        if extras:
+            summary = f"{summary} {' '.join(extras)}".strip()
 
         return {
-            "summary": enriched_summary,
-            "headline": profile_dict.get("headline", job_title),
+            "summary": summary,
+            "headline": headline,
             "experience": profile_dict.get("experience", [])
         }
     else:
         return {
-            "summary": f"{job_title}. Domain: {domain}",
+            "summary": f"Domain: {domain}" if domain else "",
             "headline": job_title,
             "experience": []
         }
 
 
-def main():
-    df = pd.read_csv(INPUT_CSV)
+def scrape_and_enrich(row, limits: BackendLimits, previous: Optional[ManifestEntry] = None) -> tuple:
+    """
+    Scrape and enrich a row, whatever its current Intérêt / Description. When the profile is
+    the one the `previous` manifest result was generated from, that result is reused without
+    any LLM call.
+    Returns:
+        tuple: ({"Intérêt": str, "Description": str}, profile fingerprint)
+    """
+    with limits.scraper:
+        profile_dict = build_profile_dict(row)
+    profile_hash = profile_fingerprint(profile_dict)
+    if previous is not None and previous.profile_hash == profile_hash:
+        metrics.incr("manifest_profile_same")
+        return previous.result, profile_hash
+    with limits.llm:
+        return process_profile(profile_dict, method=METHOD), profile_hash
+
+
+def read_input_chunks(path: str, chunk_size: int):
+    """
+    Stream the input CSV in chunks. Values are read as text so that they are written
+    back unchanged and every chunk has the same columns and formatting.
+    """
+    return pd.read_csv(path, chunksize=max(1, chunk_size), dtype=str, keep_default_na=False)
+
+
+def write_output_chunk(chunk: pd.DataFrame, descriptions: list, interets: list, path: str, first: bool):
+    chunk = chunk.copy()
+    chunk["Description"] = descriptions
+    chunk["Intérêt"] = interets
+    chunk.to_csv(path, mode="w" if first else "a", header=first, index=False)
+
 
+def write_enriched_output(enrich_fn, prefetch=None) -> int:
+    """
+    Stream INPUT_CSV through `enrich_fn(row) -> {"Intérêt", "Description"}` on the worker
+    pool and write OUTPUT_CSV chunk by chunk, keeping the input order.
+    Args:
+        prefetch: Optional `prefetch(chunk)` called before the rows of each chunk are submitted.
+    Returns:
+        int: Number of rows written.
+    """
+    def chunks():
+        for chunk in read_input_chunks(INPUT_CSV, CHUNK_SIZE):
+            if prefetch is not None:
+                prefetch(chunk)
+            yield chunk
+
+    # Rows of all chunks flow through one worker pool; at most a couple of chunks are held in memory
+    rows = (
+        (chunk, index, row)
+        for chunk in chunks()
+        for index, row in chunk.iterrows()
+    )
+
+    # Write to a temporary file so that a crash never leaves a truncated OUTPUT_CSV behind
+    partial_path = f"{OUTPUT_CSV}.part"
+    current_chunk = None
     descriptions = []
     interets = []
+    written_rows = 0
+    deferred_rows = 0
 
-    for index, row in df.iterrows():
-        if is_row_already_enriched(row):
-            descriptions.append(row["Description"])
-            interets.append(row["Intérêt"])
-            continue
+    for (chunk, index, row), result, error in ordered_map(lambda item: enrich_fn(item[2]), rows, WORKERS):
+        if chunk is not current_chunk:
+            if current_chunk is not None:
+                write_output_chunk(current_chunk, descriptions, interets, partial_path, first=written_rows == 0)
+                written_rows += len(current_chunk)
+            current_chunk, descriptions, interets = chunk, [], []
 
-        try:
-            profile_dict = build_profile_dict(row)
-            result = process_profile(profile_dict, method=METHOD)
+        if isinstance(error, CircuitOpenError):
+            logger.warning("[Row {}] Deferred: {}", index, error)
+            deferred_rows += 1
+            descriptions.append("")
+            interets.append("")
+        elif error is not None:
+            logger.error("[Row {}] Error: {}", index, error)
+            descriptions.append("")
+            interets.append("")
+        else:
             descriptions.append(result["Description"])
             interets.append(result["Intérêt"])
+
+    if current_chunk is not None:
+        write_output_chunk(current_chunk, descriptions, interets, partial_path, first=written_rows == 0)
+        written_rows += len(current_chunk)
+
+    if written_rows == 0:
+        logger.warning("⚠️ No rows found in {}", INPUT_CSV)
+        return 0
+
+    os.replace(partial_path, OUTPUT_CSV)
+    logger.info("✅ Enriched file saved to {} ({} rows)", OUTPUT_CSV, written_rows)
+    if deferred_rows:
+        logger.warning("⏸️ {} row(s) deferred while a backend circuit was open", deferred_rows)
+    return written_rows
+
+
+def load_journal() -> tuple:
+    journal = CheckpointJournal(CHECKPOINT_PATH)
+    # Only offsets are kept in memory; results are read back from the journal when needed
+    done = journal.load_offsets()
+    if done:
+        logger.info("♻️ Resuming: {} row(s) already enriched in {}", len(done), CHECKPOINT_PATH)
+    return journal, done
+
+
+def write_output_from_journal(journal: CheckpointJournal, generator: str) -> int:
+    """
+    Write OUTPUT_CSV from the journaled (or manifest) results only, without any scraping or LLM call.
+    Args:
+        generator (str): `generation_signature` of the manifest results that may be reused.
+    """
+    done = journal.load_offsets()
+    manifest = get_manifest()
+
+    def merge_from_journal(row):
+        key = row_key(row)
+        if key in done:
+            return journal.read_at(done[key])
+        decision = manifest.check(row, generator=generator)
+        if decision.status == UNCHANGED:
+            return keep_manual_edits(row, decision.entry.result)
+        if is_row_already_enriched(row):
+            return {"Intérêt": row["Intérêt"], "Description": row["Description"]}
+        raise ValueError("Row not enriched yet")
+
+    return write_enriched_output(merge_from_journal)
+
+
+def report_retry_queue():
+    stats = get_retry_queue().stats()
+    if stats["pending"] or stats["dead"]:
+        logger.info("🔁 Retry queue: {} pending, {} dead row(s) (python3 src/enrich_from_csv.py retry)", stats["pending"], stats["dead"])
+
+
+def keep_manual_edits(row, result: dict) -> dict:
+    """
+    Stored result with the non-empty Intérêt/Description of the input row in place of its own:
+    values edited by hand in Airtable must not be reverted by airtable-push.
+    """
+    merged = dict(result)
+    for column in ("Intérêt", "Description"):
+        value = row.get(column, "")
+        if pd.notna(value) and str(value).strip():
+            merged[column] = str(value)
+    return merged
+
+
+def needs_enrichment(row, decision: ManifestDecision, done: dict) -> bool:
+    """
+    Whether a row must be scraped and enriched: contacts whose inputs changed or whose scrape
+    expired, and new contacts without any result yet (in the journal or in the input columns).
+    """
+    if decision.status == UNCHANGED:
+        return False
+    if decision.status == NEW:
+        return row_key(row) not in done and not is_row_already_enriched(row)
+    return True
+
+
+def rows_to_enrich(done: dict, manifest, generator: str):
+    """Stream the rows of INPUT_CSV that `needs_enrichment` with results of `generator`."""
+    for chunk in read_input_chunks(INPUT_CSV, CHUNK_SIZE):
+        for row in chunk.to_dict("records"):
+            if needs_enrichment(row, manifest.check(row, generator=generator), done):
+                yield row
+
+
+def count_pending_duplicates(done: dict, manifest, generator: str) -> SingleFlight:
+    """
+    Pre-pass over INPUT_CSV: group the rows still to enrich by enrichment key
+    (canonical LinkedIn URL, or job title + domain) so each group is processed once.
+    """
+    counts = count_enrichment_keys(rows_to_enrich(done, manifest, generator))
+    rows, unique = sum(counts.values()), len(counts)
+    if rows > unique:
+        logger.info("🧬 {} row(s) to enrich share {} unique profile(s): {} duplicate(s) reuse a result", rows, unique, rows - unique)
+    return SingleFlight(counts)
+
+
+def report_metrics(run: metrics.RunMetrics):
+    if run.rows:
+        # The table goes to stdout: let the queued log records come out first
+        flush_logs()
+        print(run.summary_table())
+        if run.path:
+            logger.info("📊 Per-row metrics written to {}", run.path)
+
+
+def main():
+    limits = BackendLimits(scraper=SCRAPER_CONCURRENCY, llm=LLM_CONCURRENCY)
+    journal, done = load_journal()
+    manifest = get_manifest()
+    queue = get_retry_queue()
+    generator = generation_signature()
+    run = metrics.start_run()
+    # Whole-file pass before any row: timed apart from the per-row URL normalization
+    with metrics.stage("prepass"):
+        flight = count_pending_duplicates(done, manifest, generator)
+
+    def enrich_once(row, previous):
+        group = enrichment_key(row)
+        if group is None:
+            return scrape_and_enrich(row, limits, previous)
+        # Duplicates wait for, then reuse, the result of the first row of their group
+        return flight.run(group, lambda: scrape_and_enrich(row, limits, previous))
+
+    def prefetch_profiles(chunk):
+        # One snapshot per batch of the chunk's cache misses instead of one per row
+        urls = [
+            canonicalize_linkedin_url(str(row.get("Linkedin", "")))
+            for row in chunk.to_dict("records")
+            if needs_enrichment(row, manifest.check(row, generator=generator), done)
+        ]
+        # Values that are not profile URLs fail on their own row, not for the whole batch
+        urls = [url for url in dict.fromkeys(urls) if "linkedin.com/in/" in url]
+        if urls:
+            with metrics.stage("prefetch"):
+                prefetch_linkedin_profiles(urls)
+
+    def enrich_and_journal(row):
+        key = row_key(row)
+        decision = manifest.check(row, generator=generator)
+        metrics.incr(f"manifest_{decision.status}")
+        if decision.status == UNCHANGED:
+            return keep_manual_edits(row, decision.entry.result)
+        if not needs_enrichment(row, decision, done):
+            # Enriched before the manifest existed (journal or input columns): adopt the result as is
+            result = journal.read_at(done[key]) if key in done else {"Intérêt": row["Intérêt"], "Description": row["Description"]}
+            manifest.record(row, result, generator=generator)
+            return result
+
+        with metrics.row(key) as current:
+            metrics.annotate("manifest", decision.status)
+            try:
+                result, profile_hash = enrich_once(row, decision.entry)
+            except Exception as e:
+                # Transient failures (429, timeouts, open circuits) are retried later without a full re-run;
+                # invalid results and missing profiles would fail the same way again
+                if is_transient(e):
+                    queue.push(key, row.to_dict(), e)
+                    metrics.incr("retry_queued")
+                raise
+        # Row labels (e.g. the tier chosen by METHOD=tiered) are kept with the result
+        journal.append(key, result, extra=current["labels"])
+        queue.remove(key)
+        manifest.record(row, result, profile_hash, generator=generator)
+        return result
+
+    try:
+        write_enriched_output(enrich_and_journal, prefetch=prefetch_profiles)
+    finally:
+        metrics.incr("dedup_shared", flight.shared)
+        metrics.finish_run()
+
+    report_metrics(run)
+    http_stats = get_http_client().connection_stats()
+    if http_stats["requests"]:
+        logger.info("🔌 HTTP: {} requests over {} connection(s)", http_stats["requests"], http_stats["connections"])
+    report_retry_queue()
+
+
+def retry(wait: bool = False):
+    """
+    Enrich again the rows of the retry queue that are due, then rewrite OUTPUT_CSV from the journal.
+    Args:
+        wait (bool): Keep sleeping until the next scheduled retry until no row is pending.
+    """
+    limits = BackendLimits(scraper=SCRAPER_CONCURRENCY, llm=LLM_CONCURRENCY)
+    journal = CheckpointJournal(CHECKPOINT_PATH)
+    manifest = get_manifest()
+    queue = get_retry_queue()
+    generator = generation_signature()
+    run = metrics.start_run()
+    recovered = 0
+
+    def enrich_entry(entry):
+        row = pd.Series(entry["row"])
+        with metrics.row(entry["key"]) as current:
+            result, profile_hash = scrape_and_enrich(row, limits, manifest.check(row, generator=generator).entry)
+            return {**result, "labels": current["labels"], "profile_hash": profile_hash}
+
+    def enriched_since_failure(entry, offsets) -> bool:
+        # The journal also holds results older than the failure (e.g. an expired profile that failed to refresh)
+        if entry["key"] not in offsets:
+            return False
+        enriched_at = datetime.fromisoformat(journal.read_entry_at(offsets[entry["key"]])["at"]).timestamp()
+        return enriched_at >= entry["failed_at"]
+
+    while True:
+        due, offsets = [], journal.load_offsets()
+        for entry in queue.due():
+            if enriched_since_failure(entry, offsets):
+                # A later run already enriched the row
+                queue.remove(entry["key"])
+            else:
+                due.append(entry)
+        if due:
+            logger.info("🔁 Retrying {} row(s)", len(due))
+        for entry, result, error in ordered_map(enrich_entry, due, WORKERS):
+            if error is None:
+                labels = result.pop("labels")
+                profile_hash = result.pop("profile_hash")
+                journal.append(entry["key"], result, extra={"source": "retry", **labels})
+                manifest.record(entry["row"], result, profile_hash, generator=generator)
+                queue.remove(entry["key"])
+                recovered += 1
+            else:
+                queued = queue.push(entry["key"], entry["row"], error, permanent=not is_transient(error))
+                metrics.incr("retry_queued")
+                logger.warning("[Row {}] Attempt {} failed ({}): {}", entry["key"][:8], queued["attempts"], queued["status"], error)
+
+        next_retry_at = queue.next_retry_at()
+        if not wait or next_retry_at is None:
+            break
+        delay = max(0.0, next_retry_at - time.time())
+        logger.info("⏳ Next retry in {:.0f}s", delay)
+        time.sleep(delay)
+
+    metrics.finish_run()
+    report_metrics(run)
+    logger.info("✅ Recovered {} row(s) from the retry queue", recovered)
+    report_retry_queue()
+    if recovered:
+        write_output_from_journal(journal, generator)
+
+
+def batch_submit(force: bool = False):
+    """
+    Scrape every row still to enrich, write all LLM prompts to one JSONL request file
+    and submit it as a single batch job (LLM_BATCH_BACKEND).
+    Args:
+        force (bool): Submit even if the previous batch is still pending or not ingested yet.
+    """
+    if os.path.exists(BATCH_STATE_PATH) and not force:
+        with open(BATCH_STATE_PATH, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        status = get_batch_backend(state["backend"]).status(state["batch_id"])
+        # A pending job would be orphaned (and its rows paid twice), a completed one never ingested
+        if status not in FINAL_STATUSES or status == "completed":
+            logger.error("❌ Batch {} is {}: run batch-ingest first (or batch-submit --force)", state["batch_id"], status)
+            flush_logs()
+            sys.exit(1)
+
+    limits = BackendLimits(scraper=SCRAPER_CONCURRENCY, llm=LLM_CONCURRENCY)
+    _, done = load_journal()
+    mode = os.getenv("LLM_GENERATION_MODE", "single")
+    # Same selection as a live run: new, changed and expired contacts
+    rows = rows_to_enrich(done, get_manifest(), generation_signature("llm", mode))
+    # Recorded in the manifest with the results, at ingestion
+    profile_hashes = {}
+
+    def profile_text_for(row):
+        with limits.scraper:
+            profile_dict = build_profile_dict(row)
+        return build_profile_text(profile_dict), profile_fingerprint(profile_dict)
+
+    def batch_items():
+        # custom_id must be unique within a batch: duplicated contacts are sent once
+        seen = set()
+        for row, output, error in ordered_map(profile_text_for, rows, WORKERS):
+            key = row_key(row)
+            if error is not None:
+                logger.error("[Row {}] Error: {}", key[:8], error)
+            elif key not in seen:
+                seen.add(key)
+                profile_text, profile_hashes[key] = output
+                yield key, profile_text
+
+    os.makedirs(BATCH_DIR, exist_ok=True)
+    requests_path = os.path.join(BATCH_DIR, f"requests_{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.jsonl")
+    count = write_batch_requests(batch_items(), CENTER_OF_INTEREST_LIST, requests_path, mode=mode)
+    if count == 0:
+        logger.info("✅ Nothing to submit: every row is up to date")
+        return
+
+    backend_name = os.getenv("LLM_BATCH_BACKEND", "openai")
+    batch_id = get_batch_backend(backend_name).submit(requests_path, mode)
+    state = {"batch_id": batch_id, "backend": backend_name, "mode": mode,
+             "requests_path": requests_path, "rows": count, "profile_hashes": profile_hashes,
+             "submitted_at": datetime.now(timezone.utc).isoformat()}
+    with open(BATCH_STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    logger.info("📦 Batch {} submitted with {} profile(s) ({})", batch_id, count, requests_path)
+
+
+def batch_ingest():
+    """
+    Download the results of the submitted batch job into the checkpoint journal and the
+    manifest, and write OUTPUT_CSV, without any live LLM call.
+    """
+    if not os.path.exists(BATCH_STATE_PATH):
+        logger.error("❌ No submitted batch found ({}). Run batch-submit first.", BATCH_STATE_PATH)
+        flush_logs()
+        sys.exit(1)
+    with open(BATCH_STATE_PATH, "r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    backend = get_batch_backend(state["backend"])
+    status = backend.status(state["batch_id"])
+    if status != "completed":
+        logger.info("⏳ Batch {} status: {}", state["batch_id"], status)
+        if status in FINAL_STATUSES:
+            os.remove(BATCH_STATE_PATH)
+        return
+
+    results_path = state["requests_path"].replace("requests_", "results_")
+    backend.download_results(state["batch_id"], results_path)
+    journal, _ = load_journal()
+    ingested = {}
+    for key, result in parse_batch_results(results_path, mode=state["mode"]).items():
+        try:
+            if isinstance(result, Exception):
+                raise result
+            ingested[key] = validate_result(result)
+            journal.append(key, ingested[key], extra={"source": "batch", "batch_id": state["batch_id"]})
         except Exception as e:
-            print(f"[Row {index}] Error: {e}")
-            descriptions.append("")
-            interets.append("")
+            logger.error("[Row {}] Error: {}", key[:8], e)
+
+    # Every row of an ingested key is up to date: later runs see its contact as unchanged
+    generator = generation_signature("llm", state["mode"])
+    manifest = get_manifest()
+    profile_hashes = state.get("profile_hashes", {})
+    for chunk in read_input_chunks(INPUT_CSV, CHUNK_SIZE):
+        for row in chunk.to_dict("records"):
+            key = row_key(row)
+            if key in ingested:
+                manifest.record(row, ingested[key], profile_hashes.get(key, ""), generator=generator)
+    os.remove(BATCH_STATE_PATH)
+    logger.info("📥 Ingested {}/{} result(s) from batch {}", len(ingested), state["rows"], state["batch_id"])
+
+    write_output_from_journal(journal, generator)
+
+
+def local_tag():
+    """
+    Tag every row still to enrich with the local embedding tagger, without any LLM call:
+    profile texts are built on the worker threads (scraping as usual), then scored by
+    blocks of LOCAL_TAG_BLOCK_SIZE on a process pool. Results go to the checkpoint journal
+    and the manifest, and OUTPUT_CSV is written from them.
+    """
+    limits = BackendLimits(scraper=SCRAPER_CONCURRENCY, llm=LLM_CONCURRENCY)
+    journal, done = load_journal()
+    manifest = get_manifest()
+    generator = generation_signature("embedding")
+    metrics.start_run()
 
-    df["Description"] = descriptions
-    df["Intérêt"] = interets
+    def profile_text_for(row):
+        with limits.scraper:
+            profile_dict = build_profile_dict(row)
+        return build_profile_text(profile_dict), profile_fingerprint(profile_dict)
+
+    def profile_texts():
+        seen = set()
+        rows = rows_to_enrich(done, manifest, generator)
+        for row, output, error in ordered_map(profile_text_for, rows, WORKERS):
+            key = row_key(row)
+            if error is not None:
+                logger.error("[Row {}] Error: {}", key[:8], error)
+            elif key not in seen:
+                seen.add(key)
+                yield (row, *output)
+
+    tagged = untagged = 0
+    items = profile_texts()
+    with embedding_process_pool() as pool:
+        while True:
+            block = list(islice(items, LOCAL_TAG_BLOCK_SIZE))
+            if not block:
+                break
+            with metrics.stage("embedding_tagging"):
+                results = build_interest_and_description_embedding_many([text for _, text, _ in block], executor=pool)
+            for (row, _, profile_hash), result in zip(block, results):
+                key = row_key(row)
+                try:
+                    result = validate_result(result)
+                    journal.append(key, result, extra={"source": "embedding"})
+                    manifest.record(row, result, profile_hash, generator=generator)
+                    tagged += 1
+                except ValueError as e:
+                    logger.debug("[Row {}] Not tagged: {}", key[:8], e)
+                    untagged += 1
+
+    metrics.finish_run()
+    logger.info("🏷️ Tagged {} row(s) locally, {} without any confident tag", tagged, untagged)
+    if tagged:
+        write_output_from_journal(journal, generator)
 
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"✅ Enriched file saved to {OUTPUT_CSV}")
+
+def airtable_pull():
+    """Write INPUT_CSV from the contacts of the Airtable target view, instead of a manual export."""
+    frame = pull_contacts(get_airtable_client("User"))
+    if os.path.dirname(INPUT_CSV):
+        os.makedirs(os.path.dirname(INPUT_CSV), exist_ok=True)
+    partial_path = f"{INPUT_CSV}.part"
+    frame.to_csv(partial_path, index=False)
+    os.replace(partial_path, INPUT_CSV)
+    logger.info("📥 {} contact(s) pulled from Airtable into {}", len(frame), INPUT_CSV)
+
+
+def airtable_push():
+    """
+    Send the Intérêt / Description of OUTPUT_CSV that differ from Airtable, by batches of
+    10 records paced under Airtable's 5 requests per second. AIRTABLE_SYNC_CREATE=true also creates the
+    contacts missing from the table (upsert on Email).
+    """
+    if not os.path.exists(OUTPUT_CSV):
+        logger.error("❌ No enriched file found ({}). Run the enrichment first.", OUTPUT_CSV)
+        flush_logs()
+        sys.exit(1)
+
+    rows = (row for chunk in read_input_chunks(OUTPUT_CSV, CHUNK_SIZE) for row in chunk.to_dict("records"))
+    report = push_enrichment(
+        rows,
+        get_airtable_client("User"),
+        create_missing=is_env_true("AIRTABLE_SYNC_CREATE"),
+        interests_as_list=get_interests_as_list(),
+    )
+    logger.info(
+        "📤 Airtable: {} record(s) updated, {} unchanged, {} row(s) without a matching record, {} created ({} requests)",
+        report["updated"], report["unchanged"], report["missing"], report["created"], report["requests"],
+    )
+
+
+COMMANDS = {
+    "run": main,
+    "local-tag": local_tag,
+    "batch-submit": lambda: batch_submit(force="--force" in sys.argv[2:]),
+    "batch-ingest": batch_ingest,
+    "retry": lambda: retry(wait="--wait" in sys.argv[2:]),
+    "airtable-pull": airtable_pull,
+    "airtable-push": airtable_push,
+}
 
 if __name__ == "__main__":
-    main()
+    """
+    Usage:
+        python3 src/enrich_from_csv.py [run|local-tag|batch-submit [--force]|batch-ingest|retry [--wait]|airtable-pull|airtable-push]
+
+    Commands:
+        run            Live enrichment of INPUT_CSV into OUTPUT_CSV (default), with ENRICH_METHOD
+        local-tag      Tag pending rows with the local embedding tagger on a process pool (no LLM call)
+        batch-submit   Scrape pending rows and submit all LLM prompts as one offline batch job
+                       (refused while a previous batch is not ingested, unless --force)
+        batch-ingest   Fetch the batch results and write OUTPUT_CSV (run again until the job is completed)
+        retry          Enrich again the failed rows that are due in the retry queue (--wait: drain it with backoff)
+        airtable-pull  Write INPUT_CSV from the Airtable User view (replaces the manual export)
+        airtable-push  Send the changed Intérêt / Description of OUTPUT_CSV back to Airtable
+    """
+    configure_logging()
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}. Available: {', '.join(COMMANDS)}")
+        sys.exit(1)
+    try:
+        COMMANDS[command]()
+    finally:
+        flush_logs()
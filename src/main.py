@@ -5,6 +5,7 @@ from services.llm_interface import generate_interest_and_description
 from core.static_values import CENTER_OF_INTEREST_LIST
 from core.schema import GeneratedProfileResult, LinkedInProfile
 from utils.crud import get_profile_text
+from utils.logging_config import configure_logging
 from pydantic import ValidationError
 
 if __name__ == "__main__":
@@ -26,6 +27,8 @@ if __name__ == "__main__":
 
     This will use the LLM-based method to generate interests and descriptions from the example profile.
     """
+    configure_logging()
+
     # TODO Example LinkedIn profile JSON (to be adapted to real API)
     example_profile = {
         "summary": "Expert en Data Engineering et Machine Learning. Passionné par le MLOps.",
@@ -0,0 +1,37 @@
+import os
+import sys
+from dotenv import load_dotenv
+from loguru import logger
+from scrapers.cache_store import SQLiteCacheStore, migrate_json_dir
+from utils.logging_config import configure_logging, flush as flush_logs
+
+if __name__ == "__main__":
+    """
+    Migrate the one-JSON-file-per-URL scrape cache into a single SQLite cache file.
+
+    Usage:
+        python3 src/migrate_scrape_cache.py [json_dir] [sqlite_path]
+
+    Arguments:
+        json_dir      Source directory (default: BRIGHTDATA_CACHE_DIR or data/fetched_json)
+        sqlite_path   Target SQLite file (default: SCRAPE_CACHE_PATH or data/scrape_cache.sqlite)
+
+    Set SCRAPE_CACHE_BACKEND=sqlite afterwards so that scrapers read from the new store.
+    The JSON directory is left untouched.
+    """
+    load_dotenv()
+    configure_logging()
+
+    json_dir = sys.argv[1] if len(sys.argv) > 1 else os.getenv("BRIGHTDATA_CACHE_DIR", "data/fetched_json")
+    sqlite_path = sys.argv[2] if len(sys.argv) > 2 else os.getenv("SCRAPE_CACHE_PATH", "data/scrape_cache.sqlite")
+
+    if not os.path.isdir(json_dir):
+        logger.error("❌ Cache directory not found: {}", json_dir)
+        flush_logs()
+        sys.exit(1)
+
+    store = SQLiteCacheStore(sqlite_path)
+    migrated = migrate_json_dir(json_dir, store)
+    store.close()
+    logger.info("✅ Migrated {} cache entries from {} to {}", migrated, json_dir, sqlite_path)
+    flush_logs()
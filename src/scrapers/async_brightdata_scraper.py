@@ -0,0 +1,155 @@
+import os
+import time
+import asyncio
+from typing import Dict, List, Optional
+import httpx
+from loguru import logger
+from scrapers.brightdata_scraper import BrightDataBase
+from scrapers.cache_store import ScrapeCacheStore
+from scrapers.scrapper_interface import AsyncLinkedInScraper
+from utils import metrics
+from utils.logging_config import log_sampled
+from utils.throttle import BackendUnavailable, ProviderGuard
+
+
+class AsyncBrightDataScraper(BrightDataBase, AsyncLinkedInScraper):
+    """
+    Asyncio BrightData scraper: every snapshot is polled on the same event loop
+    over one shared HTTP connection pool, with exponential backoff between polls.
+
+    Usage:
+        async with AsyncBrightDataScraper() as scraper:
+            profiles = await scraper.scrape_many(urls)
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ScrapeCacheStore] = None,
+        guard: Optional[ProviderGuard] = None,
+    ):
+        super().__init__(cache, guard)
+        # Backoff starts at BRIGHTDATA_POLL_INTERVAL and doubles up to BRIGHTDATA_POLL_MAX_INTERVAL
+        self.max_polling_interval = float(os.getenv("BRIGHTDATA_POLL_MAX_INTERVAL", 30))
+        self.backoff_factor = float(os.getenv("BRIGHTDATA_POLL_BACKOFF", 2))
+        self.max_connections = int(os.getenv("BRIGHTDATA_MAX_CONNECTIONS", 20))
+        self._client = client
+        self._owns_client = client is None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                limits=httpx.Limits(max_connections=self.max_connections),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def scrape(self, linkedin_url: str) -> Dict:
+        self._check_url(linkedin_url)
+
+        profile = self._read_cache(linkedin_url)
+        if profile is None:
+            with self.guard.circuit():
+                with metrics.stage("scrape_trigger"):
+                    snapshot_id = await self._trigger_snapshot([linkedin_url])
+                with metrics.stage("poll_wait"):
+                    await self._wait_until_snapshot_ready(snapshot_id)
+                with metrics.stage("snapshot_fetch"):
+                    profile = (await self._fetch_snapshot_records(snapshot_id))[0]
+            self._write_cache(linkedin_url, profile)
+
+        return self._extract_profile(profile)
+
+    async def scrape_many(self, linkedin_urls: List[str]) -> Dict[str, Dict]:
+        """
+        Trigger one snapshot per batch of cache misses and poll all of them concurrently.
+        Args:
+            linkedin_urls (List[str]): LinkedIn profile URLs.
+        Returns:
+            dict: {url: extracted profile} for every URL that could be resolved.
+        """
+        raw_profiles, missing = self._lookup_cache(linkedin_urls)
+
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        results = await asyncio.gather(
+            *(self._scrape_batch(batch) for batch in batches), return_exceptions=True
+        )
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.warning("⚠️ Snapshot batch of {} URL(s) failed: {}", len(batch), result)
+                continue
+            for url, profile in result.items():
+                self._write_cache(url, profile)
+                raw_profiles[url] = profile
+
+        unresolved = [url for url in missing if url not in raw_profiles]
+        if unresolved:
+            logger.warning("⚠️ No snapshot record for {} URL(s): {}", len(unresolved), unresolved)
+
+        return {url: self._extract_profile(profile) for url, profile in raw_profiles.items()}
+
+    async def _scrape_batch(self, batch: List[str]) -> Dict[str, Dict]:
+        with self.guard.circuit():
+            with metrics.stage("scrape_trigger"):
+                snapshot_id = await self._trigger_snapshot(batch)
+            with metrics.stage("poll_wait"):
+                await self._wait_until_snapshot_ready(snapshot_id)
+            with metrics.stage("snapshot_fetch"):
+                records = await self._fetch_snapshot_records(snapshot_id)
+        return self._split_records(batch, records)
+
+    async def _trigger_snapshot(self, linkedin_urls: List[str]) -> str:
+        params = {"dataset_id": self.dataset_id, "include_errors": "true"}
+        data = [{"url": url} for url in linkedin_urls]
+        await self.guard.athrottle()
+        resp = await self.client.post(self.trigger_endpoint, params=params, json=data)
+        resp.raise_for_status()
+        snapshot_id = resp.json().get("snapshot_id")
+        if not snapshot_id:
+            raise ValueError(f"No snapshot_id returned: {resp.json()}")
+        logger.info("⏳ Snapshot triggered: {} ({} URL(s))", snapshot_id, len(linkedin_urls))
+        return snapshot_id
+
+    async def _wait_until_snapshot_ready(self, snapshot_id: str):
+        url = self.progress_endpoint_template.format(snapshot_id=snapshot_id)
+        start = time.monotonic()
+        delay = float(self.polling_interval)
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed > self.max_timeout:
+                raise TimeoutError(f"⏱️ Timeout: snapshot {snapshot_id} not ready after {self.max_timeout} seconds")
+            await self.guard.athrottle()
+            resp = await self.client.get(url)
+            if resp.status_code == 200:
+                state = resp.json().get("status")
+                log_sampled("brightdata_poll", "DEBUG", "📶 Snapshot {} status: {} (after {}s)", snapshot_id, state, int(elapsed))
+                if state == "ready":
+                    return
+                if state == "failed":
+                    raise BackendUnavailable(f"❌ Snapshot {snapshot_id} failed")
+            elif resp.status_code != 202:
+                logger.warning("⚠️ Unexpected polling response: {}", resp.status_code)
+            # Never sleep past the deadline
+            remaining = self.max_timeout - (time.monotonic() - start)
+            await asyncio.sleep(max(0.0, min(delay, remaining)))
+            delay = min(delay * self.backoff_factor, self.max_polling_interval)
+
+    async def _fetch_snapshot_records(self, snapshot_id: str) -> List[Dict]:
+        url = self.data_url_template.format(snapshot_id=snapshot_id)
+        await self.guard.athrottle()
+        resp = await self.client.get(url)
+        resp.raise_for_status()
+        return self._snapshot_records(snapshot_id, resp.json())
@@ -1,79 +1,214 @@
 import os
 import time
-import json
-import hashlib
-import requests
-from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from loguru import logger
+from scrapers.cache_store import ScrapeCacheStore, get_scrape_cache_store
 from scrapers.scrapper_interface import LinkedInScraper
+from utils.http_client import PooledHTTPClient, get_http_client
+from utils import metrics
+from utils.logging_config import log_sampled
+from utils.throttle import BackendUnavailable, ProviderGuard, get_provider_guard
 
 load_dotenv()
 
-class BrightDataScraper(LinkedInScraper):
-    def __init__(self):
+class BrightDataBase:
+    """Configuration, cache and record-parsing logic shared by the sync and async BrightData scrapers."""
+
+    SCRAPER_NAME = "brightdata"
+
+    def __init__(self, cache: Optional[ScrapeCacheStore] = None, guard: Optional[ProviderGuard] = None):
         self.api_key = os.getenv("BRIGHTDATA_API_KEY")
         self.dataset_id = os.getenv("BRIGHTDATA_DATASET_ID")
-        self.polling_interval = int(os.getenv("BRIGHTDATA_POLL_INTERVAL", 3))
-        self.max_timeout = int(os.getenv("BRIGHTDATA_TIMEOUT", 120))
-        self.cache_dir = os.getenv("BRIGHTDATA_CACHE_DIR", "data/fetched_json")
+        self.polling_interval = float(os.getenv("BRIGHTDATA_POLL_INTERVAL", 3))
+        self.max_timeout = float(os.getenv("BRIGHTDATA_TIMEOUT", 120))
+        self.batch_size = int(os.getenv("BRIGHTDATA_BATCH_SIZE", 50))
 
         if not self.api_key or not self.dataset_id:
             raise EnvironmentError("BRIGHTDATA_API_KEY or BRIGHTDATA_DATASET_ID is missing")
 
-        self.trigger_endpoint = "https://api.brightdata.com/datasets/v3/trigger"
-        self.progress_endpoint_template = "https://api.brightdata.com/datasets/v3/progress/{snapshot_id}"
-        self.data_url_template = "https://api.brightdata.com/datasets/v3/snapshot/{snapshot_id}?format=json"
+        # Overridable to point the scraper at a local stand-in (see benchmarks/)
+        api_base = os.getenv("BRIGHTDATA_API_BASE", "https://api.brightdata.com/datasets/v3").rstrip("/")
+        self.trigger_endpoint = f"{api_base}/trigger"
+        self.progress_endpoint_template = api_base + "/progress/{snapshot_id}"
+        self.data_url_template = api_base + "/snapshot/{snapshot_id}?format=json"
 
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
-        os.makedirs(self.cache_dir, exist_ok=True)
+        self.cache = cache or get_scrape_cache_store()
+        # Rate limit for every BrightData request; the circuit covers a whole snapshot cycle
+        self.guard = guard or get_provider_guard(self.SCRAPER_NAME)
 
-    def scrape(self, linkedin_url: str) -> Dict:
+    def _check_url(self, linkedin_url: str):
         if not linkedin_url or "linkedin.com/in/" not in linkedin_url:
             raise ValueError(f"Invalid LinkedIn URL: '{linkedin_url}'")
 
-        cache_path = self._url_to_cache_path(linkedin_url)
-
-        if os.path.exists(cache_path):
-            print(f"📁 Using cached data for {linkedin_url}")
-            with open(cache_path, "r", encoding="utf-8") as f:
-                cached = json.load(f)
-                profile = cached.get("data", {})
-        else:
-            snapshot_id = self._trigger_snapshot(linkedin_url)
-            self._wait_until_snapshot_ready(snapshot_id)
-            profile = self._fetch_snapshot_data(snapshot_id)
-
-            cached = {
-                "scraper": "brightdata",
-                "fetched_at": datetime.utcnow().isoformat() + "Z",
-                "url": linkedin_url,
-                "data": profile
-            }
-
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(cached, f, ensure_ascii=False, indent=2)
-            print(f"✅ Cached snapshot JSON: {cache_path}")
+    def _lookup_cache(self, linkedin_urls: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """Split URLs into cached raw profiles and cache misses (deduplicated, order kept)."""
+        for url in linkedin_urls:
+            self._check_url(url)
+
+        urls = list(dict.fromkeys(linkedin_urls))
+        with metrics.stage("cache_lookup"):
+            cached = self.cache.get_many(self.SCRAPER_NAME, urls)
+        metrics.incr("scrape_cache_hits", len(cached))
+        metrics.incr("scrape_cache_misses", len(urls) - len(cached))
+        if cached:
+            logger.debug("📁 Using cached data for {}/{} URL(s)", len(cached), len(urls))
+        raw_profiles = {url: cached[url].get("data", {}) for url in urls if url in cached}
+        missing = [url for url in urls if url not in cached]
+        return raw_profiles, missing
+
+    def _read_cache(self, linkedin_url: str) -> Optional[Dict]:
+        with metrics.stage("cache_lookup"):
+            entry = self.cache.get(self.SCRAPER_NAME, linkedin_url)
+        if entry is None:
+            metrics.incr("scrape_cache_misses")
+            return None
+        metrics.incr("scrape_cache_hits")
+        logger.debug("📁 Using cached data for {}", linkedin_url)
+        return entry.get("data", {})
+
+    def _write_cache(self, linkedin_url: str, profile: Dict):
+        self.cache.put(self.SCRAPER_NAME, linkedin_url, profile)
+        logger.debug("✅ Cached snapshot JSON for {}", linkedin_url)
+
+    def _split_records(self, linkedin_urls: List[str], records: List[Dict]) -> Dict[str, Dict]:
+        """Map the records of a multi-URL snapshot back to the URLs that were requested."""
+        by_key = {self._match_key(url): url for url in linkedin_urls}
+        matched = {}
+        for record in records:
+            if record.get("error") or record.get("warning_code") == "dead_page":
+                continue
+            candidates = [
+                (record.get("input") or {}).get("url"),
+                record.get("input_url"),
+                record.get("url"),
+            ]
+            for candidate in candidates:
+                url = by_key.get(self._match_key(candidate)) if candidate else None
+                if url and url not in matched:
+                    matched[url] = record
+                    break
+        return matched
+
+    @staticmethod
+    def _snapshot_records(snapshot_id: str, data) -> List[Dict]:
+        """Records of a snapshot answer, flat (`[{...}]`) or nested in one list (`[[{...}]]`)."""
+        if isinstance(data, list) and data and isinstance(data[0], list):
+            data = data[0]
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            logger.debug("✅ Data received from snapshot {} ({} record(s))", snapshot_id, len(data))
+            return data
+        raise ValueError(f"❌ Unexpected snapshot format for {snapshot_id}: {type(data)}")
 
-        return self._extract_profile(profile)
+    @staticmethod
+    def _match_key(linkedin_url: str) -> str:
+        return linkedin_url.strip().rstrip("/").split("?")[0].lower()
+
+    def _extract_profile(self, profile: Dict) -> Dict:
+        summary = (
+            profile.get("about")
+            or (profile.get("recommendations") or [None])[0]
+            or ""
+        )
+
+        current = profile.get("current_company", {})
+        title = current.get("title", "")
+        company = current.get("name", "")
+        headline = f"{title} at {company}".strip() if title or company else ""
+
+        return {
+            "summary": summary,
+            "headline": headline,
+            "experience": []
+        }
+
+
+class BrightDataScraper(BrightDataBase, LinkedInScraper):
+    NATIVE_BATCH = True
+
+    def __init__(
+        self,
+        cache: Optional[ScrapeCacheStore] = None,
+        http_client: Optional[PooledHTTPClient] = None,
+        guard: Optional[ProviderGuard] = None,
+    ):
+        super().__init__(cache, guard)
+        # Shared keep-alive session: polling reuses the same connection instead of a new TLS handshake
+        self.http = http_client or get_http_client()
+
+    def format_url(self, linkedin_url: str) -> str:
+        return linkedin_url.strip()  # full URL, no transformation
 
-    def _url_to_cache_path(self, linkedin_url: str) -> str:
-        slug = hashlib.md5(linkedin_url.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"brightdata_{slug}.json")
+    def scrape(self, linkedin_url: str) -> Dict:
+        self._check_url(linkedin_url)
+
+        profile = self._read_cache(linkedin_url)
+        if profile is None:
+            with self.guard.circuit():
+                with metrics.stage("scrape_trigger"):
+                    snapshot_id = self._trigger_snapshot([linkedin_url])
+                with metrics.stage("poll_wait"):
+                    self._wait_until_snapshot_ready(snapshot_id)
+                with metrics.stage("snapshot_fetch"):
+                    profile = self._fetch_snapshot_data(snapshot_id)
+            self._write_cache(linkedin_url, profile)
+
+        return self._extract_profile(profile)
 
-    def _trigger_snapshot(self, linkedin_url: str) -> str:
+    def scrape_many(self, linkedin_urls: List[str]) -> Dict[str, Dict]:
+        """
+        Scrape several profiles, triggering one snapshot per batch of cache misses.
+        Args:
+            linkedin_urls (List[str]): LinkedIn profile URLs.
+        Returns:
+            dict: {url: extracted profile} for every URL that could be resolved.
+        """
+        raw_profiles, missing = self._lookup_cache(linkedin_urls)
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            try:
+                profiles = self._scrape_batch(batch)
+            except Exception as e:
+                # One failed snapshot must not discard the profiles of the other batches
+                logger.warning("⚠️ Snapshot batch of {} URL(s) failed: {}", len(batch), e)
+                continue
+            for url, profile in profiles.items():
+                self._write_cache(url, profile)
+                raw_profiles[url] = profile
+
+        unresolved = [url for url in missing if url not in raw_profiles]
+        if unresolved:
+            logger.warning("⚠️ No snapshot record for {} URL(s): {}", len(unresolved), unresolved)
+
+        return {url: self._extract_profile(profile) for url, profile in raw_profiles.items()}
+
+    def _scrape_batch(self, batch: List[str]) -> Dict[str, Dict]:
+        """Trigger, wait for and fetch one snapshot: {url: raw profile} of the batch."""
+        with self.guard.circuit():
+            with metrics.stage("scrape_trigger"):
+                snapshot_id = self._trigger_snapshot(batch)
+            with metrics.stage("poll_wait"):
+                self._wait_until_snapshot_ready(snapshot_id)
+            with metrics.stage("snapshot_fetch"):
+                records = self._fetch_snapshot_records(snapshot_id)
+        return self._split_records(batch, records)
+
+    def _trigger_snapshot(self, linkedin_urls: List[str]) -> str:
         params = {"dataset_id": self.dataset_id, "include_errors": "true"}
-        data = [{"url": linkedin_url}]
-        resp = requests.post(self.trigger_endpoint, headers=self.headers, params=params, json=data)
+        data = [{"url": url} for url in linkedin_urls]
+        self.guard.throttle()
+        resp = self.http.post(self.trigger_endpoint, headers=self.headers, params=params, json=data)
         resp.raise_for_status()
         snapshot_id = resp.json().get("snapshot_id")
         if not snapshot_id:
             raise ValueError(f"No snapshot_id returned: {resp.json()}")
-        print(f"⏳ Snapshot triggered: {snapshot_id}")
+        logger.info("⏳ Snapshot triggered: {} ({} URL(s))", snapshot_id, len(linkedin_urls))
         return snapshot_id
 
     def _wait_until_snapshot_ready(self, snapshot_id: str):
@@ -83,54 +218,27 @@ class BrightDataScraper(LinkedInScraper):
             elapsed = time.time() - start
             if elapsed > self.max_timeout:
                 raise TimeoutError(f"⏱️ Timeout: snapshot {snapshot_id} not ready after {self.max_timeout} seconds")
-            resp = requests.get(url, headers=self.headers)
+            self.guard.throttle()
+            resp = self.http.get(url, headers=self.headers)
             if resp.status_code == 200:
                 state = resp.json().get("status")
-                print(f"📶 Snapshot {snapshot_id} status: {state} (after {int(elapsed)}s)")
+                log_sampled("brightdata_poll", "DEBUG", "📶 Snapshot {} status: {} (after {}s)", snapshot_id, state, int(elapsed))
                 if state == "ready":
                     return
+                if state == "failed":
+                    raise BackendUnavailable(f"❌ Snapshot {snapshot_id} failed")
             elif resp.status_code == 202:
-                print(f"⌛ Waiting... ({int(elapsed)}s)")
+                log_sampled("brightdata_poll", "DEBUG", "⌛ Waiting for snapshot {}... ({}s)", snapshot_id, int(elapsed))
             else:
-                print(f"⚠️ Unexpected polling response: {resp.status_code}")
+                logger.warning("⚠️ Unexpected polling response: {}", resp.status_code)
             time.sleep(self.polling_interval)
-    """
-    def _fetch_snapshot_data(self, snapshot_id: str) -> Dict:
-        url = self.data_url_template.format(snapshot_id=snapshot_id)
-        resp = requests.get(url, headers=self.headers)
-        resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, list):
-            batch = data[0] if data and isinstance(data[0], list) else data
-            if batch and isinstance(batch[0], dict):
-                print(f"✅ Data received from snapshot {snapshot_id}")
-                return batch[0]
-        raise ValueError(f"❌ Unexpected snapshot format for {snapshot_id}")
-    """
+
     def _fetch_snapshot_data(self, snapshot_id: str) -> Dict:
+        return self._fetch_snapshot_records(snapshot_id)[0]
+
+    def _fetch_snapshot_records(self, snapshot_id: str) -> List[Dict]:
         url = self.data_url_template.format(snapshot_id=snapshot_id)
-        resp = requests.get(url, headers=self.headers)
+        self.guard.throttle()
+        resp = self.http.get(url, headers=self.headers)
         resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, list) and data and isinstance(data[0], dict):
-            print(f"✅ Data received from snapshot {snapshot_id}")
-            return data[0]
-        raise ValueError(f"❌ Unexpected snapshot format for {snapshot_id}: {type(data)}")
-
-    def _extract_profile(self, profile: Dict) -> Dict:
-        summary = (
-            profile.get("about")
-            or (profile.get("recommendations") or [None])[0]
-            or ""
-        )
-
-        current = profile.get("current_company", {})
-        title = current.get("title", "")
-        company = current.get("name", "")
-        headline = f"{title} at {company}".strip() if title or company else ""
-
-        return {
-            "summary": summary,
-            "headline": headline,
-            "experience": []
-        }
+        return self._snapshot_records(snapshot_id, resp.json())
@@ -0,0 +1,326 @@
+"""
+Pluggable cache stores for raw scraper payloads.
+
+Every entry is a dict {"scraper", "fetched_at", "url", "data"} where `data` is
+the raw provider payload (before `_extract_profile`). Two backends are available:
+
+- JsonDirCacheStore: the historical layout, one pretty-printed JSON file per URL
+  (`{scraper}_{md5(url)}.json`) in a directory.
+- SQLiteCacheStore: a single WAL-mode SQLite file with compressed compact JSON
+  payloads, TTL, bulk lookups and an index on (scraper, url).
+
+The backend is selected with SCRAPE_CACHE_BACKEND (json|sqlite), see
+`get_scrape_cache_store`. Use `migrate_json_dir` (or src/migrate_scrape_cache.py)
+to move an existing directory into SQLite.
+
+Entries are keyed on the canonical LinkedIn URL (`cache_key`), so every form of a
+profile URL hits the same entry. Caches written with the raw URLs are re-keyed the
+first time they are opened.
+"""
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from core.dedup import canonicalize_linkedin_url
+
+
+def _to_iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _from_iso(value: str) -> float:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=timezone.utc).timestamp()
+    except (AttributeError, ValueError):
+        return 0.0
+
+
+def cache_key(url: str) -> str:
+    """Key of a cache entry: the canonical LinkedIn URL (public IDs become full URLs)."""
+    return canonicalize_linkedin_url(url)
+
+
+class ScrapeCacheStore:
+    """Interface of a raw scrape cache. TTL is in seconds, None means entries never expire."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, scraper: str, url: str) -> Optional[Dict]:
+        return self.get_many(scraper, [url]).get(url)
+
+    def get_many(self, scraper: str, urls: List[str]) -> Dict[str, Dict]:
+        raise NotImplementedError("Cache store must implement get_many method.")
+
+    def put(self, scraper: str, url: str, data: Dict, fetched_at: Optional[float] = None):
+        raise NotImplementedError("Cache store must implement put method.")
+
+    def put_many(self, scraper: str, entries: Dict[str, Dict], fetched_at: Optional[float] = None):
+        for url, data in entries.items():
+            self.put(scraper, url, data, fetched_at)
+
+    def delete(self, scraper: str, url: str):
+        raise NotImplementedError("Cache store must implement delete method.")
+
+    def iter_entries(self, scraper: Optional[str] = None) -> Iterator[Dict]:
+        raise NotImplementedError("Cache store must implement iter_entries method.")
+
+    def is_expired(self, entry: Dict) -> bool:
+        if not self.ttl_seconds:
+            return False
+        return time.time() - _from_iso(entry.get("fetched_at", "")) > self.ttl_seconds
+
+
+class JsonDirCacheStore(ScrapeCacheStore):
+    """One JSON file per URL, as historically written by BrightDataScraper."""
+
+    # Written once the files named after raw URLs have been renamed after their cache key
+    REKEYED_MARKER = ".canonical_keys"
+
+    def __init__(self, cache_dir: str, ttl_seconds: Optional[float] = None, rekey: bool = True):
+        super().__init__(ttl_seconds)
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if rekey:
+            self._rekey_legacy_files()
+
+    def path_for(self, scraper: str, url: str) -> str:
+        slug = hashlib.md5(cache_key(url).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{scraper}_{slug}.json")
+
+    def _rekey_legacy_files(self):
+        marker = os.path.join(self.cache_dir, self.REKEYED_MARKER)
+        if os.path.exists(marker):
+            return
+        renamed = 0
+        for path in sorted(glob.glob(os.path.join(self.cache_dir, "*.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if not isinstance(entry, dict) or "url" not in entry or "scraper" not in entry:
+                continue
+            target = self.path_for(entry["scraper"], entry["url"])
+            if target == path:
+                continue
+            if os.path.exists(target):
+                # Another form of the same URL is already cached under the canonical key
+                os.remove(path)
+            else:
+                os.replace(path, target)
+            renamed += 1
+        if renamed:
+            logger.info("🔑 Re-keyed {} cache file(s) of {} on canonical LinkedIn URLs", renamed, self.cache_dir)
+        open(marker, "w").close()
+
+    def get_many(self, scraper: str, urls: List[str]) -> Dict[str, Dict]:
+        entries = {}
+        for url in urls:
+            path = self.path_for(scraper, url)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if not self.is_expired(entry):
+                entries[url] = entry
+        return entries
+
+    def put(self, scraper: str, url: str, data: Dict, fetched_at: Optional[float] = None):
+        entry = {
+            "scraper": scraper,
+            "fetched_at": _to_iso(fetched_at or time.time()),
+            "url": cache_key(url),
+            "data": data,
+        }
+        with open(self.path_for(scraper, url), "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+
+    def delete(self, scraper: str, url: str):
+        path = self.path_for(scraper, url)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def iter_entries(self, scraper: Optional[str] = None) -> Iterator[Dict]:
+        pattern = f"{scraper}_*.json" if scraper else "*.json"
+        for path in sorted(glob.glob(os.path.join(self.cache_dir, pattern))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("⚠️ Skipping unreadable cache file {}: {}", path, e)
+                continue
+            if isinstance(entry, dict) and "url" in entry:
+                yield entry
+
+
+class SQLiteCacheStore(ScrapeCacheStore):
+    """Single-file SQLite cache (WAL) with zlib-compressed compact JSON payloads."""
+
+    # SQLite caps the number of bound parameters per statement
+    LOOKUP_CHUNK = 500
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None):
+        super().__init__(ttl_seconds)
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_cache ("
+            " scraper TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " PRIMARY KEY (scraper, url))"
+        )
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            # Entries migrated with their raw URLs: move them under their cache key
+            self._conn.create_function("cache_key", 1, cache_key, deterministic=True)
+            self._conn.execute("UPDATE OR REPLACE scrape_cache SET url = cache_key(url)")
+            self._conn.execute("PRAGMA user_version = 1")
+        self._conn.commit()
+
+    @staticmethod
+    def _encode(data: Dict) -> bytes:
+        return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(payload: bytes) -> Dict:
+        return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+    def _min_fetched_at(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    def get_many(self, scraper: str, urls: List[str]) -> Dict[str, Dict]:
+        keys = list(dict.fromkeys(cache_key(url) for url in urls))
+        found = {}
+        min_fetched_at = self._min_fetched_at()
+        with self._lock:
+            for start in range(0, len(keys), self.LOOKUP_CHUNK):
+                chunk = keys[start:start + self.LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url, fetched_at, payload FROM scrape_cache "
+                    f"WHERE scraper = ? AND fetched_at >= ? AND url IN ({placeholders})",
+                    (scraper, min_fetched_at, *chunk),
+                ).fetchall()
+                for key, fetched_at, payload in rows:
+                    found[key] = {
+                        "scraper": scraper,
+                        "fetched_at": _to_iso(fetched_at),
+                        "url": key,
+                        "data": self._decode(payload),
+                    }
+        # Keyed by the URLs as requested, in request order
+        return {url: found[cache_key(url)] for url in dict.fromkeys(urls) if cache_key(url) in found}
+
+    def put(self, scraper: str, url: str, data: Dict, fetched_at: Optional[float] = None):
+        self.put_many(scraper, {url: data}, fetched_at)
+
+    def put_many(self, scraper: str, entries: Dict[str, Dict], fetched_at: Optional[float] = None):
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scrape_cache (scraper, url, fetched_at, payload) VALUES (?, ?, ?, ?)",
+                [(scraper, cache_key(url), fetched_at, self._encode(data)) for url, data in entries.items()],
+            )
+            self._conn.commit()
+
+    def delete(self, scraper: str, url: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM scrape_cache WHERE scraper = ? AND url = ?", (scraper, cache_key(url)))
+            self._conn.commit()
+
+    def iter_entries(self, scraper: Optional[str] = None) -> Iterator[Dict]:
+        query = "SELECT scraper, url, fetched_at, payload FROM scrape_cache"
+        params = ()
+        if scraper:
+            query += " WHERE scraper = ?"
+            params = (scraper,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY scraper, url", params).fetchall()
+        for name, url, fetched_at, payload in rows:
+            yield {"scraper": name, "fetched_at": _to_iso(fetched_at), "url": url, "data": self._decode(payload)}
+
+    def purge_expired(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM scrape_cache WHERE fetched_at < ?", (self._min_fetched_at(),)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_dir(cache_dir: str, store: ScrapeCacheStore) -> int:
+    """
+    Copy every `{scraper}_{md5}.json` file of a JSON cache directory into `store`,
+    keeping the original fetch dates. The directory itself is left untouched.
+    Returns:
+        int: Number of migrated entries.
+    """
+    migrated = 0
+    for entry in JsonDirCacheStore(cache_dir, rekey=False).iter_entries():
+        store.put(
+            entry.get("scraper", "brightdata"),
+            entry["url"],
+            entry.get("data", {}),
+            fetched_at=_from_iso(entry.get("fetched_at", "")) or None,
+        )
+        migrated += 1
+    return migrated
+
+
+_stores: Dict[tuple, ScrapeCacheStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_scrape_cache_ttl() -> Optional[float]:
+    """SCRAPE_CACHE_TTL_DAYS in seconds, None when entries never expire."""
+    ttl_days = float(os.getenv("SCRAPE_CACHE_TTL_DAYS", 0) or 0)
+    return ttl_days * 86400 if ttl_days > 0 else None
+
+def get_scrape_cache_store() -> ScrapeCacheStore:
+    """
+    Return the process-wide scrape cache configured from the environment:
+        SCRAPE_CACHE_BACKEND   json (default) or sqlite
+        SCRAPE_CACHE_PATH      SQLite file (default data/scrape_cache.sqlite)
+        BRIGHTDATA_CACHE_DIR   JSON directory (default data/fetched_json)
+        SCRAPE_CACHE_TTL_DAYS  Entry lifetime in days, 0 or unset for no expiry
+    """
+    backend = os.getenv("SCRAPE_CACHE_BACKEND", "json").strip().lower()
+    ttl_seconds = get_scrape_cache_ttl()
+
+    if backend == "sqlite":
+        location = os.getenv("SCRAPE_CACHE_PATH", "data/scrape_cache.sqlite")
+    elif backend == "json":
+        location = os.getenv("BRIGHTDATA_CACHE_DIR", "data/fetched_json")
+    else:
+        raise ValueError(f"Unknown SCRAPE_CACHE_BACKEND: {backend}")
+
+    key = (backend, location, ttl_seconds)
+    with _stores_lock:
+        if key not in _stores:
+            if backend == "sqlite":
+                _stores[key] = SQLiteCacheStore(location, ttl_seconds)
+            else:
+                _stores[key] = JsonDirCacheStore(location, ttl_seconds)
+        return _stores[key]
@@ -1,9 +1,25 @@
 # src/scrapers/linkedin_api_scraper.py
+import os
+from typing import Optional
 from linkedin_api import Linkedin
+from scrapers.cache_store import ScrapeCacheStore, get_scrape_cache_store
 from scrapers.scrapper_interface import LinkedInScraper
+from utils import metrics
+from utils.throttle import CircuitOpenError, ProviderGuard, get_provider_guard, is_backend_failure
 
 class LinkedInApiScraper(LinkedInScraper):
-    def __init__(self, li_at_cookie: str):
+    SCRAPER_NAME = "linkedin_api"
+
+    def __init__(
+        self,
+        li_at_cookie: Optional[str] = None,
+        cache: Optional[ScrapeCacheStore] = None,
+        guard: Optional[ProviderGuard] = None,
+    ):
+        self.cache = cache or get_scrape_cache_store()
+        # Cookie sessions get banned on bursts: keep the default rate low (LINKEDIN_API_RATE_LIMIT)
+        self.guard = guard or get_provider_guard(self.SCRAPER_NAME)
+        li_at_cookie = li_at_cookie or os.getenv("LINKEDIN_LI_AT")
         if not li_at_cookie:
             raise ValueError("Missing LinkedIn session cookie (li_at).")
 
@@ -14,7 +30,15 @@ class LinkedInApiScraper(LinkedInScraper):
 
     def scrape(self, public_identifier: str):
         try:
-            profile = self.api.get_profile(public_identifier)
+            with metrics.stage("cache_lookup"):
+                cached = self.cache.get(self.SCRAPER_NAME, public_identifier)
+            metrics.incr("scrape_cache_hits" if cached is not None else "scrape_cache_misses")
+            if cached is not None:
+                profile = cached.get("data", {})
+            else:
+                with self.guard, metrics.stage("profile_fetch"):
+                    profile = self.api.get_profile(public_identifier)
+                self.cache.put(self.SCRAPER_NAME, public_identifier, profile)
 
             experiences = profile.get("experience", []) or []
             formatted_exp = [
@@ -33,4 +57,7 @@ class LinkedInApiScraper(LinkedInScraper):
             }
 
         except Exception as e:
+            # Open circuits, rate limits and transport errors are retried later: keep their type
+            if isinstance(e, CircuitOpenError) or is_backend_failure(e):
+                raise
             raise ValueError(f"Failed to fetch profile for '{public_identifier}': {e}")
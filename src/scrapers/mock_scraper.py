@@ -1,5 +1,5 @@
-# utils/mock_scraper.py
-from utils.scrapper_interface import LinkedInScraper
+# src/scrapers/mock_scraper.py
+from scrapers.scrapper_interface import LinkedInScraper
 
 class MockScraper(LinkedInScraper):
     def scrape(self, linkedin_url: str):
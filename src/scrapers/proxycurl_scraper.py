@@ -1,16 +1,34 @@
 # utils/proxycurl_scraper.py
 import os
-from typing import Dict
+from typing import Dict, Optional
 from utils.proxy_utils import fetch_profile
-from utils.scrapper_interface import LinkedInScraper
+from scrapers.cache_store import ScrapeCacheStore, get_scrape_cache_store
+from scrapers.scrapper_interface import LinkedInScraper
+from utils import metrics
+from utils.throttle import ProviderGuard, get_provider_guard
 
 class ProxycurlScraper(LinkedInScraper):
-    def scrape(self, linkedin_url: str) -> Dict:
-        headers = {"Authorization": f"Bearer {os.getenv('PROXYCURL_API_KEY')}"}
-        raw_data = fetch_profile(linkedin_url, headers)
+    SCRAPER_NAME = "proxycurl"
+
+    def __init__(self, cache: Optional[ScrapeCacheStore] = None, guard: Optional[ProviderGuard] = None):
+        self.cache = cache or get_scrape_cache_store()
+        self.guard = guard or get_provider_guard(self.SCRAPER_NAME)
 
-        if not raw_data:
-            raise ValueError("LinkedIn scraping failed or profile not found.")
+    def scrape(self, linkedin_url: str) -> Dict:
+        with metrics.stage("cache_lookup"):
+            cached = self.cache.get(self.SCRAPER_NAME, linkedin_url)
+        metrics.incr("scrape_cache_hits" if cached is not None else "scrape_cache_misses")
+        if cached is not None:
+            raw_data = cached.get("data", {})
+        else:
+            headers = {"Authorization": f"Bearer {os.getenv('PROXYCURL_API_KEY')}"}
+            with self.guard, metrics.stage("profile_fetch"):
+                # Transport errors, 429 and 5xx are raised here and counted by the breaker
+                raw_data = fetch_profile(linkedin_url, headers)
+            # A missing profile says nothing about Proxycurl's health
+            if not raw_data:
+                raise ValueError("LinkedIn scraping failed or profile not found.")
+            self.cache.put(self.SCRAPER_NAME, linkedin_url, raw_data)
 
         summary = raw_data.get("summary", "")
         headline = raw_data.get("occupation", "")
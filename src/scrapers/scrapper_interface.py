@@ -1,5 +1,40 @@
-from typing import Dict
+import asyncio
+from typing import Dict, List
+from loguru import logger
 
 class LinkedInScraper:
+    # True when `scrape_many` fetches several profiles in one request and caches them
+    NATIVE_BATCH = False
+
+    def format_url(self, linkedin_url: str) -> str:
+        """Turn a full profile URL into the identifier `scrape` expects (public_id by default)."""
+        return linkedin_url.rstrip("/").split("/")[-1]
+
     def scrape(self, linkedin_url: str) -> Dict:
-        raise NotImplementedError("Scraper must implement scrape method.")
\ No newline at end of file
+        raise NotImplementedError("Scraper must implement scrape method.")
+
+    def scrape_many(self, linkedin_urls: List[str]) -> Dict[str, Dict]:
+        """Default batch implementation: one `scrape` call per URL, failures are skipped."""
+        profiles = {}
+        for url in dict.fromkeys(linkedin_urls):
+            try:
+                profiles[url] = self.scrape(url)
+            except Exception as e:
+                logger.warning("⚠️ Failed to scrape {}: {}", url, e)
+        return profiles
+
+class AsyncLinkedInScraper:
+    async def scrape(self, linkedin_url: str) -> Dict:
+        raise NotImplementedError("Scraper must implement scrape method.")
+
+    async def scrape_many(self, linkedin_urls: List[str]) -> Dict[str, Dict]:
+        """Default batch implementation: all `scrape` calls run concurrently, failures are skipped."""
+        urls = list(dict.fromkeys(linkedin_urls))
+        results = await asyncio.gather(*(self.scrape(url) for url in urls), return_exceptions=True)
+        profiles = {}
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.warning("⚠️ Failed to scrape {}: {}", url, result)
+            else:
+                profiles[url] = result
+        return profiles
@@ -0,0 +1,262 @@
+"""
+Direct Airtable sync for the enrichment pipeline, replacing the manual CSV round-trip.
+
+- pull: read the contacts of the target view into a DataFrame with the columns of
+  the Airtable CSV export (Prénom, Nom, Email, Métier, Intérêt, Domain, Description, Linkedin).
+- push: write the enriched `Intérêt` / `Description` back. Output rows are matched to
+  Airtable records by record id (pulled files), email, then canonical LinkedIn URL, and
+  only the fields whose value actually changed are sent (tags are compared as canonical
+  tag sets).
+
+Writes are batched by 10 records per request (the Airtable maximum) and every request
+goes through the "airtable" provider guard: evenly spaced requests at 4.5 per second,
+under Airtable's limit of 5 (AIRTABLE_RATE_LIMIT), and a circuit breaker. Table URLs,
+views, headers and column names come from core.static_values (AIRTABLE_URLS,
+get_view_mapping, HEADERS, CREATE_ROW_COLUMNS).
+
+Example usage:
+    client = get_airtable_client("User")
+    frame = pull_contacts(client)
+    report = push_enrichment(output_frame.to_dict("records"), client)
+"""
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from core.dedup import canonicalize_linkedin_url
+from core.schema import normalize_tags
+from core.static_values import AIRTABLE_URLS, CREATE_ROW_COLUMNS, HEADERS, get_view_mapping
+from utils import metrics
+from utils.http_client import PooledHTTPClient, get_http_client
+from utils.throttle import ProviderGuard, get_provider_guard
+
+RECORD_ID_COLUMN = "Record ID"
+MAX_RECORDS_PER_REQUEST = 10
+PAGE_SIZE = 100
+# Airtable asks clients to wait 30 seconds after a 429
+RATE_LIMIT_WAIT = 30.0
+
+# Column keys of CREATE_ROW_COLUMNS["User"] used by the enrichment pipeline
+CONTACT_COLUMN_KEYS = ["name", "lastname", "email", "job_category", "interests", "domains", "description", "linkedin"]
+
+
+class AirtableError(RuntimeError):
+    """Airtable answered with an error status."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Airtable error {status_code}: {message}")
+        self.status_code = status_code
+
+
+class AirtableClient:
+    """Paginated reads and batched, rate-limited writes on one Airtable table."""
+
+    def __init__(
+        self,
+        table_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        http: Optional[PooledHTTPClient] = None,
+        guard: Optional[ProviderGuard] = None,
+        rate_limit_wait: float = RATE_LIMIT_WAIT,
+    ):
+        if not table_url:
+            raise EnvironmentError("Airtable table URL is missing (AIRTABLE_*_URL)")
+        self.table_url = table_url.rstrip("/")
+        self.headers = headers if headers is not None else HEADERS
+        self.http = http or get_http_client()
+        self.guard = guard or get_provider_guard("airtable")
+        self.rate_limit_wait = rate_limit_wait
+        self.requests = 0
+
+    def _request(self, method: str, **kwargs) -> dict:
+        for attempt in range(2):
+            with self.guard:
+                self.requests += 1
+                metrics.incr("airtable_requests")
+                response = self.http.request(method, self.table_url, headers=self.headers, **kwargs)
+                # Only rate limits and server errors count against the circuit breaker
+                if (response.status_code == 429 and attempt > 0) or response.status_code >= 500:
+                    raise AirtableError(response.status_code, response.text[:300])
+            if response.status_code == 429:
+                # PATCH is not retried by the HTTP client: wait as Airtable asks, then replay once
+                logger.warning("⏳ Airtable rate limit reached, waiting {:.0f}s", self.rate_limit_wait)
+                time.sleep(self.rate_limit_wait)
+            elif response.status_code >= 400:
+                # A rejected request (bad field, unknown record) says nothing about Airtable's health
+                raise AirtableError(response.status_code, response.text[:300])
+            else:
+                return response.json()
+
+    def iter_records(self, view: Optional[str] = None, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        """Every record of the table (or of `view`), page by page."""
+        params = {"pageSize": PAGE_SIZE}
+        if view:
+            params["view"] = view
+        if fields:
+            params["fields[]"] = fields
+        while True:
+            page = self._request("GET", params=params)
+            yield from page.get("records", [])
+            if not page.get("offset"):
+                return
+            params = {**params, "offset": page["offset"]}
+
+    def update_records(self, records: List[dict], typecast: bool = True) -> List[dict]:
+        """PATCH records ({"id", "fields"}) by batches of 10."""
+        updated = []
+        for start in range(0, len(records), MAX_RECORDS_PER_REQUEST):
+            batch = records[start:start + MAX_RECORDS_PER_REQUEST]
+            updated.extend(self._request("PATCH", json={"records": batch, "typecast": typecast}).get("records", []))
+        return updated
+
+    def upsert_records(self, records: List[dict], merge_on: List[str], typecast: bool = True) -> Dict[str, list]:
+        """PATCH records ({"fields"}) by batches of 10, creating those that no record matches on `merge_on`."""
+        result = {"createdRecords": [], "updatedRecords": []}
+        for start in range(0, len(records), MAX_RECORDS_PER_REQUEST):
+            batch = records[start:start + MAX_RECORDS_PER_REQUEST]
+            payload = self._request("PATCH", json={
+                "records": batch, "typecast": typecast, "performUpsert": {"fieldsToMergeOn": merge_on},
+            })
+            result["createdRecords"].extend(payload.get("createdRecords", []))
+            result["updatedRecords"].extend(payload.get("updatedRecords", []))
+        return result
+
+
+def get_airtable_client(table: str = "User") -> AirtableClient:
+    """Client of AIRTABLE_URLS[table] (test or prod table depending on AIRTABLE_TEST_TABLES)."""
+    return AirtableClient(AIRTABLE_URLS.get(table))
+
+
+def _text(value) -> str:
+    """Cell value as CSV text: lists (multiple selects, links) are comma-joined."""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return ""
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return str(value).strip()
+
+
+def contact_columns(table: str = "User") -> Dict[str, str]:
+    return {key: CREATE_ROW_COLUMNS[table][key] for key in CONTACT_COLUMN_KEYS}
+
+
+def pull_contacts(client: AirtableClient, table: str = "User", view: Optional[str] = None) -> pd.DataFrame:
+    """
+    Contacts of the target view (get_view_mapping) with the columns of the manual CSV export,
+    plus the Airtable record id in RECORD_ID_COLUMN.
+    """
+    columns = list(contact_columns(table).values())
+    view = view or get_view_mapping().get(table)
+    rows = [
+        {RECORD_ID_COLUMN: record["id"], **{column: _text(record.get("fields", {}).get(column)) for column in columns}}
+        for record in client.iter_records(view=view, fields=columns)
+    ]
+    return pd.DataFrame(rows, columns=[RECORD_ID_COLUMN, *columns], dtype=str)
+
+
+def _match_keys(email: str, linkedin: str, record_id: str = "") -> List[str]:
+    keys = [f"id:{record_id}"] if record_id else []
+    if email:
+        keys.append(f"email:{email.strip().casefold()}")
+    linkedin_url = canonicalize_linkedin_url(linkedin)
+    if linkedin_url:
+        keys.append(f"url:{linkedin_url}")
+    return keys
+
+
+def changed_fields(current: dict, row: dict, columns: Dict[str, str], interests_as_list: bool = True) -> dict:
+    """
+    Enrichment fields of `row` that differ from the Airtable record `current`. Empty results
+    never overwrite Airtable, and tags are compared as canonical sets (order and case ignored).
+    """
+    changes = {}
+    interests_column, description_column = columns["interests"], columns["description"]
+
+    tags = normalize_tags(_text(row.get(interests_column)))
+    if tags and set(tags) != set(normalize_tags(_text(current.get(interests_column)))):
+        changes[interests_column] = tags if interests_as_list else ", ".join(tags)
+
+    description = _text(row.get(description_column))
+    if description and description != _text(current.get(description_column)):
+        changes[description_column] = description
+    return changes
+
+
+def push_enrichment(
+    rows: Iterable[dict],
+    client: AirtableClient,
+    table: str = "User",
+    view: Optional[str] = None,
+    create_missing: bool = False,
+    interests_as_list: bool = True,
+) -> Dict[str, int]:
+    """
+    Send the changed Intérêt / Description of the enriched `rows` to Airtable.
+    Args:
+        rows: Enriched rows (CSV columns), e.g. OUTPUT_CSV records.
+        client (AirtableClient): Client of the target table.
+        view (str): View to match against, defaulting to get_view_mapping()[table].
+        create_missing (bool): Upsert rows without any matching record, merging on Email.
+        interests_as_list (bool): Send Intérêt as a multiple-select list (else comma-separated text).
+    Returns:
+        dict: Counts of rows and records: matched, updated, unchanged, missing, created, requests.
+    """
+    columns = contact_columns(table)
+    view = view or get_view_mapping().get(table)
+    requests_before = client.requests
+
+    with metrics.stage("airtable_read"):
+        records = {}
+        index = {}
+        fields = [columns["email"], columns["linkedin"], columns["interests"], columns["description"]]
+        for record in client.iter_records(view=view, fields=fields):
+            record_fields = record.get("fields", {})
+            records[record["id"]] = record_fields
+            keys = _match_keys(_text(record_fields.get(columns["email"])), _text(record_fields.get(columns["linkedin"])), record["id"])
+            for key in keys:
+                index.setdefault(key, record["id"])
+
+    seen = set()
+    updates: Dict[str, dict] = {}
+    creations: Dict[str, dict] = {}
+    report = {"rows": 0, "matched": 0, "updated": 0, "unchanged": 0, "missing": 0, "created": 0}
+    for row in rows:
+        report["rows"] += 1
+        email, linkedin = _text(row.get(columns["email"])), _text(row.get(columns["linkedin"]))
+        keys = _match_keys(email, linkedin, _text(row.get(RECORD_ID_COLUMN)))
+        record_id = next((index[key] for key in keys if key in index), None)
+        if record_id is None:
+            report["missing"] += 1
+            changes = changed_fields({}, row, columns, interests_as_list)
+            if create_missing and email and changes:
+                creations.setdefault(email.casefold(), {"fields": {columns["email"]: email, **changes}})
+            continue
+
+        report["matched"] += 1
+        # Duplicated contacts: the first row of a record wins
+        if record_id in seen:
+            continue
+        seen.add(record_id)
+        changes = changed_fields(records[record_id], row, columns, interests_as_list)
+        if changes:
+            updates[record_id] = {"id": record_id, "fields": changes}
+        else:
+            report["unchanged"] += 1
+
+    with metrics.stage("airtable_write"):
+        report["updated"] = len(client.update_records(list(updates.values())))
+        if creations:
+            created = client.upsert_records(list(creations.values()), merge_on=[columns["email"]])
+            report["created"] = len(created["createdRecords"])
+            report["updated"] += len(created["updatedRecords"])
+
+    report["requests"] = client.requests - requests_before
+    return report
+
+
+def get_interests_as_list() -> bool:
+    """AIRTABLE_INTEREST_FORMAT: "list" for a multiple-select Intérêt field (default), "text" for a text field."""
+    return os.getenv("AIRTABLE_INTEREST_FORMAT", "list").lower() != "text"
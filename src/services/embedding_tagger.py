@@ -0,0 +1,219 @@
+"""
+Local, CPU-only interest tagger based on TF-IDF similarity.
+
+Every interest tag gets a prototype text (tag name, aliases and the vocabulary of
+CENTER_OF_INTEREST_PROTOTYPES). Prototypes and profile texts are turned into
+TF-IDF vectors over folded words and word bigrams ("data engineer", "power bi"),
+restricted to the prototype vocabulary. A batch of profiles is scored against all tags with one matrix
+product, and a tag is kept when its cosine similarity clears the thresholds.
+
+Besides the tags, each profile gets a coverage: the share of its TF-IDF mass
+that falls into the prototype vocabulary. A profile with a low coverage talks
+about things the tagger does not know, whatever its best score.
+
+Large inputs are split into chunks scored on a process pool.
+
+Configuration:
+    EMBEDDING_MIN_SCORE       minimal cosine similarity of a kept tag (default 0.08)
+    EMBEDDING_RELATIVE_SCORE  a kept tag scores at least this share of the best tag (default 0.5)
+    EMBEDDING_MAX_TAGS        maximal number of tags per profile (default 3)
+    EMBEDDING_BATCH_SIZE      profiles per matrix product (default 512)
+    EMBEDDING_WORKERS         processes used for large inputs (default: CPU count)
+    EMBEDDING_POOL_MIN_TEXTS  inputs smaller than this are scored in-process (default 2000)
+
+Example usage:
+    tagger = get_default_tagger()
+    tagger.tag("Data engineer, pipelines Spark et Airflow")   # ["Data Engineering"]
+
+    results = build_interest_and_description_embedding_many(profile_texts)
+"""
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from core.static_values import CENTER_OF_INTEREST_ALIASES, CENTER_OF_INTEREST_LIST, CENTER_OF_INTEREST_PROTOTYPES
+from core.text_normalization import fold_text
+from services.tag_description_builder import PLACEHOLDER_DESCRIPTION
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+# Function words (FR + EN) carry no topic: they would only dilute the coverage
+STOP_WORDS = frozenset(
+    "a au aux avec ce ces chez d dans de des du en et l la le les leur par pour sur un une "
+    "an and at for from in of on the to with".split()
+)
+
+
+def text_features(text: str) -> Counter:
+    """Term counts of a text: folded words (function words removed) and word bigrams."""
+    words = [word for word in _WORD.findall(fold_text(text or "")) if word not in STOP_WORDS]
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return features
+
+
+class TagScores(NamedTuple):
+    scores: np.ndarray    # (profiles, tags) cosine similarities
+    coverage: np.ndarray  # (profiles,) share of each profile's TF-IDF mass inside the tag vocabulary
+
+
+class EmbeddingTagger:
+    def __init__(
+        self,
+        prototypes: Dict[str, str],
+        min_score: float = 0.08,
+        relative_score: float = 0.5,
+        max_tags: int = 3,
+        batch_size: int = 512,
+    ):
+        self.tags = list(prototypes)
+        self.min_score = min_score
+        self.relative_score = relative_score
+        self.max_tags = max_tags
+        self.batch_size = max(1, batch_size)
+
+        documents = [text_features(prototypes[tag]) for tag in self.tags]
+        document_frequency = Counter(feature for document in documents for feature in document)
+        self.vocabulary = {feature: column for column, feature in enumerate(sorted(document_frequency))}
+
+        # Smoothed IDF: features shared by many tags ("data", "ai") weigh less
+        n = len(documents)
+        self.idf = np.array(
+            [math.log((1 + n) / (1 + document_frequency[feature])) + 1 for feature in self.vocabulary],
+            dtype=np.float32,
+        )
+        # Features no prototype uses only count in the norms, at the highest IDF
+        self.unknown_idf = math.log(1 + n) + 1
+
+        matrix = self._term_matrix(documents) * self.idf
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.prototype_matrix = matrix.T.copy()  # (vocabulary, tags)
+
+    def _term_matrix(self, documents: Sequence[Counter]) -> np.ndarray:
+        """Sublinear term frequencies of the documents over the vocabulary, as a dense matrix."""
+        matrix = np.zeros((len(documents), len(self.vocabulary)), dtype=np.float32)
+        for row, document in enumerate(documents):
+            for feature, count in document.items():
+                column = self.vocabulary.get(feature)
+                if column is not None:
+                    matrix[row, column] = 1 + math.log(count)
+        return matrix
+
+    def score_many(self, texts: Sequence[str]) -> TagScores:
+        """Similarity of every text to every tag, one matrix product per batch of texts."""
+        scores, coverage = [], []
+        for start in range(0, len(texts), self.batch_size):
+            documents = [text_features(text) for text in texts[start:start + self.batch_size]]
+            weights = self._term_matrix(documents) * self.idf
+            known = np.einsum("ij,ij->i", weights, weights)
+            unknown = np.array([
+                sum((self.unknown_idf * (1 + math.log(count))) ** 2
+                    for feature, count in document.items() if feature not in self.vocabulary)
+                for document in documents
+            ], dtype=np.float32)
+            # Cosine over the whole profile: words unknown to every prototype dilute the scores
+            total = known + unknown
+            norms = np.sqrt(total)
+            norms[norms == 0] = 1.0
+            scores.append((weights / norms[:, None]) @ self.prototype_matrix)
+            coverage.append(np.divide(known, total, out=np.zeros_like(total), where=total > 0))
+
+        if not scores:
+            return TagScores(np.zeros((0, len(self.tags)), dtype=np.float32), np.zeros(0, dtype=np.float32))
+        return TagScores(np.vstack(scores), np.concatenate(coverage))
+
+    def select(self, scores: np.ndarray) -> List[str]:
+        """Tags of one row of scores that clear the thresholds, in the order of the tag list."""
+        best = float(scores.max()) if scores.size else 0.0
+        threshold = max(self.min_score, best * self.relative_score)
+        kept = [column for column in np.argsort(-scores, kind="stable")[:self.max_tags] if scores[column] >= threshold]
+        return [self.tags[column] for column in sorted(kept)]
+
+    def tag_many(self, texts: Sequence[str]) -> List[List[str]]:
+        return [self.select(row) for row in self.score_many(texts).scores]
+
+    def tag(self, text: str) -> List[str]:
+        return self.tag_many([text])[0]
+
+
+@lru_cache(maxsize=1)
+def get_default_tagger() -> EmbeddingTagger:
+    """Tagger over every tag of CENTER_OF_INTEREST_LIST, built once per process."""
+    prototypes = {
+        tag: " ".join([tag, *CENTER_OF_INTEREST_ALIASES.get(tag, []), CENTER_OF_INTEREST_PROTOTYPES.get(tag, "")])
+        for tag in CENTER_OF_INTEREST_LIST if tag
+    }
+    return EmbeddingTagger(
+        prototypes,
+        min_score=float(os.getenv("EMBEDDING_MIN_SCORE", 0.08)),
+        relative_score=float(os.getenv("EMBEDDING_RELATIVE_SCORE", 0.5)),
+        max_tags=int(os.getenv("EMBEDDING_MAX_TAGS", 3)),
+        batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", 512)),
+    )
+
+
+def _score_chunk(texts: List[str]) -> TagScores:
+    # Runs in the pool processes: the default tagger is built once per process
+    return get_default_tagger().score_many(texts)
+
+
+def get_embedding_workers() -> int:
+    return int(os.getenv("EMBEDDING_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def embedding_process_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool for `score_texts`. Processes are spawned rather than forked: the
+    enrichment runs worker, HTTP and logging threads whose locks a fork would copy.
+    """
+    return ProcessPoolExecutor(max_workers=workers or get_embedding_workers(), mp_context=get_context("spawn"))
+
+
+def score_texts(texts: Iterable[str], workers: Optional[int] = None, executor: Optional[Executor] = None) -> TagScores:
+    """
+    Score many texts with the default tagger. Inputs of EMBEDDING_POOL_MIN_TEXTS texts or
+    more are split into chunks scored on a process pool (`executor`, or a new one of `workers` processes).
+    """
+    texts = list(texts)
+    tagger = get_default_tagger()
+    workers = workers or get_embedding_workers()
+    if len(texts) < int(os.getenv("EMBEDDING_POOL_MIN_TEXTS", 2000)) or (executor is None and workers <= 1):
+        return tagger.score_many(texts)
+
+    chunk_size = max(tagger.batch_size, math.ceil(len(texts) / (workers * 4)))
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    if executor is not None:
+        parts = list(executor.map(_score_chunk, chunks))
+    else:
+        with embedding_process_pool(workers) as pool:
+            parts = list(pool.map(_score_chunk, chunks))
+    return TagScores(np.vstack([part.scores for part in parts]), np.concatenate([part.coverage for part in parts]))
+
+
+def build_interest_and_description_embedding(profile_text: str) -> Dict[str, object]:
+    """
+    Same contract as `build_interest_and_description`, with tags from the embedding tagger.
+    Returns:
+        dict: {"Intérêt": "Tag1, Tag2", "Description": placeholder summary}
+    """
+    return {"Intérêt": ", ".join(get_default_tagger().tag(profile_text)), "Description": PLACEHOLDER_DESCRIPTION}
+
+
+def build_interest_and_description_embedding_many(
+    profile_texts: Iterable[str],
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[Dict[str, object]]:
+    """Batch version of `build_interest_and_description_embedding`, on a process pool for large inputs."""
+    tagger = get_default_tagger()
+    result = score_texts(profile_texts, workers=workers, executor=executor)
+    return [
+        {"Intérêt": ", ".join(tagger.select(row)), "Description": PLACEHOLDER_DESCRIPTION}
+        for row in result.scores
+    ]
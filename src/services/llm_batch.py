@@ -0,0 +1,212 @@
+"""
+Offline batch-job mode for LLM enrichment.
+
+Instead of one live completion per row, all prompts of a run are written to a
+JSONL request file (OpenAI Batch API format), submitted as a single batch job,
+and the result file is ingested back by row id once the job has completed.
+
+Backends:
+    OpenAIBatchBackend  Files + Batches API (results within the completion window, at batch pricing).
+    LocalBatchBackend   Offline stand-in answering every request locally, in the same file
+                        format, so the whole flow can be exercised without network access.
+
+Example usage:
+    count = write_batch_requests(items, CENTER_OF_INTEREST_LIST, "data/batch/requests.jsonl")
+    backend = get_batch_backend()
+    batch_id = backend.submit("data/batch/requests.jsonl", mode="single")
+    ...
+    if backend.status(batch_id) == "completed":
+        backend.download_results(batch_id, "data/batch/results.jsonl")
+        results = parse_batch_results("data/batch/results.jsonl", mode="single")
+"""
+import json
+import os
+import uuid
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+from services.llm_interface import (
+    _parse_single_response,
+    _resolve_mode,
+    _single_request,
+    _split_requests,
+    get_openai_provider,
+)
+
+BATCH_ENDPOINTS = {"single": "/v1/chat/completions", "split": "/v1/completions"}
+# Split mode sends two requests per row, told apart by this custom_id suffix
+SPLIT_SUFFIXES = ("::tags", "::description")
+
+# Statuses after which a batch will not change any more
+FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def write_batch_requests(
+    items: Iterable[Tuple[str, str]],
+    tags_list: list,
+    path: str,
+    mode: Optional[str] = None,
+) -> int:
+    """
+    Write one batch request per (row_id, profile_text) item.
+    Returns:
+        int: Number of rows written.
+    """
+    mode = _resolve_mode("openai", mode)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row_id, profile_text in items:
+            if mode == "single":
+                bodies = [(row_id, _single_request(profile_text, tags_list))]
+            else:
+                bodies = list(zip((row_id + suffix for suffix in SPLIT_SUFFIXES), _split_requests(profile_text, tags_list)))
+            for custom_id, body in bodies:
+                request = {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINTS[mode], "body": body}
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+            rows += 1
+    return rows
+
+
+def parse_batch_results(path: str, mode: Optional[str] = None) -> Dict[str, Union[Dict[str, object], Exception]]:
+    """
+    Read a batch result file back into {row_id: validated result or the error for that row}.
+    """
+    mode = _resolve_mode("openai", mode)
+    outputs = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            response = entry.get("response") or {}
+            if entry.get("error") or response.get("status_code") != 200:
+                outputs[entry["custom_id"]] = ValueError(f"Batch request failed: {entry.get('error') or response}")
+            else:
+                outputs[entry["custom_id"]] = response["body"]
+
+    if mode == "single":
+        return {row_id: _single_result(body) for row_id, body in outputs.items()}
+
+    results = {}
+    row_ids = {custom_id.rsplit("::", 1)[0] for custom_id in outputs}
+    for row_id in row_ids:
+        tags_body, desc_body = (outputs.get(row_id + suffix) for suffix in SPLIT_SUFFIXES)
+        if tags_body is None or desc_body is None:
+            results[row_id] = ValueError("Incomplete batch result (tags or description missing)")
+        elif isinstance(tags_body, Exception) or isinstance(desc_body, Exception):
+            results[row_id] = tags_body if isinstance(tags_body, Exception) else desc_body
+        else:
+            tags = [t.strip() for t in tags_body["choices"][0]["text"].split(",") if t.strip()]
+            results[row_id] = {"Intérêt": ", ".join(tags), "Description": desc_body["choices"][0]["text"].strip()}
+    return results
+
+
+def _single_result(body):
+    if isinstance(body, Exception):
+        return body
+    try:
+        return _parse_single_response(body["choices"][0]["message"]["content"])
+    except Exception as e:
+        return e
+
+
+class OpenAIBatchBackend:
+    """OpenAI Files + Batches API."""
+
+    def __init__(self, api_key: Optional[str] = None, completion_window: str = "24h"):
+        self.client = get_openai_provider(api_key).client
+        self.completion_window = completion_window
+
+    def submit(self, requests_path: str, mode: str) -> str:
+        with open(requests_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINTS[mode],
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def download_results(self, batch_id: str, results_path: str):
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} is not completed (status: {batch.status})")
+        with open(results_path, "w", encoding="utf-8") as f:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    f.write(self.client.files.content(file_id).text)
+
+
+def _manual_responder(body: dict, custom_id: str = "") -> dict:
+    """
+    Answer a batch request body with the manual keyword tagger, in OpenAI response format.
+    Split-mode requests are told apart by the SPLIT_SUFFIXES of their custom_id.
+    """
+    from services.tag_description_builder import build_interest_and_description
+
+    if "messages" in body:
+        result = build_interest_and_description(body["messages"][-1]["content"])
+        content = json.dumps(result, ensure_ascii=False)
+        return {"object": "chat.completion", "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]}
+
+    result = build_interest_and_description(body["prompt"].rsplit("\n\n", 1)[-1])
+    if custom_id.endswith(SPLIT_SUFFIXES[0]):
+        text = result["Intérêt"]
+    elif custom_id.endswith(SPLIT_SUFFIXES[1]):
+        text = result["Description"]
+    else:
+        raise ValueError(f"Completion request without a split suffix: {custom_id!r}")
+    return {"object": "text_completion", "choices": [{"index": 0, "text": text}]}
+
+
+class LocalBatchBackend:
+    """
+    Offline stand-in for the Batch API: requests are answered at submit time by
+    `responder(body, custom_id) -> response body` and the job is immediately "completed".
+    """
+
+    def __init__(self, workdir: str = "data/llm_batches", responder: Optional[Callable[[dict], dict]] = None):
+        self.workdir = workdir
+        self.responder = responder or _manual_responder
+        os.makedirs(self.workdir, exist_ok=True)
+
+    def _output_path(self, batch_id: str) -> str:
+        return os.path.join(self.workdir, f"{batch_id}_output.jsonl")
+
+    def submit(self, requests_path: str, mode: str) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        with open(requests_path, "r", encoding="utf-8") as src, open(self._output_path(batch_id), "w", encoding="utf-8") as out:
+            for line in src:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                entry = {"id": f"req_{uuid.uuid4().hex[:12]}", "custom_id": request["custom_id"], "error": None}
+                try:
+                    entry["response"] = {"status_code": 200, "body": self.responder(request["body"], request["custom_id"])}
+                except Exception as e:
+                    entry["response"] = None
+                    entry["error"] = {"code": type(e).__name__, "message": str(e)}
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        return "completed" if os.path.exists(self._output_path(batch_id)) else "failed"
+
+    def download_results(self, batch_id: str, results_path: str):
+        with open(self._output_path(batch_id), "r", encoding="utf-8") as src, open(results_path, "w", encoding="utf-8") as out:
+            out.write(src.read())
+
+
+def get_batch_backend(name: Optional[str] = None):
+    """Backend selected by LLM_BATCH_BACKEND: "openai" (default) or "local"."""
+    name = name or os.getenv("LLM_BATCH_BACKEND", "openai")
+    if name == "openai":
+        return OpenAIBatchBackend()
+    if name == "local":
+        return LocalBatchBackend(os.getenv("LLM_BATCH_DIR", "data/llm_batches"))
+    raise ValueError(f"Unknown LLM batch backend: {name}")
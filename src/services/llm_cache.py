@@ -0,0 +1,153 @@
+"""
+Persistent, content-addressed cache for LLM generation results.
+
+The key is a SHA-256 of everything that influences the answer: the normalized
+profile text, the prompt template, the allowed tags, the model and the language.
+Changing any of them yields a new key, so stale entries are never served; they
+simply age out through the size and age-based eviction.
+
+Example usage:
+    cache = get_llm_cache()
+    key = LLMResultCache.make_key(profile_text, prompt, tags_list, model, "fr")
+    result = cache.get(key)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class LLMResultCache:
+    """SQLite-backed LLM result cache with LRU size eviction, max age and hit/miss counters."""
+
+    # Eviction runs every EVICTION_INTERVAL writes to keep `put` cheap
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path: str, max_entries: int = 50000, max_age_days: float = 90):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_results ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_results_accessed ON llm_results(accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_text(profile_text: str) -> str:
+        return " ".join(profile_text.split())
+
+    @classmethod
+    def make_key(
+        cls,
+        profile_text: str,
+        prompt: str,
+        tags_list: List[Optional[str]],
+        model: str,
+        language: str,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "text": cls.normalize_text(profile_text),
+                "prompt": prompt,
+                "tags": [tag for tag in tags_list if tag],
+                "model": model,
+                "language": language,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, object]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.max_age_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_results SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, object]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_results (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict(now)
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used ones above max_entries."""
+        with self._lock:
+            return self._evict(time.time())
+
+    def _evict(self, now: float) -> int:
+        removed = self._conn.execute(
+            "DELETE FROM llm_results WHERE created_at < ?", (now - self.max_age_seconds,)
+        ).rowcount
+        overflow = self._count() - self.max_entries
+        if overflow > 0:
+            removed += self._conn.execute(
+                "DELETE FROM llm_results WHERE key IN "
+                "(SELECT key FROM llm_results ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        self._conn.commit()
+        return removed
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM llm_results").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": self._count()}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, LLMResultCache] = {}
+_caches_lock = threading.Lock()
+
+def get_llm_cache() -> Optional[LLMResultCache]:
+    """
+    Return the process-wide cache configured from the environment, or None when
+    LLM_CACHE_ENABLED is false.
+    """
+    if os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() not in ["true", "1", "yes"]:
+        return None
+    path = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite")
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = LLMResultCache(
+                path,
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 50000)),
+                max_age_days=float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", 90)),
+            )
+        return _caches[path]
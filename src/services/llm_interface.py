@@ -13,32 +13,56 @@ Example usage:
         provider="openai"
     )
     print(result)
+
+    # Many profiles concurrently, under a request/token budget
+    results = asyncio.run(agenerate_many(profile_texts, CENTER_OF_INTEREST_LIST))
 """
-from typing import List, Dict, Optional
-from openai import OpenAI
+from typing import List, Dict, Optional, Union
+from loguru import logger
+from core.schema import GeneratedProfileResult
+from services.llm_cache import LLMResultCache, get_llm_cache
+from utils import metrics
+from utils.throttle import get_provider_guard
+import asyncio
+import json
 import os
+import threading
+import time
 
 # Import provider SDKs as needed
-'''
 try:
-    from openai import OpenAI
-
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    from openai import AsyncOpenAI, OpenAI
 except ImportError:
-    client = None
-'''
+    AsyncOpenAI = OpenAI = None
 
 # Add more imports for other providers as needed
 
 class LLMProviderNotAvailable(Exception):
     pass
 
+# "single": one JSON completion returns tags and description together.
+# "split": one completion for the tags and another for the description (legacy path).
+LLM_GENERATION_MODES = {"single", "split"}
+
+COMPLETION_MODEL = "gpt-3.5-turbo-instruct"
+DEFAULT_CHAT_MODEL = "gpt-4o-mini"
+
+DESCRIPTION_PROMPT = (
+    "A partir des informations suivantes issues d'un profil LinkedIn, je souhaite faire un résumé impersonnel en 150 mots du profil de la personne. "
+    "Ce résumé doit mettre l'accent sur l'expérience de la personne et ses capacités/savoir-faires techniques. "
+    "Ce résumé doit rapidement permettre de savoir ce que sais faire la personne, en quoi elle est experte. "
+    "Ce résumé doit être précis, et ne pas utiliser de termes vagues comme 'des compétences variées' ou 'une expérience solide'. Il ne doit contenir que de l'information factuelle. "
+    "Ce résumé doit être en français. "
+    "Ce résumé ne doit pas décrire les activités des entreprises, mais doit vraiment se concentrer sur les expériences et compétences de la personne."
+)
+
 def generate_interest_and_description(
     profile_text: str,
     tags_list: List[str],
     provider: str = "openai",
     api_key: Optional[str] = None,
-    language: str = "fr"
+    language: str = "fr",
+    mode: Optional[str] = None
 ) -> Dict[str, object]:
     """
     Neutral interface for LLM-based tag and description generation.
@@ -48,67 +72,331 @@ def generate_interest_and_description(
         provider (str): LLM provider ("openai", "gemini", ...).
         api_key (str, optional): API key for the provider.
         language (str): Output language for the description.
+        mode (str, optional): "single" (one JSON call) or "split" (two calls).
+            Defaults to LLM_GENERATION_MODE.
     Returns:
         dict: {"Intérêt": [tags], "Description": str}
     """
+    mode = _resolve_mode(provider, mode)
+
+    # Cache hits return before any provider client is built
+    cache = get_llm_cache()
+    if cache is not None:
+        cache_key = _cache_key(profile_text, tags_list, provider, language, mode)
+        with metrics.stage("cache_lookup"):
+            cached = cache.get(cache_key)
+        metrics.incr("llm_cache_hits" if cached is not None else "llm_cache_misses")
+        if cached is not None:
+            return cached
+
     if provider == "openai":
-        return _openai_generate(profile_text, tags_list, api_key, language)
-    elif provider == "gemini":
-        raise NotImplementedError("Gemini backend not implemented yet.")
+        with metrics.stage("llm_call"):
+            result = _openai_generate(profile_text, tags_list, api_key, language, mode)
     else:
+        raise NotImplementedError("Gemini backend not implemented yet.")
+
+    if cache is not None:
+        cache.put(cache_key, result)
+    return result
+
+async def agenerate_many(
+    profile_texts: List[str],
+    tags_list: List[str],
+    provider: str = "openai",
+    api_key: Optional[str] = None,
+    language: str = "fr",
+    mode: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> List[Union[Dict[str, object], Exception]]:
+    """
+    Generate tags and descriptions for many profiles concurrently over one pooled client.
+    Args:
+        profile_texts (List[str]): Input profile texts.
+        max_concurrency (int, optional): Requests in flight (LLM_MAX_CONCURRENCY, default 16).
+        requests_per_minute (float, optional): Request budget (OPENAI_RPM, default 500).
+        tokens_per_minute (float, optional): Estimated token budget (OPENAI_TPM, default 200000).
+        Other arguments are as in `generate_interest_and_description`.
+    Returns:
+        list: One result dict per input text, in input order, or the exception raised for it.
+    """
+    mode = _resolve_mode(provider, mode)
+    if provider != "openai":
+        raise NotImplementedError("Gemini backend not implemented yet.")
+
+    results: List[Union[Dict[str, object], Exception, None]] = [None] * len(profile_texts)
+    cache = get_llm_cache()
+    keys = [_cache_key(text, tags_list, provider, language, mode) for text in profile_texts] if cache else []
+    pending = []
+    for position, text in enumerate(profile_texts):
+        cached = cache.get(keys[position]) if cache is not None else None
+        if cached is not None:
+            results[position] = cached
+        else:
+            pending.append(position)
+    if not pending:
+        return results
+
+    openai_provider = get_openai_provider(api_key)
+    semaphore = asyncio.Semaphore(max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", 16)))
+    budget = AsyncRateBudget(
+        requests_per_minute or float(os.getenv("OPENAI_RPM", 500)),
+        tokens_per_minute or float(os.getenv("OPENAI_TPM", 200000)),
+    )
+    calls_per_profile = 1 if mode == "single" else 2
+
+    async def run(position: int):
+        text = profile_texts[position]
+        async with semaphore:
+            await budget.acquire(calls_per_profile, _estimate_tokens(text, tags_list, mode))
+            try:
+                result = await openai_provider.agenerate(text, tags_list, mode)
+            except Exception as e:
+                results[position] = e
+                return
+        results[position] = result
+        if cache is not None:
+            cache.put(keys[position], result)
+
+    await asyncio.gather(*(run(position) for position in pending))
+    return results
+
+def _resolve_mode(provider, mode):
+    if provider not in {"openai", "gemini"}:
         raise ValueError(f"Unknown provider: {provider}")
+    mode = mode or os.getenv("LLM_GENERATION_MODE", "single")
+    if mode not in LLM_GENERATION_MODES:
+        raise ValueError(f"Unknown generation mode: {mode}")
+    return mode
 
-def _openai_generate(profile_text, tags_list, api_key, language):
+def _cache_key(profile_text, tags_list, provider, language, mode):
+    prompt, model = _prompt_and_model(tags_list, mode)
+    return LLMResultCache.make_key(profile_text, prompt, tags_list, f"{provider}:{model}", language)
 
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OpenAI API key not provided.")
+def generation_model(mode):
+    """Model a generation mode calls: OPENAI_CHAT_MODEL for "single", the completion model for "split"."""
+    if mode == "single":
+        return os.getenv("OPENAI_CHAT_MODEL", DEFAULT_CHAT_MODEL)
+    return COMPLETION_MODEL
 
-    client = OpenAI(api_key=api_key)
+def _prompt_and_model(tags_list, mode):
+    """Prompt template and model used for a generation mode (part of the cache key)."""
+    if mode == "single":
+        return _build_single_prompt(tags_list), generation_model(mode)
+    return f"{_build_tags_prompt(tags_list)}\n\n{DESCRIPTION_PROMPT}", generation_model(mode)
 
-    if client is None:
-        raise LLMProviderNotAvailable("openai package is not installed.")
+def _estimate_tokens(profile_text, tags_list, mode):
+    """Rough prompt + completion token count (~4 characters per token) for rate budgeting."""
+    prompt, _ = _prompt_and_model(tags_list, mode)
+    prompt_tokens = (len(prompt) + len(profile_text)) // 4 + 1
+    if mode == "single":
+        return prompt_tokens + 600
+    return 2 * prompt_tokens + 600
 
-    # Prompt for tags
-    tags_prompt = (
+def _build_tags_prompt(tags_list):
+    return (
         f"Les informations suivantes sont issues d'un profil LinkedIn d’un professionnel de la data.\n"
         f"Attribue à ce profil les labels les plus pertinents parmi :\n"
         + ", ".join([tag for tag in tags_list if tag])
-        + "\nRéponds uniquement par une chaîne de texte contenant les tags séparés par des virgules, par exemple : 'Data Engineering, MLOps'"
     )
-    '''
+
+def _build_single_prompt(tags_list):
+    return (
+        _build_tags_prompt(tags_list)
+        + "\n\n"
+        + DESCRIPTION_PROMPT
+        + "\n\nRéponds uniquement par un objet JSON de la forme "
+        + '{"Intérêt": "Data Engineering, MLOps", "Description": "..."}, '
+        + "où \"Intérêt\" contient les labels séparés par des virgules et \"Description\" le résumé."
+    )
+
+def _single_request(profile_text, tags_list):
+    return dict(
+        model=generation_model("single"),
+        messages=[
+            {"role": "system", "content": _build_single_prompt(tags_list)},
+            {"role": "user", "content": profile_text},
+        ],
+        response_format={"type": "json_object"},
+        max_tokens=600,
+    )
+
+def _split_requests(profile_text, tags_list):
+    # Prompt for tags
     tags_prompt = (
-        f"Les informations suivantes sont issues d'un profil LinkedIn. "
-        f"Ce profil appartient à un professionnel de la data.\n"
-        f"Attribue à ce profil les labels qui correspondent parmi les suivants :\n"
-        + "\n".join(f"- {tag}" for tag in tags_list if tag)
-        + "\nRéponds uniquement par une liste Python, par exemple : ['Data Engineering', 'MLOps']"
-    )'''
-    # Prompt for description
-    desc_prompt = (
-        "A partir des informations suivantes issues d'un profil LinkedIn, je souhaite faire un résumé impersonnel en 150 mots du profil de la personne. "
-        "Ce résumé doit mettre l'accent sur l'expérience de la personne et ses capacités/savoir-faires techniques. "
-        "Ce résumé doit rapidement permettre de savoir ce que sais faire la personne, en quoi elle est experte. "
-        "Ce résumé doit être précis, et ne pas utiliser de termes vagues comme 'des compétences variées' ou 'une expérience solide'. Il ne doit contenir que de l'information factuelle. "
-        "Ce résumé doit être en français. "
-        "Ce résumé ne doit pas décrire les activités des entreprises, mais doit vraiment se concentrer sur les expériences et compétences de la personne."
+        _build_tags_prompt(tags_list)
+        + "\nRéponds uniquement par une chaîne de texte contenant les tags séparés par des virgules, par exemple : 'Data Engineering, MLOps'"
     )
     # Compose full prompts
     tags_full_prompt = f"{tags_prompt}\n\n{profile_text}"
-    desc_full_prompt = f"{desc_prompt}\n\n{profile_text}"
+    desc_full_prompt = f"{DESCRIPTION_PROMPT}\n\n{profile_text}"
+    return (
+        dict(model=COMPLETION_MODEL, prompt=tags_full_prompt, max_tokens=100),
+        dict(model=COMPLETION_MODEL, prompt=desc_full_prompt, max_tokens=500),
+    )
 
-    # Call OpenAI for tags
-    tags_response = client.completions.create(model="gpt-3.5-turbo-instruct",
-        prompt=tags_full_prompt,
-        max_tokens=100)
+def _parse_split_responses(tags_response, desc_response):
     tags_output = tags_response.choices[0].text.strip()
     tags_cleaned = [t.strip() for t in tags_output.split(",") if t.strip()]
     tags_string = ", ".join(tags_cleaned)
-
-    # Call OpenAI for description
-    desc_response = client.completions.create(model="gpt-3.5-turbo-instruct",
-        prompt=desc_full_prompt,
-        max_tokens=500)
     description = desc_response.choices[0].text.strip()
-
     return {"Intérêt": tags_string, "Description": description}
+
+def _parse_single_response(content: str) -> Dict[str, object]:
+    """Validate a JSON answer straight into GeneratedProfileResult."""
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Réponse JSON invalide : {e}")
+    if not isinstance(data, dict):
+        raise ValueError(f"Réponse JSON inattendue : {content[:200]}")
+
+    # Tolerate a JSON list of tags instead of a comma-separated string
+    tags = data.get("Intérêt", "")
+    if isinstance(tags, list):
+        data["Intérêt"] = ", ".join(str(t).strip() for t in tags if str(t).strip())
+
+    return GeneratedProfileResult(**data).model_dump()
+
+
+class OpenAIProvider:
+    """
+    Long-lived OpenAI provider. The sync client (and one async client per event loop)
+    is built once and reused, so every profile shares the same HTTP connection pool.
+    """
+
+    def __init__(self, api_key: str):
+        if OpenAI is None:
+            raise LLMProviderNotAvailable("openai package is not installed.")
+        self.api_key = api_key
+        self.max_retries = int(os.getenv("OPENAI_MAX_RETRIES", 2))
+        self.client = OpenAI(api_key=api_key, max_retries=self.max_retries)
+        self._async_clients = {}
+        self._closing = set()
+        # Shared by every provider instance: one rate limit and circuit for the OpenAI account
+        self.guard = get_provider_guard("openai")
+
+    @property
+    def async_client(self):
+        # httpx async pools are bound to the event loop that created them
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_clients:
+            for previous_loop, previous_client in self._async_clients.items():
+                self._close_async_client(previous_loop, previous_client, loop)
+            self._async_clients = {loop: AsyncOpenAI(api_key=self.api_key, max_retries=self.max_retries)}
+        return self._async_clients[loop]
+
+    def _close_async_client(self, previous_loop, client, loop):
+        """Release the connection pool of a client replaced on a new event loop."""
+        async def close_quietly():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug("Previous async OpenAI client closed with an error: {}", e)
+
+        if previous_loop.is_running() and not previous_loop.is_closed():
+            # Still serving another thread: close it on its own loop
+            asyncio.run_coroutine_threadsafe(close_quietly(), previous_loop)
+        else:
+            # The loop it belonged to is gone (e.g. a finished asyncio.run): close it here
+            task = loop.create_task(close_quietly())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def generate(self, profile_text, tags_list, mode="single"):
+        if mode == "single":
+            with self.guard.circuit():
+                self.guard.throttle()
+                response = self.client.chat.completions.create(**_single_request(profile_text, tags_list))
+            _count_tokens(response)
+            return _parse_single_response(response.choices[0].message.content)
+
+        tags_request, desc_request = _split_requests(profile_text, tags_list)
+        # Call OpenAI for tags, then for description
+        with self.guard.circuit():
+            self.guard.throttle(2)
+            tags_response = self.client.completions.create(**tags_request)
+            desc_response = self.client.completions.create(**desc_request)
+        _count_tokens(tags_response, desc_response)
+        return _parse_split_responses(tags_response, desc_response)
+
+    async def agenerate(self, profile_text, tags_list, mode="single"):
+        # Async calls are paced by AsyncRateBudget; only the circuit breaker applies here
+        client = self.async_client
+        if mode == "single":
+            with self.guard.circuit():
+                response = await client.chat.completions.create(**_single_request(profile_text, tags_list))
+            _count_tokens(response)
+            return _parse_single_response(response.choices[0].message.content)
+
+        tags_request, desc_request = _split_requests(profile_text, tags_list)
+        with self.guard.circuit():
+            tags_response, desc_response = await asyncio.gather(
+                client.completions.create(**tags_request),
+                client.completions.create(**desc_request),
+            )
+        _count_tokens(tags_response, desc_response)
+        return _parse_split_responses(tags_response, desc_response)
+
+
+class AsyncRateBudget:
+    """Request and token budget per minute, refilled continuously; waiters are served in order."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.request_rate = requests_per_minute / 60
+        self.token_rate = tokens_per_minute / 60
+        self.request_capacity = max(1.0, requests_per_minute / 60)
+        self.token_capacity = float(tokens_per_minute) / 60
+        self._requests = self.request_capacity
+        self._tokens = self.token_capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.request_capacity, self._requests + elapsed * self.request_rate)
+        self._tokens = min(self.token_capacity, self._tokens + elapsed * self.token_rate)
+
+    async def acquire(self, requests: int = 1, tokens: int = 0):
+        # A call larger than the bucket only has to wait for a full bucket
+        requests = min(requests, self.request_capacity)
+        tokens = min(tokens, self.token_capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= requests and self._tokens >= tokens:
+                    self._requests -= requests
+                    self._tokens -= tokens
+                    return
+                wait = max(
+                    (requests - self._requests) / self.request_rate,
+                    (tokens - self._tokens) / self.token_rate,
+                )
+                await asyncio.sleep(wait)
+
+
+_providers: Dict[str, OpenAIProvider] = {}
+_providers_lock = threading.Lock()
+
+def get_openai_provider(api_key: Optional[str] = None) -> OpenAIProvider:
+    """Shared provider for `api_key` (defaults to OPENAI_API_KEY)."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not provided.")
+    with _providers_lock:
+        if api_key not in _providers:
+            _providers[api_key] = OpenAIProvider(api_key)
+        return _providers[api_key]
+
+def _count_tokens(*responses):
+    for response in responses:
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            metrics.incr("llm_prompt_tokens", usage.prompt_tokens or 0)
+            metrics.incr("llm_completion_tokens", usage.completion_tokens or 0)
+
+def _openai_generate(profile_text, tags_list, api_key, language, mode="single"):
+    return get_openai_provider(api_key).generate(profile_text, tags_list, mode)
@@ -1,5 +1,8 @@
-from typing import List, Dict
-from core.static_values import CENTER_OF_INTEREST_LIST
+from typing import List, Dict, Iterable
+from services.tag_matcher import get_default_matcher
+
+# Manual placeholder for description generation
+PLACEHOLDER_DESCRIPTION = "Auto-generated summary to be completed."
 
 def build_interest_and_description(profile_text: str) -> Dict[str, object]:
     """
@@ -11,15 +14,14 @@ def build_interest_and_description(profile_text: str) -> Dict[str, object]:
     Returns:
         dict: Dictionary with keys 'Intérêt' (list of tags) and 'Description' (short summary).
     """
-    # Naive keyword-based detection of interests (case-insensitive)
-    interests = []
-    text_norm = profile_text.lower()
-    for tag in CENTER_OF_INTEREST_LIST:
-        if tag is not None:
-            tag_norm = tag.lower()
-            if tag_norm in text_norm:
-                interests.append(tag)
+    # Keyword-based detection of interests and their aliases (case/accent-insensitive, whole words)
+    interests = get_default_matcher().match(profile_text)
+    return {"Intérêt": ", ".join(interests), "Description": PLACEHOLDER_DESCRIPTION}
 
-    # Manual placeholder for description generation
-    description = "Auto-generated summary to be completed."
-    return {"Intérêt": ", ".join(interests), "Description": description}
\ No newline at end of file
+def build_interest_and_description_many(profile_texts: Iterable[str]) -> List[Dict[str, object]]:
+    """Batch version of `build_interest_and_description`, sharing one compiled matcher."""
+    matcher = get_default_matcher()
+    return [
+        {"Intérêt": ", ".join(interests), "Description": PLACEHOLDER_DESCRIPTION}
+        for interests in matcher.match_many(profile_texts)
+    ]
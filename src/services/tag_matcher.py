@@ -0,0 +1,71 @@
+"""
+Precompiled multi-pattern matcher for interest tags.
+
+All tags and their aliases are folded (case, accents, separators) and compiled
+into a single trie-shaped regex, so detecting every tag is one pass over the
+profile text instead of one scan per tag. Factoring common prefixes lets the
+regex engine reject most positions after a character or two.
+
+Example usage:
+    matcher = get_default_matcher()
+    matcher.match("Ingénieur ML Ops, passionné de vision par ordinateur")
+    # ["MLOps", "Computer Vision"]
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from core.static_values import CENTER_OF_INTEREST_ALIASES, CENTER_OF_INTEREST_LIST
+from core.text_normalization import fold_text
+
+_END = ""
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation of `words`, factored as a prefix trie."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != _END]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A word ending here is optional: the greedy branch prefers the longest variant
+        return f"(?:{body})?" if _END in node else body
+
+    return build(trie)
+
+
+class TagMatcher:
+    def __init__(self, tags: Iterable[Optional[str]], aliases: Optional[Dict[str, List[str]]] = None):
+        self.tags = [tag for tag in tags if tag]
+        aliases = aliases or {}
+
+        # Folded variant -> position of its tag in the tag list
+        self._variants = {}
+        for position, tag in enumerate(self.tags):
+            for variant in [tag, *aliases.get(tag, [])]:
+                folded = fold_text(variant)
+                if folded:
+                    self._variants.setdefault(folded, position)
+
+        # Whole words only: "web" must not match "webinar" (every variant starts with a word character)
+        self._pattern = re.compile(r"\b" + _trie_pattern(self._variants) + r"(?!\w)")
+
+    def match(self, text: str) -> List[str]:
+        """Tags found in `text`, in the order of the tag list."""
+        found = {self._variants[m.group()] for m in self._pattern.finditer(fold_text(text))}
+        return [self.tags[position] for position in sorted(found)]
+
+    def match_many(self, texts: Iterable[str]) -> List[List[str]]:
+        return [self.match(text) for text in texts]
+
+
+@lru_cache(maxsize=1)
+def get_default_matcher() -> TagMatcher:
+    """Matcher over CENTER_OF_INTEREST_LIST and CENTER_OF_INTEREST_ALIASES, compiled once."""
+    return TagMatcher(CENTER_OF_INTEREST_LIST, CENTER_OF_INTEREST_ALIASES)
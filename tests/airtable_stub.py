@@ -0,0 +1,151 @@
+"""
+Local stand-in for the Airtable records API, used by test_airtable_sync.py.
+
+/v0/{base}/{table}: paginated GET of the records (`pageSize`, `offset`, `fields[]`;
+`view` is accepted and ignored) and PATCH of up to 10 records, by id or with
+`performUpsert`. Like Airtable, more than `rate_limit` requests in one second
+are answered with 429; `request_times` keeps every request time for assertions.
+
+Example usage:
+    airtable = AirtableStub(records=[{"Email": "ada@example.com"}]).start()
+    client = AirtableClient(airtable.table_url, headers={})
+    ...
+    airtable.stop()
+"""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+class AirtableStub:
+    """ThreadingHTTPServer running in a daemon thread, serving one table kept in memory."""
+
+    MAX_RECORDS_PER_REQUEST = 10
+
+    def __init__(self, records: Optional[list] = None, rate_limit: int = 5, base_id: str = "appStub", table: str = "Users"):
+        self.rate_limit = rate_limit
+        self.table_path = f"/v0/{base_id}/{table}"
+        self.records: Dict[str, dict] = {}
+        self.requests = {"airtable_list": 0, "airtable_update": 0}
+        self.request_times: list = []
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self.base_url = ""
+        for fields in records or []:
+            self._create(dict(fields))
+
+    @property
+    def table_url(self) -> str:
+        return f"{self.base_url}{self.table_path}"
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, payload = stub.dispatch(self.command, self.path, body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_PATCH = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def dispatch(self, method: str, path: str, body) -> Tuple[int, object]:
+        parts = urlsplit(path)
+        if parts.path.rstrip("/") != self.table_path or method not in ("GET", "PATCH"):
+            return 404, {"error": f"No stub for {method} {path}"}
+        endpoint = "airtable_list" if method == "GET" else "airtable_update"
+        with self._lock:
+            self.requests[endpoint] += 1
+        if self._rate_limited():
+            return 429, {"error": {"type": "RATE_LIMIT_REACHED", "message": "Rate limit exceeded"}}
+        if method == "GET":
+            return 200, self._list(parse_qs(parts.query))
+        return self._update(body)
+
+    def _create(self, fields: dict) -> dict:
+        record = {"id": f"rec{uuid.uuid4().hex[:14]}", "createdTime": "2025-01-01T00:00:00.000Z", "fields": fields}
+        self.records[record["id"]] = record
+        return record
+
+    def _rate_limited(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self.request_times.append(now)
+            recent = [t for t in self.request_times if now - t < 1.0]
+            if len(recent) > self.rate_limit:
+                self.rejected += 1
+                return True
+        return False
+
+    def _list(self, query: Dict[str, list]):
+        page_size = min(100, int(query.get("pageSize", ["100"])[0]))
+        start = int(query.get("offset", ["0"])[0])
+        fields = query.get("fields[]")
+        with self._lock:
+            ids = sorted(self.records)
+            page = [self.records[record_id] for record_id in ids[start:start + page_size]]
+        records = [
+            {**record, "fields": {k: v for k, v in record["fields"].items() if not fields or k in fields}}
+            for record in page
+        ]
+        payload = {"records": records}
+        if start + page_size < len(ids):
+            payload["offset"] = str(start + page_size)
+        return payload
+
+    def _update(self, body):
+        records = (body or {}).get("records", [])
+        if not records or len(records) > self.MAX_RECORDS_PER_REQUEST:
+            return 422, {"error": {"type": "INVALID_RECORDS", "message": f"{len(records)} records in one request"}}
+        upsert = (body or {}).get("performUpsert")
+        updated, created = [], []
+        with self._lock:
+            unknown = [item.get("id") for item in records if not upsert and item.get("id") not in self.records]
+            if unknown:
+                return 404, {"error": {"type": "NOT_FOUND", "message": f"Unknown record(s): {unknown}"}}
+            for item in records:
+                if upsert:
+                    merge_on = upsert["fieldsToMergeOn"]
+                    key = tuple(item["fields"].get(field) for field in merge_on)
+                    match = next((r for r in self.records.values()
+                                  if tuple(r["fields"].get(field) for field in merge_on) == key), None)
+                    if match is None:
+                        created.append(self._create(dict(item["fields"])))
+                        continue
+                    record = match
+                else:
+                    record = self.records[item["id"]]
+                record["fields"].update(item["fields"])
+                updated.append(record)
+        payload = {"records": updated + created}
+        if upsert:
+            payload["updatedRecords"] = [r["id"] for r in updated]
+            payload["createdRecords"] = [r["id"] for r in created]
+        return 200, payload
@@ -0,0 +1,112 @@
+import pytest
+
+from airtable_stub import AirtableStub
+from services.airtable_sync import AirtableClient, AirtableError, changed_fields, contact_columns, pull_contacts, push_enrichment
+from utils import throttle
+from utils.http_client import PooledHTTPClient
+
+
+def contact(i, **fields):
+    return {
+        "Prénom": f"Prenom{i}",
+        "Nom": f"Nom{i}",
+        "Email": f"person{i}@example.com",
+        "Linkedin": f"https://www.linkedin.com/in/person-{i}",
+        **fields,
+    }
+
+
+@pytest.fixture
+def airtable():
+    stub = AirtableStub(records=[contact(i) for i in range(25)]).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def client(airtable, monkeypatch):
+    monkeypatch.setattr(throttle, "_guards", {})
+    return AirtableClient(airtable.table_url, headers={"Authorization": "Bearer test"},
+                          http=PooledHTTPClient(max_retries=0), rate_limit_wait=0.01)
+
+
+def test_pull_contacts_pages_through_the_view(airtable, client, monkeypatch):
+    monkeypatch.setattr("services.airtable_sync.PAGE_SIZE", 10)
+    frame = pull_contacts(client, view="Enrichment")
+    assert len(frame) == 25
+    assert list(frame.columns) == ["Record ID", *contact_columns().values()]
+    assert airtable.requests["airtable_list"] == 3
+    assert frame["Intérêt"].eq("").all()
+
+
+def test_push_sends_only_changed_fields_in_batches_of_ten(airtable, client):
+    ids = {record["fields"]["Email"]: record_id for record_id, record in airtable.records.items()}
+    airtable.records[ids["person0@example.com"]]["fields"].update({"Intérêt": ["MLOps", "NLP"], "Description": "Déjà là."})
+
+    rows = [
+        # Same tags in another order and casing, same description: nothing to send
+        {**contact(0), "Intérêt": "nlp, MLOps", "Description": "Déjà là."},
+        # Matched by LinkedIn URL only (other email, locale subdomain)
+        {**contact(1), "Email": "", "Linkedin": "https://fr.linkedin.com/in/Person-1/", "Intérêt": "Web", "Description": ""},
+        # Not enriched: never blanks Airtable
+        {**contact(2), "Intérêt": "", "Description": ""},
+        *({**contact(i), "Intérêt": "Data Engineering", "Description": f"Profil {i} orienté data."} for i in range(3, 25)),
+        {**contact(99), "Intérêt": "MLOps", "Description": "Inconnu dans Airtable."},
+    ]
+    report = push_enrichment(rows, client, view="Enrichment")
+
+    assert report["updated"] == 23
+    assert report["unchanged"] == 2
+    assert report["missing"] == 1
+    assert report["created"] == 0
+    # 1 list + ceil(23 / 10) updates
+    assert report["requests"] == 4
+    assert airtable.requests["airtable_update"] == 3
+    assert airtable.rejected == 0
+
+    fields = {record["fields"]["Email"]: record["fields"] for record in airtable.records.values()}
+    assert fields["person1@example.com"] == {**contact(1), "Intérêt": ["Web"]}
+    assert "Intérêt" not in fields["person2@example.com"]
+    assert fields["person3@example.com"]["Description"] == "Profil 3 orienté data."
+
+
+def test_requests_are_paced_under_the_rate_limit(airtable, client):
+    rows = [{**contact(i), "Intérêt": "Web", "Description": f"Développeur web {i}."} for i in range(25)]
+    for _ in range(3):
+        rows = [{**row, "Description": row["Description"] + " Mis à jour."} for row in rows]
+        push_enrichment(rows, client)
+
+    times = sorted(airtable.request_times)
+    assert len(times) == 12
+    assert all(sum(1 for t in times if start <= t < start + 1.0) <= 5 for start in times)
+    assert airtable.rejected == 0
+
+
+def test_missing_contacts_are_upserted_on_email(airtable, client):
+    rows = [{**contact(100 + i), "Intérêt": "NLP", "Description": "Chercheur en NLP."} for i in range(12)]
+    report = push_enrichment(rows, client, create_missing=True, interests_as_list=False)
+    assert report["created"] == 12
+    assert airtable.requests["airtable_update"] == 2
+    created = [r["fields"] for r in airtable.records.values() if r["fields"].get("Email") == "person100@example.com"]
+    assert created == [{"Email": "person100@example.com", "Intérêt": "NLP", "Description": "Chercheur en NLP."}]
+
+
+def test_oversized_batches_are_rejected_by_the_stub(airtable, client):
+    records = [{"id": record_id, "fields": {"Description": "x" * 12}} for record_id in list(airtable.records)[:11]]
+    with pytest.raises(AirtableError, match="422"):
+        client._request("PATCH", json={"records": records})
+
+
+def test_client_errors_do_not_trip_the_circuit_breaker(airtable, client):
+    for _ in range(client.guard.breaker.failure_threshold):
+        with pytest.raises(AirtableError, match="404"):
+            client._request("PATCH", json={"records": [{"id": "recUnknown", "fields": {"Description": "x"}}]})
+    assert client.guard.breaker.failures == 0
+    assert client.guard.breaker.state == "closed"
+
+
+def test_changed_fields_ignores_tag_order_and_case():
+    columns = contact_columns()
+    current = {"Intérêt": ["MLOps", "NLP"], "Description": "Texte"}
+    assert changed_fields(current, {"Intérêt": "nlp, mlops", "Description": "Texte"}, columns) == {}
+    assert changed_fields(current, {"Intérêt": "NLP", "Description": ""}, columns) == {"Intérêt": ["NLP"]}
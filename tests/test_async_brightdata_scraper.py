@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from utils import throttle
+from scrapers.async_brightdata_scraper import AsyncBrightDataScraper
+
+
+@pytest.fixture(autouse=True)
+def brightdata_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("BRIGHTDATA_API_KEY", "test-key")
+    monkeypatch.setenv("BRIGHTDATA_DATASET_ID", "test-dataset")
+    monkeypatch.setenv("BRIGHTDATA_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("BRIGHTDATA_BATCH_SIZE", "1")
+    monkeypatch.setenv("BRIGHTDATA_POLL_INTERVAL", "0")
+    monkeypatch.setenv("BRIGHTDATA_RATE_LIMIT", "0")
+    monkeypatch.setattr(throttle, "_guards", {})
+
+
+class FakeBrightData:
+    """In-memory BrightData API: each snapshot becomes ready after two progress polls."""
+
+    def __init__(self):
+        self.snapshots = {}
+        self.polls = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/trigger"):
+            snapshot_id = f"s{len(self.snapshots)}"
+            self.snapshots[snapshot_id] = [item["url"] for item in json.loads(request.content)]
+            return httpx.Response(200, json={"snapshot_id": snapshot_id})
+        snapshot_id = path.rsplit("/", 1)[-1]
+        if "/progress/" in path:
+            self.polls[snapshot_id] = self.polls.get(snapshot_id, 0) + 1
+            status = "ready" if self.polls[snapshot_id] >= 2 else "running"
+            return httpx.Response(200, json={"status": status})
+        records = [{"input": {"url": url}, "about": f"About {url}"} for url in self.snapshots[snapshot_id]]
+        return httpx.Response(200, json=records)
+
+
+def test_scrape_many_polls_all_snapshots_on_one_client():
+    api = FakeBrightData()
+    urls = [f"https://www.linkedin.com/in/user-{i}/" for i in range(3)]
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+        scraper = AsyncBrightDataScraper(client=client)
+        first = await scraper.scrape_many(urls)
+        second = await scraper.scrape_many(urls)
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(api.snapshots) == 3
+    assert all(count == 2 for count in api.polls.values())
+    assert first[urls[2]]["summary"] == f"About {urls[2]}"
+    # Second call is served from cache without triggering new snapshots
+    assert second == first
+    assert len(api.snapshots) == 3
+
+
+def test_wait_times_out(monkeypatch):
+    monkeypatch.setenv("BRIGHTDATA_TIMEOUT", "0")
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(202))
+        async with AsyncBrightDataScraper(client=httpx.AsyncClient(transport=transport)) as scraper:
+            await scraper._wait_until_snapshot_ready("s0")
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
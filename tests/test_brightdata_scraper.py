@@ -0,0 +1,107 @@
+import pytest
+from utils import throttle
+from utils.throttle import BackendUnavailable
+from scrapers.brightdata_scraper import BrightDataScraper
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setenv("BRIGHTDATA_API_KEY", "test-key")
+    monkeypatch.setenv("BRIGHTDATA_DATASET_ID", "test-dataset")
+    monkeypatch.setenv("BRIGHTDATA_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("BRIGHTDATA_BATCH_SIZE", "2")
+    monkeypatch.setenv("BRIGHTDATA_RATE_LIMIT", "0")
+    monkeypatch.setattr(throttle, "_guards", {})
+    return BrightDataScraper()
+
+
+def record(url, about):
+    return {"input": {"url": url}, "url": url, "about": about,
+            "current_company": {"title": "Data Engineer", "name": "Acme"}}
+
+
+def test_scrape_many_batches_cache_misses(scraper, monkeypatch):
+    urls = [
+        "https://www.linkedin.com/in/alice/",
+        "https://www.linkedin.com/in/bob",
+        "https://www.linkedin.com/in/carol/",
+    ]
+    triggered = []
+
+    def fake_trigger(batch):
+        triggered.append(list(batch))
+        return f"snap-{len(triggered)}"
+
+    def fake_records(snapshot_id):
+        batch = triggered[int(snapshot_id.split("-")[1]) - 1]
+        # Records come back in arbitrary order, without trailing slashes
+        return [record(url.rstrip("/"), f"About {url}") for url in reversed(batch)]
+
+    monkeypatch.setattr(scraper, "_trigger_snapshot", fake_trigger)
+    monkeypatch.setattr(scraper, "_wait_until_snapshot_ready", lambda snapshot_id: None)
+    monkeypatch.setattr(scraper, "_fetch_snapshot_records", fake_records)
+
+    profiles = scraper.scrape_many(urls)
+
+    assert triggered == [urls[:2], urls[2:]]
+    assert set(profiles) == set(urls)
+    assert profiles[urls[1]]["summary"] == f"About {urls[1]}"
+    assert profiles[urls[0]]["headline"] == "Data Engineer at Acme"
+
+    # Second call is served entirely from the per-URL cache files
+    assert scraper.scrape_many(urls) == profiles
+    assert len(triggered) == 2
+
+
+def test_scrape_many_skips_error_records(scraper, monkeypatch):
+    urls = ["https://www.linkedin.com/in/alice/", "https://www.linkedin.com/in/ghost/"]
+    monkeypatch.setattr(scraper, "_trigger_snapshot", lambda batch: "snap")
+    monkeypatch.setattr(scraper, "_wait_until_snapshot_ready", lambda snapshot_id: None)
+    monkeypatch.setattr(scraper, "_fetch_snapshot_records", lambda snapshot_id: [
+        record(urls[0], "About Alice"),
+        {"input": {"url": urls[1]}, "error": "Page not found"},
+    ])
+
+    profiles = scraper.scrape_many(urls)
+
+    assert list(profiles) == [urls[0]]
+    assert scraper._read_cache(urls[1]) is None
+
+
+def test_failed_batch_keeps_the_other_batches(scraper, monkeypatch):
+    urls = ["https://www.linkedin.com/in/alice/", "https://www.linkedin.com/in/bob/", "https://www.linkedin.com/in/carol/"]
+
+    def fake_trigger(batch):
+        if urls[0] in batch:
+            raise ConnectionError("snapshot trigger failed")
+        return "snap"
+
+    monkeypatch.setattr(scraper, "_trigger_snapshot", fake_trigger)
+    monkeypatch.setattr(scraper, "_wait_until_snapshot_ready", lambda snapshot_id: None)
+    monkeypatch.setattr(scraper, "_fetch_snapshot_records", lambda snapshot_id: [record(urls[2], "About Carol")])
+
+    profiles = scraper.scrape_many(urls)
+
+    assert list(profiles) == [urls[2]]
+
+
+def test_nested_snapshot_answers_are_flattened(scraper):
+    alice = record("https://www.linkedin.com/in/alice", "About Alice")
+    assert scraper._snapshot_records("snap", [[alice]]) == [alice]
+    assert scraper._snapshot_records("snap", [alice]) == [alice]
+    with pytest.raises(ValueError, match="Unexpected snapshot format"):
+        scraper._snapshot_records("snap", {"status": "building"})
+
+
+def test_failed_snapshot_stops_polling(scraper):
+    class FailedProgress:
+        status_code = 200
+
+        def json(self):
+            return {"status": "failed"}
+
+    polls = []
+    scraper.http = type("FakeHTTP", (), {"get": lambda self, url, headers=None: polls.append(url) or FailedProgress()})()
+    with pytest.raises(BackendUnavailable, match="snap-1 failed"):
+        scraper._wait_until_snapshot_ready("snap-1")
+    assert len(polls) == 1
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+from scrapers.cache_store import JsonDirCacheStore, SQLiteCacheStore, cache_key, migrate_json_dir
+
+URLS = [f"https://www.linkedin.com/in/user-{i}/" for i in range(3)]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        return JsonDirCacheStore(str(tmp_path / "fetched_json"))
+    return SQLiteCacheStore(str(tmp_path / "cache.sqlite"))
+
+
+def test_put_get_many_and_delete(store):
+    for i, url in enumerate(URLS[:2]):
+        store.put("brightdata", url, {"about": f"Profil n°{i}"})
+
+    found = store.get_many("brightdata", URLS)
+
+    assert list(found) == URLS[:2]
+    assert found[URLS[1]]["data"] == {"about": "Profil n°1"}
+    assert found[URLS[1]]["fetched_at"].endswith("Z")
+    assert store.get("proxycurl", URLS[0]) is None
+
+    store.delete("brightdata", URLS[0])
+    assert store.get("brightdata", URLS[0]) is None
+    assert [entry["url"] for entry in store.iter_entries("brightdata")] == [cache_key(URLS[1])]
+
+
+def test_every_form_of_a_url_hits_the_same_entry(store):
+    store.put("brightdata", "https://fr.linkedin.com/in/Jane-Doe/?originalSubdomain=fr", {"about": "Jane"})
+
+    found = store.get_many("brightdata", ["https://www.linkedin.com/in/jane-doe", "jane-doe"])
+
+    assert [entry["data"] for entry in found.values()] == [{"about": "Jane"}] * 2
+
+
+def test_caches_keyed_on_raw_urls_are_rekeyed(tmp_path):
+    raw_url = "https://fr.linkedin.com/in/Jane-Doe/"
+    cache_dir = tmp_path / "fetched_json"
+    cache_dir.mkdir()
+    legacy_name = f"brightdata_{hashlib.md5(raw_url.encode()).hexdigest()}.json"
+    (cache_dir / legacy_name).write_text(json.dumps(
+        {"scraper": "brightdata", "fetched_at": "2025-01-01T00:00:00.000000Z", "url": raw_url, "data": {"about": "Jane"}}
+    ))
+    assert JsonDirCacheStore(str(cache_dir)).get("brightdata", "jane-doe")["data"] == {"about": "Jane"}
+
+    path = str(tmp_path / "cache.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE scrape_cache (scraper TEXT NOT NULL, url TEXT NOT NULL, fetched_at REAL NOT NULL,"
+                 " payload BLOB NOT NULL, PRIMARY KEY (scraper, url))")
+    conn.execute("INSERT INTO scrape_cache VALUES (?, ?, ?, ?)",
+                 ("brightdata", raw_url, time.time(), SQLiteCacheStore._encode({"about": "Jane"})))
+    conn.commit()
+    conn.close()
+    assert SQLiteCacheStore(path).get("brightdata", "jane-doe")["data"] == {"about": "Jane"}
+
+
+def test_ttl_expires_entries(store):
+    store.ttl_seconds = 60
+    store.put("brightdata", URLS[0], {"about": "old"}, fetched_at=time.time() - 120)
+    store.put("brightdata", URLS[1], {"about": "fresh"})
+
+    assert list(store.get_many("brightdata", URLS)) == [URLS[1]]
+
+
+def test_sqlite_payloads_are_compressed(tmp_path):
+    store = SQLiteCacheStore(str(tmp_path / "cache.sqlite"))
+    store.put("brightdata", URLS[0], {"about": "x" * 10000})
+    payload = store._conn.execute("SELECT payload FROM scrape_cache").fetchone()[0]
+
+    assert len(payload) < 1000
+
+
+def test_migrate_json_dir(tmp_path):
+    json_store = JsonDirCacheStore(str(tmp_path / "fetched_json"))
+    json_store.put("brightdata", URLS[0], {"about": "Alice"}, fetched_at=1700000000)
+    json_store.put("brightdata", URLS[1], {"about": "Bob"})
+    # Stray non-cache files are skipped
+    with open(os.path.join(json_store.cache_dir, "notes.json"), "w") as f:
+        json.dump(["not", "an", "entry"], f)
+
+    sqlite_store = SQLiteCacheStore(str(tmp_path / "cache.sqlite"))
+
+    assert migrate_json_dir(json_store.cache_dir, sqlite_store) == 2
+    migrated = sqlite_store.get("brightdata", URLS[0])
+    assert migrated["data"] == {"about": "Alice"}
+    assert migrated["fetched_at"].startswith("2023-11-14T22:13:20")
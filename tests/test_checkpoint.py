@@ -0,0 +1,65 @@
+import pandas as pd
+
+from core.checkpoint import CheckpointJournal, row_key
+
+RESULT = {"Intérêt": "MLOps", "Description": "Ingénieur MLOps confirmé."}
+
+
+def test_row_key_ignores_position_and_formatting():
+    row = pd.Series({"Email": "alice@example.com", "Linkedin": "alice-dupont", "Prénom": "Alice", "Nom": "Dupont"})
+    same = pd.Series({"Email": " Alice@Example.com", "Linkedin": "alice-dupont", "Prénom": "Alice", "Nom": "Dupont", "Titre": "Lead AI"})
+    other = pd.Series({"Email": "bob@example.org", "Prénom": "Bob", "Nom": "Martin", "Métier": float("nan")})
+
+    assert row_key(row) == row_key(same)
+    assert row_key(row) != row_key(other)
+
+
+def test_journal_round_trip_and_torn_line(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "checkpoints" / "run.jsonl"))
+    journal.append("a", RESULT)
+    journal.append("b", {"Intérêt": "NLP", "Description": "Chercheur en traitement du langage."})
+    journal.append("a", {"Intérêt": "DevOps", "Description": "Ingénieur plateforme et CI/CD."})
+    # Simulate a crash in the middle of a write
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"key": "c", "Intér')
+
+    done = journal.load()
+
+    assert set(done) == {"a", "b"}
+    assert done["a"]["Intérêt"] == "DevOps"
+
+
+def test_missing_journal_loads_empty(tmp_path):
+    assert CheckpointJournal(str(tmp_path / "none.jsonl")).load() == {}
+
+
+def test_offsets_point_to_last_entry(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "run.jsonl"))
+    journal.append("a", RESULT)
+    journal.append("b", {"Intérêt": "NLP", "Description": "Chercheur en traitement du langage."})
+    journal.append("a", {"Intérêt": "DevOps", "Description": "Ingénieur plateforme et CI/CD."})
+
+    offsets = journal.load_offsets()
+
+    assert journal.read_at(offsets["a"])["Intérêt"] == "DevOps"
+    assert journal.read_at(offsets["b"]) == journal.load()["b"]
+
+
+def test_append_after_a_torn_line_starts_a_new_line(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    CheckpointJournal(path).append("a", RESULT)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"key": "b", "Intér')
+
+    # Restart: the torn entry is dropped and the next one is readable
+    journal = CheckpointJournal(path)
+    journal.append("c", RESULT)
+
+    assert sorted(journal.load_offsets()) == ["a", "c"]
+    assert journal.read_at(journal.load_offsets()["c"]) == RESULT
+
+
+def test_extra_labels_do_not_overwrite_the_result(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "run.jsonl"))
+    journal.append("a", RESULT, extra={"key": "other", "Intérêt": "Web", "tier": "local"})
+    assert journal.load() == {"a": RESULT}
@@ -0,0 +1,57 @@
+from utils.crud import build_profile_text, estimate_tokens, get_profile_text
+
+PROFILE = {
+    "summary": "Passionné par le MLOps et le NLP.",
+    "headline": "Data Engineer",
+    "experience": [
+        {"title": "Data Engineer", "company": "Acme"},
+        {"title": "Data Engineer", "company": "Foo"},
+        {"title": "data engineer", "company": "Acme"},
+        {"title": "ML Engineer", "company": "Foo"},
+    ],
+}
+
+
+def test_titles_and_companies_are_deduplicated():
+    text = get_profile_text(PROFILE, token_budget=0)
+
+    assert text.split("\n") == [
+        "Data Engineer",
+        "Data Engineer (Acme, Foo)",
+        "ML Engineer (Foo)",
+        "Passionné par le MLOps et le NLP.",
+    ]
+
+
+def test_fields_already_in_the_text_are_dropped():
+    profile = {"summary": "Data Engineer", "headline": "Data Engineer", "experience": []}
+
+    assert get_profile_text(profile, token_budget=0) == "Data Engineer"
+
+
+def test_short_fields_contained_in_longer_ones_are_kept():
+    profile = {"summary": "Data", "headline": "Head of Data Engineering", "experience": []}
+
+    assert get_profile_text(profile, token_budget=0) == "Head of Data Engineering\nData"
+
+
+def test_budget_keeps_important_fields_and_reports_savings():
+    profile = {
+        "summary": "Très long résumé " * 200,
+        "headline": "Lead Data Scientist",
+        "experience": [{"title": f"Role {i}", "company": f"Company {i}"} for i in range(30)],
+    }
+
+    result = build_profile_text(profile, token_budget=100)
+
+    lines = result.text.split("\n")
+    assert lines[0] == "Lead Data Scientist"
+    assert lines[1:6] == [f"Role {i} (Company {i})" for i in range(5)]
+    assert lines[6].startswith("Très long résumé") and lines[6].endswith("…")
+    assert result.tokens <= 100
+    assert result.tokens == estimate_tokens(result.text)
+    assert result.tokens_saved > 800
+
+
+def test_empty_profile():
+    assert build_profile_text({}, token_budget=50) == ("", 0, 0)
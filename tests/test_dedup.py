@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from core.dedup import SingleFlight, canonicalize_linkedin_url, count_enrichment_keys, enrichment_key
+
+CANONICAL = "https://www.linkedin.com/in/jane-doe"
+
+
+@pytest.mark.parametrize("value", [
+    "https://www.linkedin.com/in/jane-doe",
+    "https://www.linkedin.com/in/jane-doe/",
+    "http://fr.linkedin.com/in/Jane-Doe?originalSubdomain=fr",
+    "https://m.linkedin.com/in/jane-doe/#experience",
+    "www.linkedin.com/in/JANE-DOE/details/experience/",
+    "linkedin.com/in/jane-doe",
+    "in/jane-doe",
+    " Jane-Doe ",
+])
+def test_linkedin_urls_are_canonicalized(value):
+    assert canonicalize_linkedin_url(value) == CANONICAL
+
+
+def test_percent_encoded_ids_are_normalized():
+    assert canonicalize_linkedin_url("https://www.linkedin.com/in/h%C3%A9l%C3%A8ne-martin/") == \
+        canonicalize_linkedin_url("hélène-martin")
+
+
+def test_other_values_are_left_alone():
+    assert canonicalize_linkedin_url("") == ""
+    assert canonicalize_linkedin_url("https://www.linkedin.com/company/acme") == "https://www.linkedin.com/company/acme"
+    assert canonicalize_linkedin_url("https://example.com/in/jane") == "https://example.com/in/jane"
+
+
+def test_enrichment_key_groups_rows():
+    rows = [
+        {"Linkedin": "https://fr.linkedin.com/in/jane-doe/", "Métier": "Data Engineer"},
+        {"Linkedin": "jane-doe", "Métier": "Ingénieure"},
+        {"Linkedin": "", "Métier": "Data Engineer", "Domain": "Santé"},
+        {"Linkedin": "", "Métier": "data  engineer", "Domain": "sante"},
+        {"Linkedin": "", "Métier": "", "Domain": ""},
+    ]
+
+    assert enrichment_key(rows[0]) == enrichment_key(rows[1]) == f"url:{CANONICAL}"
+    assert enrichment_key(rows[2]) == enrichment_key(rows[3]) == "text:data engineer|sante"
+    assert enrichment_key(rows[4]) is None
+    assert count_enrichment_keys(rows) == {f"url:{CANONICAL}": 2, "text:data engineer|sante": 2}
+
+
+def test_single_flight_runs_each_key_once_and_frees_results():
+    flight = SingleFlight({"a": 3, "b": 1})
+    calls = []
+
+    def work(key):
+        calls.append(key)
+        time.sleep(0.02)
+        return key.upper()
+
+    results = []
+    threads = [threading.Thread(target=lambda k=k: results.append(flight.run(k, lambda: work(k)))) for k in "aaab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == ["a", "b"]
+    assert sorted(results) == ["A", "A", "A", "B"]
+    assert (flight.calls, flight.shared) == (2, 2)
+    assert flight._futures == {}
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight({"a": 2})
+
+    def fail():
+        raise TimeoutError("slow")
+
+    with pytest.raises(TimeoutError):
+        flight.run("a", fail)
+    with pytest.raises(TimeoutError):
+        flight.run("a", lambda: "not called")
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from core.pipeline import process_profile
+from services.embedding_tagger import (
+    EmbeddingTagger,
+    build_interest_and_description_embedding,
+    build_interest_and_description_embedding_many,
+    get_default_tagger,
+    score_texts,
+    text_features,
+)
+from services.tag_description_builder import PLACEHOLDER_DESCRIPTION
+
+
+def test_text_features_fold_and_skip_function_words():
+    features = text_features("Ingénieur Data et Pipelines")
+    assert features["ingenieur"] == 1
+    assert features["data pipelines"] == 1
+    assert "et" not in features
+
+
+def test_obvious_profiles_get_their_tags():
+    tagger = get_default_tagger()
+    assert tagger.tag("Analyste BI, tableaux de bord Power BI") == ["Data Analytics"]
+    assert tagger.tag("Développeur React et Node.js") == ["Web"]
+    assert "Data Engineering" in tagger.tag("Data Engineer, pipelines Spark et Airflow")
+
+
+def test_unrelated_or_generic_profiles_get_no_tag():
+    tagger = get_default_tagger()
+    assert tagger.tag("Passionné de cuisine et de vélo") == []
+    assert tagger.tag("Consultant généraliste sans spécialité data.") == []
+    assert tagger.tag("") == []
+
+
+def test_scores_and_coverage_shapes():
+    tagger = get_default_tagger()
+    result = tagger.score_many(["Data Engineer", "cuisine", "Data Engineer chez X, passionné de cuisine"])
+    assert result.scores.shape == (3, len(tagger.tags))
+    assert result.coverage[0] == pytest.approx(1.0)
+    assert result.coverage[1] == 0.0
+    assert 0.0 < result.coverage[2] < 1.0
+    # Unknown words dilute the similarity
+    assert result.scores[2].max() < result.scores[0].max()
+
+
+def test_batches_match_single_texts():
+    tagger = EmbeddingTagger({"A": "alpha beta", "B": "gamma delta", "C": "alpha gamma"}, min_score=0.0, batch_size=2)
+    texts = ["alpha", "gamma delta", "alpha gamma", "beta"]
+    batched = tagger.score_many(texts).scores
+    single = np.vstack([tagger.score_many([text]).scores for text in texts])
+    assert np.allclose(batched, single)
+    assert tagger.tag_many(texts)[1] == ["B"]
+
+
+def test_process_pool_matches_in_process(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_POOL_MIN_TEXTS", "10")
+    texts = ["Data Engineer Spark", "Chercheur NLP", "Analyste Power BI", "cuisine"] * 10
+    in_process = get_default_tagger().score_many(texts)
+    pooled = score_texts(texts, workers=2)
+    assert np.allclose(pooled.scores, in_process.scores)
+    assert np.allclose(pooled.coverage, in_process.coverage)
+
+
+def test_result_contract_and_pipeline_method():
+    result = build_interest_and_description_embedding("Ingénieur MLOps, MLflow et Kubeflow")
+    assert result == {"Intérêt": "MLOps", "Description": PLACEHOLDER_DESCRIPTION}
+    assert build_interest_and_description_embedding_many(["Ingénieur MLOps, MLflow et Kubeflow"]) == [result]
+
+    profile = {"summary": "Vision par ordinateur, détection d'objets", "headline": "Computer Vision Engineer", "experience": []}
+    assert process_profile(profile, method="embedding")["Intérêt"] == "Computer Vision"
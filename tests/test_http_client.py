@@ -0,0 +1,69 @@
+import http.server
+import threading
+
+import pytest
+from utils.http_client import PooledHTTPClient
+
+
+@pytest.fixture
+def server():
+    """Local HTTP/1.1 server answering with the queued status codes (200 when the queue is empty)."""
+    state = {"statuses": [], "calls": 0}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _answer(self):
+            state["calls"] += 1
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            status = state["statuses"].pop(0) if state["statuses"] else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        do_GET = do_POST = _answer
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{httpd.server_port}/resource"
+    yield state
+    httpd.shutdown()
+
+
+def test_connections_are_reused(server):
+    client = PooledHTTPClient()
+    for _ in range(5):
+        assert client.get(server["url"]).status_code == 200
+
+    assert client.connection_stats() == {"requests": 5, "connections": 1, "reused": 4}
+
+
+def test_get_retries_on_5xx_and_429(server):
+    server["statuses"] = [503, 429]
+    client = PooledHTTPClient(backoff_factor=0)
+
+    assert client.get(server["url"]).status_code == 200
+    assert server["calls"] == 3
+
+
+def test_post_is_only_retried_on_429(server):
+    client = PooledHTTPClient(backoff_factor=0)
+
+    server["statuses"] = [500]
+    assert client.post(server["url"], json={}).status_code == 500
+    assert server["calls"] == 1
+
+    server["statuses"] = [429]
+    assert client.post(server["url"], json={}).status_code == 200
+    assert server["calls"] == 3
+
+
+def test_per_host_timeouts():
+    client = PooledHTTPClient(default_timeout=(1, 2), host_timeouts={"api.brightdata.com": (3, 4)})
+
+    assert client.timeout_for("https://api.brightdata.com/datasets/v3/trigger") == (3, 4)
+    assert client.timeout_for("https://example.com/") == (1, 2)
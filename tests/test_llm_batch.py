@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+import enrich_from_csv as enrich
+from services.llm_batch import LocalBatchBackend, _manual_responder, parse_batch_results, write_batch_requests
+
+TAGS = ["MLOps", "Data Engineering", "NLP"]
+ITEMS = [
+    ("row-1", "Ingénieur MLOps chez Acme"),
+    ("row-2", "Data engineer, pipelines Spark"),
+]
+
+
+def run_batch(tmp_path, mode, responder=None):
+    requests_path = tmp_path / "requests.jsonl"
+    results_path = tmp_path / "results.jsonl"
+    assert write_batch_requests(ITEMS, TAGS, str(requests_path), mode=mode) == 2
+
+    backend = LocalBatchBackend(str(tmp_path / "work"), responder=responder)
+    batch_id = backend.submit(str(requests_path), mode)
+    assert backend.status(batch_id) == "completed"
+    backend.download_results(batch_id, str(results_path))
+    return requests_path, parse_batch_results(str(results_path), mode=mode)
+
+
+def test_single_mode_round_trip(tmp_path):
+    requests_path, results = run_batch(tmp_path, "single")
+
+    lines = [json.loads(line) for line in requests_path.read_text(encoding="utf-8").splitlines()]
+    assert [line["custom_id"] for line in lines] == ["row-1", "row-2"]
+    assert lines[0]["url"] == "/v1/chat/completions"
+
+    assert results["row-1"]["Intérêt"] == "MLOps"
+    assert results["row-2"]["Intérêt"] == "Data Engineering"
+
+
+def test_split_mode_joins_both_requests_per_row(tmp_path):
+    requests_path, results = run_batch(tmp_path, "split")
+
+    custom_ids = [json.loads(line)["custom_id"] for line in requests_path.read_text(encoding="utf-8").splitlines()]
+    assert custom_ids == ["row-1::tags", "row-1::description", "row-2::tags", "row-2::description"]
+
+    assert results["row-1"]["Intérêt"] == "MLOps"
+    assert results["row-1"]["Description"]
+
+
+def test_failed_requests_are_reported_per_row(tmp_path):
+    def responder(body, custom_id):
+        if "Spark" in body["messages"][-1]["content"]:
+            raise RuntimeError("server error")
+        content = json.dumps({"Intérêt": ["NLP"], "Description": "Chercheur NLP."})
+        return {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]}
+
+    _, results = run_batch(tmp_path, "single", responder)
+
+    assert results["row-1"] == {"Intérêt": "NLP", "Description": "Chercheur NLP."}
+    assert isinstance(results["row-2"], ValueError)
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_batch_requests(ITEMS, TAGS, str(tmp_path / "requests.jsonl"), mode="stream")
+
+
+def test_submit_is_refused_while_the_previous_batch_is_pending(tmp_path, monkeypatch):
+    state_path = tmp_path / "current_batch.json"
+    state_path.write_text(json.dumps({"batch_id": "batch_1", "backend": "openai"}), encoding="utf-8")
+    monkeypatch.setattr(enrich, "BATCH_STATE_PATH", str(state_path))
+    monkeypatch.setattr(enrich, "get_batch_backend", lambda name: type("Backend", (), {"status": lambda self, batch_id: "in_progress"})())
+
+    with pytest.raises(SystemExit):
+        enrich.batch_submit()
+    assert json.loads(state_path.read_text(encoding="utf-8"))["batch_id"] == "batch_1"
+
+
+def test_manual_responder_uses_the_split_suffix():
+    body = {"prompt": "Tags ?\n\nIngénieur MLOps chez Acme", "max_tokens": 500}
+    assert _manual_responder(body, "row-1::tags")["choices"][0]["text"] == "MLOps"
+    assert _manual_responder(body, "row-1::description")["choices"][0]["text"] != "MLOps"
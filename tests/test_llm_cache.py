@@ -0,0 +1,55 @@
+import time
+
+from services.llm_cache import LLMResultCache
+
+RESULT = {"Intérêt": "MLOps", "Description": "Ingénieur MLOps confirmé."}
+
+
+def make_key(text="Expert MLOps", **overrides):
+    parts = dict(prompt="prompt", tags_list=["MLOps", None], model="openai:gpt-4o-mini", language="fr")
+    parts.update(overrides)
+    return LLMResultCache.make_key(text, **parts)
+
+
+def test_key_changes_with_every_input():
+    base = make_key()
+    assert make_key("  Expert\nMLOps ") == base
+    assert make_key("Expert DevOps") != base
+    assert make_key(prompt="other prompt") != base
+    assert make_key(tags_list=["MLOps", "NLP"]) != base
+    assert make_key(model="openai:gpt-4o") != base
+    assert make_key(language="en") != base
+
+
+def test_get_put_and_counters(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite"))
+    key = make_key()
+
+    assert cache.get(key) is None
+    cache.put(key, RESULT)
+    assert cache.get(key) == RESULT
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite"), max_age_days=0)
+    key = make_key()
+    cache.put(key, RESULT)
+    time.sleep(0.01)
+
+    assert cache.get(key) is None
+    assert cache.evict() == 1
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    keys = [make_key(f"profile {i}") for i in range(3)]
+    for key in keys:
+        cache.put(key, RESULT)
+        time.sleep(0.01)
+    cache.get(keys[0])
+
+    assert cache.evict() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == RESULT
+    assert cache.get(keys[2]) == RESULT
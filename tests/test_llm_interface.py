@@ -1,6 +1,12 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
 import pytest
-from src.lipopulate.llm_interface import generate_interest_and_description
-from src.lipopulate.core.static_values import CENTER_OF_INTEREST_LIST
+import services.llm_interface as llm_interface
+from services.llm_interface import agenerate_many, generate_interest_and_description
+from core.static_values import CENTER_OF_INTEREST_LIST
+from utils import throttle
 
 @pytest.mark.skip(reason="Requires OpenAI API access")
 def test_generate_interest_and_description_live():
@@ -12,3 +18,146 @@ def test_generate_interest_and_description_live():
     assert isinstance(result["Intérêt"], str)
     assert isinstance(result["Description"], str)
     assert len(result["Description"]) > 20
+
+
+class FakeOpenAI:
+    """Records calls and answers chat completions with a canned JSON payload."""
+    calls = []
+    payload = {}
+    instances = []
+
+    def __init__(self, api_key=None, **kwargs):
+        FakeOpenAI.instances.append(api_key)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat))
+        self.completions = SimpleNamespace(create=self._completion)
+
+    def _chat(self, **kwargs):
+        FakeOpenAI.calls.append(("chat", kwargs))
+        message = SimpleNamespace(content=json.dumps(FakeOpenAI.payload, ensure_ascii=False))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _completion(self, **kwargs):
+        FakeOpenAI.calls.append(("completion", kwargs))
+        return SimpleNamespace(choices=[SimpleNamespace(text="MLOps, Data Engineering")])
+
+
+class FakeAsyncOpenAI:
+    """Async counterpart answering with a description derived from the profile text."""
+
+    closed = 0
+
+    def __init__(self, api_key=None, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat))
+
+    async def close(self):
+        FakeAsyncOpenAI.closed += 1
+
+    async def _chat(self, **kwargs):
+        text = kwargs["messages"][1]["content"]
+        FakeOpenAI.calls.append(("achat", kwargs))
+        await asyncio.sleep(0.01 if "slow" in text else 0)
+        if "broken" in text:
+            content = "pas du JSON"
+        else:
+            content = json.dumps({"Intérêt": "MLOps", "Description": f"Résumé du profil : {text}"}, ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setattr(llm_interface, "OpenAI", FakeOpenAI)
+    monkeypatch.setattr(llm_interface, "AsyncOpenAI", FakeAsyncOpenAI)
+    monkeypatch.setattr(llm_interface, "_providers", {})
+    monkeypatch.setattr(throttle, "_guards", {})
+    FakeOpenAI.calls = []
+    FakeOpenAI.instances = []
+    return FakeOpenAI
+
+
+def test_single_mode_makes_one_json_call(fake_openai):
+    fake_openai.payload = {
+        "Intérêt": ["MLOps", "Blockchain", "Data Engineering"],
+        "Description": "Ingénieur spécialisé dans la mise en production de modèles.",
+    }
+    result = generate_interest_and_description("Expert MLOps", CENTER_OF_INTEREST_LIST, mode="single")
+
+    assert [kind for kind, _ in fake_openai.calls] == ["chat"]
+    assert fake_openai.instances == ["test-key"]
+    assert fake_openai.calls[0][1]["response_format"] == {"type": "json_object"}
+    assert result["Intérêt"] == "MLOps, Data Engineering"
+    assert result["Description"].startswith("Ingénieur")
+
+
+def test_split_mode_is_still_available(fake_openai):
+    result = generate_interest_and_description("Expert MLOps", CENTER_OF_INTEREST_LIST, mode="split")
+
+    assert [kind for kind, _ in fake_openai.calls] == ["completion", "completion"]
+    assert result["Intérêt"] == "MLOps, Data Engineering"
+
+
+def test_single_mode_rejects_invalid_json():
+    with pytest.raises(ValueError, match="JSON"):
+        llm_interface._parse_single_response("Data Engineering, MLOps")
+
+
+def test_cache_hit_skips_provider(fake_openai, monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite"))
+    fake_openai.payload = {"Intérêt": "MLOps", "Description": "Ingénieur MLOps confirmé."}
+
+    first = generate_interest_and_description("Expert  MLOps", CENTER_OF_INTEREST_LIST, mode="single")
+    # Whitespace differences normalize to the same key; no client is built on a hit
+    monkeypatch.setattr(llm_interface, "OpenAI", None)
+    second = generate_interest_and_description("Expert MLOps ", CENTER_OF_INTEREST_LIST, mode="single")
+
+    assert second == first
+    assert len(fake_openai.calls) == 1
+
+
+def test_client_is_reused_and_api_key_respected(fake_openai):
+    fake_openai.payload = {"Intérêt": "MLOps", "Description": "Ingénieur MLOps confirmé."}
+    for _ in range(3):
+        generate_interest_and_description("Expert MLOps", CENTER_OF_INTEREST_LIST, mode="single")
+    generate_interest_and_description("Expert MLOps", CENTER_OF_INTEREST_LIST, api_key="other-key", mode="single")
+
+    assert fake_openai.instances == ["test-key", "other-key"]
+
+
+def test_agenerate_many_keeps_order_and_reports_errors(fake_openai):
+    texts = ["slow profile A", "profile B", "broken profile C", "profile D"]
+    results = asyncio.run(agenerate_many(
+        texts, CENTER_OF_INTEREST_LIST, mode="single", max_concurrency=2, requests_per_minute=6000,
+    ))
+
+    assert [r["Description"] for r in results if isinstance(r, dict)] == [
+        f"Résumé du profil : {text}" for text in texts if "broken" not in text
+    ]
+    assert isinstance(results[2], ValueError)
+    assert len(fake_openai.calls) == 4
+
+
+def test_agenerate_many_serves_cache_hits(fake_openai, monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite"))
+    texts = ["profile A", "profile B"]
+
+    first = asyncio.run(agenerate_many(texts, CENTER_OF_INTEREST_LIST, mode="single"))
+    second = asyncio.run(agenerate_many(texts + ["profile C"], CENTER_OF_INTEREST_LIST, mode="single"))
+
+    assert second[:2] == first
+    assert len(fake_openai.calls) == 3
+
+
+def test_async_client_of_a_previous_loop_is_closed(fake_openai):
+    provider = llm_interface.OpenAIProvider("test-key")
+    FakeAsyncOpenAI.closed = 0
+
+    async def generate():
+        return await provider.agenerate("profile", CENTER_OF_INTEREST_LIST)
+
+    asyncio.run(generate())
+    asyncio.run(generate())
+
+    assert FakeAsyncOpenAI.closed == 1
@@ -0,0 +1,63 @@
+import json
+import sys
+
+import pytest
+from loguru import logger
+
+from utils import logging_config
+from utils.logging_config import configure_logging, log_sampled, should_sample
+
+
+@pytest.fixture(autouse=True)
+def reset_logging(monkeypatch):
+    monkeypatch.setattr(logging_config, "_sample_counts", {})
+    monkeypatch.setattr(logging_config, "_configured", False)
+    yield
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+def test_should_sample_keeps_the_first_and_every_nth_call():
+    kept = [i for i in range(10) if should_sample("poll", every=4)]
+    assert kept == [0, 4, 8]
+    # Counters are per key
+    assert should_sample("other", every=4)
+
+
+def test_log_sampled_reads_the_rate_from_env(monkeypatch):
+    monkeypatch.setenv("LOG_SAMPLE_EVERY", "3")
+    messages = []
+    logger.remove()
+    logger.add(lambda message: messages.append(message.record["message"]), level="DEBUG")
+
+    for i in range(7):
+        log_sampled("brightdata_poll", "DEBUG", "poll {}", i)
+
+    assert messages == ["poll 0", "poll 3", "poll 6"]
+
+
+def test_disabled_levels_do_not_format_arguments(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    configure_logging(log_dir=str(tmp_path))
+
+    class Expensive:
+        def __format__(self, spec):
+            raise AssertionError("formatted a filtered-out record")
+
+    logger.debug("profile {}", Expensive())
+    logger.complete()
+
+
+def test_file_sink_writes_json_lines(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_JSON", "true")
+    configure_logging(level="DEBUG", log_dir=str(tmp_path))
+    # A second call is a no-op
+    configure_logging(level="ERROR", log_dir=str(tmp_path / "other"))
+
+    logger.debug("Snapshot {} status: {}", "s_1", "running")
+    logger.complete()
+
+    records = [json.loads(line)["record"] for line in (tmp_path / "omni.log").read_text(encoding="utf-8").splitlines()]
+    assert [record["message"] for record in records] == ["Snapshot s_1 status: running"]
+    assert records[0]["level"]["name"] == "DEBUG"
+    assert not (tmp_path / "other").exists()
@@ -0,0 +1,274 @@
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import enrich_from_csv as enrich
+from core import manifest as manifest_module
+from core import retry_queue
+from core.checkpoint import CheckpointJournal
+from core.manifest import CHANGED, EXPIRED, NEW, UNCHANGED, EnrichmentManifest, contact_key, profile_fingerprint
+
+RESULT = {"Intérêt": "MLOps", "Description": "Ingénieur MLOps confirmé."}
+
+
+def contact(i, **fields):
+    return {
+        "Prénom": f"Prenom{i}",
+        "Nom": f"Nom{i}",
+        "Email": f"person{i}@example.com",
+        "Métier": "Data Engineer",
+        "Intérêt": "",
+        "Domain": "Tech",
+        "Description": "",
+        "Linkedin": f"https://www.linkedin.com/in/person-{i}",
+        **fields,
+    }
+
+
+def test_contact_key_prefers_record_id_then_email_then_url():
+    assert contact_key({"Record ID": "rec1", "Email": "a@example.com"}) == "id:rec1"
+    assert contact_key({"Email": " A@Example.com ", "Linkedin": "alice"}) == "email:a@example.com"
+    assert contact_key({"Email": "", "Linkedin": "https://fr.linkedin.com/in/Alice/"}) == "url:https://www.linkedin.com/in/alice"
+    assert contact_key({"Métier": "Data Engineer"}).startswith("row:")
+
+
+def test_check_classifies_new_changed_expired_unchanged(tmp_path):
+    manifest = EnrichmentManifest(str(tmp_path / "manifest.sqlite"), ttl_seconds=3600)
+    row = contact(1)
+    assert manifest.check(row).status == NEW
+
+    manifest.record(row, RESULT, "hash", checked_at=time.time() - 60)
+    decision = manifest.check(row)
+    assert decision.status == UNCHANGED
+    assert decision.entry.result == RESULT
+
+    # Names, email case and URL formatting are not enrichment inputs
+    assert manifest.check({**row, "Nom": "Autre", "Email": "Person1@example.com", "Linkedin": "person-1"}).status == UNCHANGED
+    assert manifest.check({**row, "Métier": "MLOps Engineer"}).status == CHANGED
+    assert manifest.check({**row, "Linkedin": "https://www.linkedin.com/in/someone-else"}).status == CHANGED
+    assert manifest.check(row, now=time.time() + 3600).status == EXPIRED
+
+
+def test_rows_of_one_contact_keep_their_own_fingerprints(tmp_path):
+    manifest = EnrichmentManifest(str(tmp_path / "manifest.sqlite"))
+    engineer, researcher = contact(1), contact(1, Métier="Chercheur NLP")
+    manifest.record(engineer, RESULT, "hash")
+    manifest.record(researcher, {"Intérêt": "NLP", "Description": "Chercheur."}, "other")
+
+    assert manifest.check(engineer).status == UNCHANGED
+    assert manifest.check(engineer).entry.result == RESULT
+    assert manifest.check(researcher).entry.result["Intérêt"] == "NLP"
+    assert len(manifest) == 2
+
+
+def test_profiles_without_linkedin_never_expire(tmp_path):
+    manifest = EnrichmentManifest(str(tmp_path / "manifest.sqlite"), ttl_seconds=1)
+    row = contact(1, Linkedin="")
+    manifest.record(row, RESULT, checked_at=1.0)
+    assert manifest.check(row).status == UNCHANGED
+
+
+@pytest.fixture
+def pipeline_run(tmp_path, monkeypatch):
+    """Run enrich_from_csv.main on `rows`, counting scrapes and generations."""
+    calls = {"scrape": [], "generate": 0}
+    profiles = {}
+    failures = {}
+
+    def fake_scrape(linkedin_url):
+        calls["scrape"].append(linkedin_url)
+        if linkedin_url in failures:
+            raise failures[linkedin_url]
+        return profiles.get(linkedin_url, {"summary": f"Profil {linkedin_url}", "headline": "Data Engineer", "experience": []})
+
+    def fake_process_profile(profile_dict, method="llm"):
+        calls["generate"] += 1
+        return {"Intérêt": "Data Engineering", "Description": profile_dict["summary"]}
+
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+    monkeypatch.setattr(enrich, "INPUT_CSV", str(tmp_path / "input.csv"))
+    monkeypatch.setattr(enrich, "OUTPUT_CSV", str(tmp_path / "output.csv"))
+    monkeypatch.setattr(enrich, "CHECKPOINT_PATH", str(tmp_path / "checkpoint.jsonl"))
+    monkeypatch.setattr(enrich, "scrape_linkedin_profile", fake_scrape)
+    monkeypatch.setattr(enrich, "process_profile", fake_process_profile)
+    monkeypatch.setattr(retry_queue, "_queue", retry_queue.RetryQueue(str(tmp_path / "queue.sqlite")))
+    manifest = EnrichmentManifest(str(tmp_path / "manifest.sqlite"), ttl_seconds=7 * 86400)
+    monkeypatch.setattr(manifest_module, "_manifest", manifest)
+
+    def run(rows):
+        calls["scrape"].clear()
+        calls["generate"] = 0
+        pd.DataFrame(rows).to_csv(enrich.INPUT_CSV, index=False)
+        enrich.main()
+        return pd.read_csv(enrich.OUTPUT_CSV, dtype=str, keep_default_na=False)
+
+    run.calls = calls
+    run.profiles = profiles
+    run.failures = failures
+    run.manifest = manifest
+    return run
+
+
+def test_refresh_only_processes_new_changed_and_expired_contacts(pipeline_run):
+    rows = [contact(i) for i in range(6)]
+    first = pipeline_run(rows)
+    assert len(pipeline_run.calls["scrape"]) == 6
+    assert first["Intérêt"].eq("Data Engineering").all()
+
+    # Nothing changed: no scrape, no generation, same output
+    assert pipeline_run(rows).equals(first)
+    assert pipeline_run.calls == {"scrape": [], "generate": 0}
+
+    rows[1]["Métier"] = "MLOps Engineer"           # changed input
+    rows[2]["Nom"] = "Renommé"                     # not an enrichment input
+    rows.append(contact(6))                        # new contact
+    for i in (3, 4):                               # scrapes past the TTL
+        entry = pipeline_run.manifest.get(contact_key(rows[i]))
+        pipeline_run.manifest.record(rows[i], entry.result, entry.profile_hash, checked_at=time.time() - 8 * 86400,
+                                     generator=enrich.generation_signature())
+    url_3, url_4 = rows[3]["Linkedin"], rows[4]["Linkedin"]
+    pipeline_run.profiles[url_4] = {"summary": "Nouveau poste : chercheur NLP", "headline": "NLP", "experience": []}
+
+    output = pipeline_run(rows)
+    assert sorted(pipeline_run.calls["scrape"]) == sorted([rows[1]["Linkedin"], url_3, url_4, rows[6]["Linkedin"]])
+    # The expired profile that did not move keeps its result without a new generation
+    assert pipeline_run.calls["generate"] == 3
+    assert output.loc[4, "Description"].startswith("Nouveau poste : chercheur NLP")
+    assert output.loc[3, "Description"] == first.loc[3, "Description"]
+    assert pipeline_run.manifest.check(rows[3], generator=enrich.generation_signature()).status == UNCHANGED
+
+
+def test_rows_enriched_before_the_manifest_are_adopted(pipeline_run):
+    rows = [contact(0, **RESULT), contact(1)]
+    output = pipeline_run(rows)
+    assert pipeline_run.calls["scrape"] == [rows[1]["Linkedin"]]
+    assert output.loc[0, "Intérêt"] == "MLOps"
+    assert pipeline_run.manifest.check(rows[0], generator=enrich.generation_signature()).status == UNCHANGED
+
+    # Once adopted, an input change re-enriches the row even though its columns are filled
+    rows[0]["Domain"] = "Santé"
+    output = pipeline_run(rows)
+    assert pipeline_run.calls["scrape"] == [rows[0]["Linkedin"]]
+    assert output.loc[0, "Intérêt"] == "Data Engineering"
+
+
+def test_contacts_on_several_rows_are_not_enriched_again(pipeline_run):
+    rows = [contact(0), contact(0, Métier="Chercheur NLP", Linkedin="")]
+    pipeline_run(rows)
+    pipeline_run(rows)
+    assert pipeline_run.calls == {"scrape": [], "generate": 0}
+
+
+def test_results_of_another_method_are_enriched_again(pipeline_run, monkeypatch):
+    rows = [contact(0)]
+    monkeypatch.setattr(enrich, "METHOD", "manual")
+    pipeline_run(rows)
+
+    # Same profile, but a manual result does not stand for an LLM one
+    monkeypatch.setattr(enrich, "METHOD", "llm")
+    pipeline_run(rows)
+    assert pipeline_run.calls == {"scrape": [rows[0]["Linkedin"]], "generate": 1}
+    pipeline_run(rows)
+    assert pipeline_run.calls == {"scrape": [], "generate": 0}
+
+
+def test_batch_mode_selects_rows_like_a_live_run(pipeline_run, tmp_path, monkeypatch):
+    rows = [contact(0), contact(1)]
+    monkeypatch.setattr(enrich, "METHOD", "manual")
+    pipeline_run(rows)
+
+    # Journaled manual results do not stand for LLM ones: both rows go to the batch
+    monkeypatch.setenv("LLM_BATCH_BACKEND", "local")
+    monkeypatch.setenv("LLM_BATCH_DIR", str(tmp_path / "batches"))
+    monkeypatch.setattr(enrich, "BATCH_DIR", str(tmp_path / "batches"))
+    monkeypatch.setattr(enrich, "BATCH_STATE_PATH", str(tmp_path / "batches" / "current_batch.json"))
+    enrich.batch_submit()
+    with open(enrich.BATCH_STATE_PATH, encoding="utf-8") as f:
+        assert json.load(f)["rows"] == 2
+    enrich.batch_ingest()
+
+    # Ingested results are in the manifest: a live LLM run has nothing left to do
+    monkeypatch.setattr(enrich, "METHOD", "llm")
+    pipeline_run(rows)
+    assert pipeline_run.calls == {"scrape": [], "generate": 0}
+    enrich.batch_submit()
+    assert not os.path.exists(enrich.BATCH_STATE_PATH)
+
+
+def test_values_edited_by_hand_are_kept_for_unchanged_contacts(pipeline_run):
+    rows = [contact(0), contact(1)]
+    pipeline_run(rows)
+    rows[0]["Intérêt"] = "NLP"                     # edited in Airtable, pulled back into the input
+
+    output = pipeline_run(rows)
+    assert pipeline_run.calls == {"scrape": [], "generate": 0}
+    assert output.loc[0, "Intérêt"] == "NLP"
+    assert output.loc[0, "Description"].startswith(f"Profil {rows[0]['Linkedin']}")
+
+
+def test_only_transient_failures_are_queued_and_successes_leave_the_queue(pipeline_run):
+    rows = [contact(0), contact(1)]
+    pipeline_run.failures[rows[0]["Linkedin"]] = TimeoutError("read timed out")
+    pipeline_run.failures[rows[1]["Linkedin"]] = ValueError("Profile not found")
+    pipeline_run(rows)
+    queue = retry_queue.get_retry_queue()
+    assert [entry["key"] for entry in queue.due(now=time.time() + 3600)] == [enrich.row_key(pd.Series(rows[0]))]
+
+    pipeline_run.failures.clear()
+    pipeline_run(rows)
+    assert queue.stats() == {"pending": 0, "dead": 0}
+
+
+def test_retry_drops_rows_enriched_since_their_failure(pipeline_run):
+    row = contact(0)
+    key = enrich.row_key(pd.Series(row))
+    queue = retry_queue.get_retry_queue()
+    queue.push(key, row, TimeoutError("read timed out"), retry_after=0)
+    # Enriched by a later run that left the queue entry behind
+    CheckpointJournal(enrich.CHECKPOINT_PATH).append(key, RESULT)
+
+    enrich.retry()
+    assert pipeline_run.calls["scrape"] == []
+    assert queue.stats() == {"pending": 0, "dead": 0}
+
+
+def test_cache_misses_are_scraped_in_one_snapshot_per_batch(pipeline_run, tmp_path, monkeypatch):
+    from adapters import linkedin_scraper_adapter as adapter
+    from scrapers.brightdata_scraper import BrightDataScraper
+    from utils import throttle
+
+    monkeypatch.setenv("SCRAPER_TYPE", "brightdata")
+    monkeypatch.setenv("BRIGHTDATA_API_KEY", "test-key")
+    monkeypatch.setenv("BRIGHTDATA_DATASET_ID", "test-dataset")
+    monkeypatch.setenv("BRIGHTDATA_CACHE_DIR", str(tmp_path / "fetched_json"))
+    monkeypatch.setenv("BRIGHTDATA_RATE_LIMIT", "0")
+    monkeypatch.setattr(throttle, "_guards", {})
+    monkeypatch.setattr(adapter, "_instances", {})
+    monkeypatch.setattr(enrich, "scrape_linkedin_profile", adapter.scrape_linkedin_profile)
+    triggered = []
+
+    def fake_trigger(self, batch):
+        triggered.append(list(batch))
+        return f"snap-{len(triggered)}"
+
+    def fake_records(self, snapshot_id):
+        return [{"input": {"url": url}, "about": f"Profil {url}", "current_company": {"title": "Data Engineer"}}
+                for url in triggered[int(snapshot_id.split("-")[1]) - 1]]
+
+    monkeypatch.setattr(BrightDataScraper, "_trigger_snapshot", fake_trigger)
+    monkeypatch.setattr(BrightDataScraper, "_wait_until_snapshot_ready", lambda self, snapshot_id: None)
+    monkeypatch.setattr(BrightDataScraper, "_fetch_snapshot_records", fake_records)
+
+    rows = [contact(i) for i in range(5)] + [contact(0, Linkedin="https://fr.linkedin.com/in/Person-0/")]
+    output = pipeline_run(rows)
+    assert len(triggered) == 1
+    assert sorted(triggered[0]) == sorted(row["Linkedin"] for row in rows[:5])
+    assert output["Description"].str.startswith("Profil https://www.linkedin.com/in/person-").all()
+
+
+def test_profile_fingerprint_is_order_independent():
+    assert profile_fingerprint({"a": 1, "b": [1, 2]}) == profile_fingerprint({"b": [1, 2], "a": 1})
+    assert profile_fingerprint({"a": 1}) != profile_fingerprint({"a": 2})
@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+
+import pytest
+
+from utils.metrics import RunMetrics
+
+
+def test_stages_and_counters_are_attributed_to_the_current_row(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    run = RunMetrics(str(path))
+
+    with run.row("row-1"):
+        with run.stage("llm_call"):
+            pass
+        with run.stage("llm_call"):
+            pass
+        run.incr("llm_prompt_tokens", 120)
+    with pytest.raises(TimeoutError):
+        with run.row("row-2"):
+            with run.stage("poll_wait"):
+                raise TimeoutError("slow")
+    # Outside of any row: aggregated only
+    run.incr("llm_prompt_tokens", 5)
+    run.close()
+
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [entry["row"] for entry in entries] == ["row-1", "row-2"]
+    assert set(entries[0]["stages"]) == {"llm_call"}
+    assert entries[0]["counters"] == {"llm_prompt_tokens": 120}
+    assert entries[1]["status"] == "error"
+    assert entries[1]["error"] == "TimeoutError"
+
+    assert run.rows == 2
+    assert run.counters["llm_prompt_tokens"] == 125
+    assert run.summary()["llm_call"]["count"] == 2
+
+
+def test_rows_are_tracked_per_thread():
+    run = RunMetrics()
+    rows = {}
+
+    def work(key):
+        with run.row(key) as current:
+            run.incr("calls")
+            rows[key] = current
+
+    threads = [threading.Thread(target=work, args=(f"row-{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(current["counters"] == {"calls": 1} for current in rows.values())
+    assert run.counters["calls"] == 8
+
+
+def test_summary_table_lists_stages_and_counters():
+    run = RunMetrics()
+    with run.row("row-1"):
+        run.add_time("poll_wait", 2.0)
+        run.add_time("llm_call", 1.0)
+        run.incr("scrape_cache_hits")
+
+    table = run.summary_table()
+
+    assert table.index("poll_wait") < table.index("llm_call")
+    assert "scrape_cache_hits" in table
+
+
+def test_run_level_stages_have_no_row_time_share():
+    run = RunMetrics()
+    run.add_time("prepass", 5.0)
+    with run.row("row-1"):
+        time.sleep(0.01)
+        run.add_time("llm_call", 0.005)
+
+    lines = {line.split()[0]: line for line in run.summary_table().splitlines()[2:] if line.split()}
+
+    assert not lines["prepass"].endswith("%")
+    assert lines["llm_call"].endswith("%")
+    assert 0 < float(lines["llm_call"].split()[-1].rstrip("%")) <= 100
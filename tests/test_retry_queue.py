@@ -0,0 +1,63 @@
+import time
+
+from core.retry_queue import RetryQueue
+from utils.throttle import CircuitOpenError
+
+ROW = {"Email": "ada@example.com", "Métier": "Data Engineer"}
+
+
+def test_push_schedules_retry_with_exponential_backoff(tmp_path):
+    queue = RetryQueue(str(tmp_path / "queue.sqlite"), base_delay=10, max_delay=25)
+
+    first = queue.push("k1", ROW, TimeoutError("slow"))
+    second = queue.push("k1", ROW, TimeoutError("slow"))
+    third = queue.push("k1", ROW, TimeoutError("slow"))
+
+    assert [first["attempts"], second["attempts"], third["attempts"]] == [1, 2, 3]
+    assert queue.backoff(1) == 10
+    assert queue.backoff(2) == 20
+    assert queue.backoff(3) == 25
+    assert third["next_retry_at"] - time.time() > 20
+    assert queue.stats() == {"pending": 1, "dead": 0}
+
+
+def test_due_returns_row_and_error_details(tmp_path):
+    queue = RetryQueue(str(tmp_path / "queue.sqlite"), base_delay=0)
+    queue.push("k1", ROW, ValueError("429 Too Many Requests"))
+    queue.push("k2", ROW, CircuitOpenError("brightdata", retry_after=300))
+
+    due = queue.due()
+
+    assert [entry["key"] for entry in due] == ["k1"]
+    assert due[0]["row"] == ROW
+    assert due[0]["error_class"] == "ValueError"
+    assert due[0]["error_message"] == "429 Too Many Requests"
+    assert queue.next_retry_at() is not None
+
+    queue.remove("k1")
+    assert queue.due() == []
+
+
+def test_rows_are_dead_after_max_attempts(tmp_path):
+    queue = RetryQueue(str(tmp_path / "queue.sqlite"), max_attempts=2, base_delay=0)
+    queue.push("k1", ROW, RuntimeError("boom"))
+    entry = queue.push("k1", ROW, RuntimeError("boom"))
+
+    assert entry["status"] == "dead"
+    assert queue.due() == []
+    assert queue.stats() == {"pending": 0, "dead": 1}
+
+
+def test_queue_survives_reopening(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    RetryQueue(path, base_delay=0).push("k1", ROW, RuntimeError("boom"))
+
+    assert [entry["key"] for entry in RetryQueue(path).due()] == ["k1"]
+
+
+def test_permanent_failures_are_parked_right_away(tmp_path):
+    queue = RetryQueue(str(tmp_path / "queue.sqlite"), base_delay=0)
+    entry = queue.push("k1", ROW, ValueError("Aucun tag valide"), permanent=True)
+
+    assert entry["status"] == "dead"
+    assert queue.stats() == {"pending": 0, "dead": 1}
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from core.runner import BackendLimits, ordered_map
+
+
+def test_ordered_map_preserves_input_order():
+    def slow_square(n):
+        time.sleep(0.01 * (5 - n % 5))
+        return n * n
+
+    results = list(ordered_map(slow_square, range(20), workers=6))
+
+    assert [item for item, _, _ in results] == list(range(20))
+    assert [result for _, result, _ in results] == [n * n for n in range(20)]
+
+
+def test_ordered_map_reports_errors_per_item():
+    def fail_on_odd(n):
+        if n % 2:
+            raise ValueError(f"odd {n}")
+        return n
+
+    results = list(ordered_map(fail_on_odd, range(4), workers=2))
+
+    assert [(item, result) for item, result, error in results if error is None] == [(0, 0), (2, 2)]
+    assert [str(error) for _, _, error in results if error is not None] == ["odd 1", "odd 3"]
+
+
+def test_backend_limit_bounds_concurrency():
+    limits = BackendLimits(scraper=2, llm=1)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def scrape(_):
+        nonlocal active, peak
+        with limits.scraper:
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    list(ordered_map(scrape, range(10), workers=8))
+
+    assert peak == 2
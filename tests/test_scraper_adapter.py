@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+import pytest
+import adapters.linkedin_scraper_adapter as adapter
+from scrapers.scrapper_interface import LinkedInScraper
+
+
+class FailingScraper(LinkedInScraper):
+    def scrape(self, linkedin_url):
+        raise ValueError("quota exceeded")
+
+
+class EchoScraper(LinkedInScraper):
+    def scrape(self, linkedin_url):
+        return {"summary": f"Echo {linkedin_url}", "headline": "", "experience": []}
+
+
+class UnconfiguredScraper(LinkedInScraper):
+    def __init__(self):
+        raise EnvironmentError("API key is missing")
+
+    def scrape(self, linkedin_url):
+        raise AssertionError("never built")
+
+
+class BrokenBatchScraper(LinkedInScraper):
+    def scrape(self, linkedin_url):
+        raise ValueError("unreachable")
+
+    def scrape_many(self, linkedin_urls):
+        raise ConnectionError("batch endpoint down")
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(adapter, "SCRAPER_REGISTRY", dict(adapter.SCRAPER_REGISTRY))
+    monkeypatch.setattr(adapter, "_instances", {})
+    adapter.register_scraper("failing", __name__, "FailingScraper")
+    adapter.register_scraper("echo", __name__, "EchoScraper")
+    adapter.register_scraper("unconfigured", __name__, "UnconfiguredScraper")
+    adapter.register_scraper("broken_batch", __name__, "BrokenBatchScraper")
+
+
+def test_import_does_not_load_scrapers():
+    code = (
+        "import sys, enrich_from_csv\n"
+        "assert not any(m.startswith(('scrapers.', 'linkedin_api')) for m in sys.modules), sorted(sys.modules)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, SCRAPER_TYPE="brightdata", BRIGHTDATA_API_KEY="",
+               PYTHONPATH=os.pathsep.join([os.path.join(root, "src"), root]))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_default_scraper_is_mock_and_formats_public_id(monkeypatch):
+    monkeypatch.setenv("SCRAPER_TYPE", "unknown")
+    profile = adapter.scrape_linkedin_profile("https://www.linkedin.com/in/alice-dupont/")
+
+    assert profile["summary"] == "Mock summary for alice-dupont"
+    assert adapter.get_scraper("mock") is adapter.get_scraper()
+
+
+def test_scrapers_are_tried_in_order():
+    profile = adapter.scrape_linkedin_profile("https://www.linkedin.com/in/bob/", ["failing", "echo"])
+    assert profile["summary"] == "Echo bob"
+
+    with pytest.raises(ValueError, match="failing: quota exceeded"):
+        adapter.scrape_linkedin_profile("https://www.linkedin.com/in/bob/", "failing")
+
+
+def test_batch_falls_through_to_next_scraper():
+    urls = ["https://www.linkedin.com/in/alice/", "https://www.linkedin.com/in/bob/"]
+    profiles = adapter.scrape_linkedin_profiles(urls, ["failing", "echo"])
+
+    assert {url: p["summary"] for url, p in profiles.items()} == {
+        urls[0]: "Echo alice",
+        urls[1]: "Echo bob",
+    }
+
+
+def test_unknown_scraper_raises():
+    with pytest.raises(ValueError, match="Unknown scraper"):
+        adapter.get_scraper("nope")
+
+
+def test_scrapers_that_fail_to_build_or_batch_fall_back():
+    url = "https://www.linkedin.com/in/bob/"
+    assert adapter.scrape_linkedin_profile(url, ["unconfigured", "echo"])["summary"] == "Echo bob"
+
+    profiles = adapter.scrape_linkedin_profiles([url], ["unconfigured", "broken_batch", "echo"])
+    assert profiles[url]["summary"] == "Echo bob"
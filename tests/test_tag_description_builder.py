@@ -1,4 +1,4 @@
-from lipopulate.tag_description_builder import build_interest_and_description
+from services.tag_description_builder import build_interest_and_description, build_interest_and_description_many
 
 import sys
 import os
@@ -19,3 +19,26 @@ def test_no_interest():
     result = build_interest_and_description(text)
     assert result["Intérêt"] == ""
     assert isinstance(result["Description"], str)
+
+def test_aliases_and_accents():
+    text = "Ingénieur ML-Ops, passionné de Vision par Ordinateur et de séries temporelles."
+    result = build_interest_and_description(text)
+    assert result["Intérêt"] == "MLOps, Time Series, Computer Vision"
+
+def test_whole_words_only():
+    text = "Organise des webinars sur la frugalité."
+    result = build_interest_and_description(text)
+    assert result["Intérêt"] == ""
+
+def test_tags_with_special_characters():
+    text = "Travaille sur l'Ethical/Green AI et la Generative AI (text) avec des LLMs."
+    result = build_interest_and_description(text)
+    assert result["Intérêt"] == "Ethical/Green AI, Generative AI (text)"
+
+def test_batch_matches_single_calls():
+    texts = [
+        "Expert en Data Engineering et Machine Learning.",
+        "Consultant généraliste sans spécialité data.",
+        "NLP researcher",
+    ]
+    assert build_interest_and_description_many(texts) == [build_interest_and_description(t) for t in texts]
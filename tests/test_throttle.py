@@ -0,0 +1,119 @@
+import time
+
+import pytest
+import requests
+
+from utils import throttle
+from utils.throttle import CircuitBreaker, CircuitOpenError, ProviderGuard, TokenBucket, get_provider_guard, is_backend_failure
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.05, abs=0.01)
+
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.05
+
+
+def test_circuit_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown=60)
+    guard = ProviderGuard("test", None, breaker)
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            with guard:
+                raise TimeoutError("slow backend")
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as excinfo:
+        with guard:
+            pass
+    assert excinfo.value.provider == "test"
+    assert excinfo.value.retry_after > 0
+
+
+def test_half_open_trial_closes_or_reopens_the_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    # Only one trial call at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.02)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_success_resets_the_failure_count():
+    guard = ProviderGuard("test", None, CircuitBreaker("test", failure_threshold=2))
+    with pytest.raises(TimeoutError), guard.circuit():
+        raise TimeoutError("boom")
+    with guard.circuit():
+        pass
+    with pytest.raises(TimeoutError), guard.circuit():
+        raise TimeoutError("boom")
+
+    assert guard.breaker.state == "closed"
+
+
+def test_guards_are_configured_from_env(monkeypatch):
+    monkeypatch.setattr(throttle, "_guards", {})
+    monkeypatch.setenv("PROXYCURL_RATE_LIMIT", "0")
+    monkeypatch.setenv("LINKEDIN_API_RATE_LIMIT", "0.5")
+    monkeypatch.setenv("LINKEDIN_API_BREAKER_THRESHOLD", "7")
+
+    assert get_provider_guard("proxycurl").bucket is None
+    linkedin = get_provider_guard("linkedin_api")
+    assert linkedin.bucket.rate == 0.5
+    assert linkedin.breaker.failure_threshold == 7
+    assert get_provider_guard("linkedin_api") is linkedin
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def test_only_provider_failures_count():
+    assert is_backend_failure(TimeoutError("slow"))
+    assert is_backend_failure(requests.ConnectionError("reset"))
+    assert is_backend_failure(http_error(429))
+    assert is_backend_failure(http_error(503))
+    assert not is_backend_failure(http_error(404))
+    assert not is_backend_failure(ValueError("profile not found"))
+    assert not is_backend_failure(KeyboardInterrupt())
+
+
+def test_bad_requests_do_not_open_the_circuit():
+    guard = ProviderGuard("test", None, CircuitBreaker("test", failure_threshold=2))
+    for error in (ValueError("profile not found"), http_error(404), ValueError("profile not found")):
+        with pytest.raises(type(error)), guard:
+            raise error
+    assert guard.breaker.state == "closed"
+    assert guard.breaker.failures == 0
+
+
+def test_neutral_error_frees_the_half_open_trial():
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0.01)
+    guard = ProviderGuard("test", None, breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    with pytest.raises(ValueError), guard:
+        raise ValueError("profile not found")
+    # Another trial is let through instead of the circuit staying stuck
+    with guard:
+        pass
+    assert breaker.state == "closed"
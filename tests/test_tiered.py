@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from core import pipeline
+from core.pipeline import decide_tier, process_profile
+from utils import metrics
+
+DATA_ENGINEER = {
+    "summary": "Data engineer : pipelines ETL avec Spark, Airflow et dbt, ingestion batch et streaming Kafka.",
+    "headline": "Data Engineer",
+    "experience": [{"title": "Data Engineer", "company": "BigDataCorp"}],
+}
+AMBIGUOUS = {
+    "summary": "Chercheur, enseigne et accompagne des startups sur des sujets variés.",
+    "headline": "Consultant indépendant",
+    "experience": [],
+}
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def fake_llm(profile_text, tags_list, provider="openai", **kwargs):
+        calls.append(profile_text)
+        return {"Intérêt": "NLP", "Description": "Chercheur en traitement du langage."}
+
+    monkeypatch.setattr(pipeline, "generate_interest_and_description", fake_llm)
+    return calls
+
+
+def test_obvious_profile_stays_local():
+    decision = decide_tier(pipeline.build_profile_text(DATA_ENGINEER))
+    assert decision.tier == "local"
+    assert decision.reason == "confident"
+    assert "Data Engineering" in decision.tags
+
+
+def test_thresholds_escalate():
+    text = pipeline.build_profile_text(DATA_ENGINEER)
+    assert decide_tier(text, min_confidence=0.99).reason == "low_confidence"
+    assert decide_tier(text, min_coverage=0.99).reason == "low_coverage"
+    assert decide_tier(pipeline.build_profile_text(AMBIGUOUS)).reason == "no_tag"
+
+
+def test_tiered_only_calls_the_llm_for_ambiguous_profiles(llm_calls, tmp_path):
+    run = metrics.start_run(str(tmp_path / "metrics.jsonl"))
+    with metrics.row("engineer") as engineer:
+        local = process_profile(DATA_ENGINEER, method="tiered")
+    with metrics.row("ambiguous") as ambiguous:
+        escalated = process_profile(AMBIGUOUS, method="tiered")
+    metrics.finish_run()
+
+    assert len(llm_calls) == 1
+    assert "Data Engineering" in local["Intérêt"]
+    assert local["Description"].startswith("Data Engineer – intérêts : ")
+    assert escalated == {"Intérêt": "NLP", "Description": "Chercheur en traitement du langage."}
+
+    assert engineer["labels"] == {"tier": "local", "tier_reason": "confident"}
+    assert ambiguous["labels"] == {"tier": "llm", "tier_reason": "no_tag"}
+    assert run.counters["tier_local"] == 1 and run.counters["tier_llm"] == 1
+    entries = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [entry["labels"]["tier"] for entry in entries] == ["local", "llm"]
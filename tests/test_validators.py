@@ -1,5 +1,5 @@
 import pytest
-from src.lipopulate.core.schema import GeneratedProfileResult
+from core.schema import GeneratedProfileResult, normalize_tags, normalize_tags_many
 
 def test_valid_interest_tags_pass():
     result = GeneratedProfileResult(
@@ -22,3 +22,21 @@ def test_no_valid_tags_raises():
             Intérêt="Inconnu, Autre",
             Description="Texte valable"
         )
+
+def test_tags_are_matched_case_and_accent_insensitively():
+    result = GeneratedProfileResult(
+        Intérêt="mlops, data engineering, Data-Gouvernance., ethical/green ai",
+        Description="Profil senior orienté production."
+    )
+    assert result.Intérêt == "MLOps, Data Engineering, Data Gouvernance, Ethical/Green AI"
+
+def test_tags_are_deduplicated_in_order():
+    assert normalize_tags("NLP, MLOps, nlp, ML Ops, Pizza AI") == ["NLP", "MLOps"]
+
+def test_llm_formatting_is_cleaned():
+    assert normalize_tags(["s : MLOps", "'Computer Vision'", "- Web;", "Generative AI (text)."]) == [
+        "MLOps", "Computer Vision", "Web", "Generative AI (text)"
+    ]
+
+def test_normalize_tags_many():
+    assert normalize_tags_many(["mlops", "", "Inconnu", "web, WEB"]) == [["MLOps"], [], [], ["Web"]]
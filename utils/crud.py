@@ -1,8 +1,129 @@
-def get_profile_text(profile_json):
+import os
+import re
+from typing import NamedTuple, Optional
+
+from utils import metrics
+
+# Experience entries kept ahead of the summary; older ones only fill what is left of the budget
+RECENT_EXPERIENCES = 5
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ProfileText(NamedTuple):
+    text: str
+    tokens: int
+    tokens_saved: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for prompt budgeting."""
+    return (len(text) + 3) // 4
+
+
+def get_profile_token_budget() -> int:
+    """Token budget of the profile text (PROFILE_TEXT_TOKEN_BUDGET, 0 = unlimited)."""
+    return int(os.getenv("PROFILE_TEXT_TOKEN_BUDGET", 600))
+
+
+def _clean(value) -> str:
+    return _WHITESPACE.sub(" ", str(value or "")).strip()
+
+
+def _key(value: str) -> str:
+    return value.casefold()
+
+
+def _experience_lines(experiences: list) -> list:
+    """
+    One line per distinct title, most recent first, with its distinct companies:
+    "Data Engineer (Acme, Foo)" instead of the same title repeated once per job.
+    """
+    companies_by_title = {}
+    for exp in experiences:
+        title, company = _clean(exp.get("title")), _clean(exp.get("company"))
+        if not title and not company:
+            continue
+        companies = companies_by_title.setdefault(_key(title), (title, {}))[1]
+        if company:
+            companies.setdefault(_key(company), company)
+
+    lines = []
+    for title, companies in companies_by_title.values():
+        company_list = ", ".join(companies.values())
+        if title and company_list:
+            lines.append(f"{title} ({company_list})")
+        else:
+            lines.append(title or company_list)
+    return lines
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, on a word boundary."""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + "…" if cut else ""
+
+
+def build_profile_text(profile_json: dict, token_budget: Optional[int] = None) -> ProfileText:
+    """
+    Flatten a LinkedIn profile into the text sent to the tagger, within a token budget.
+
+    Fields are taken by importance: headline, the most recent experiences, the summary,
+    then older experiences. Repeated titles/companies and fields identical to one already
+    kept (case-insensitive) are dropped; the field that overflows the budget is cut on a
+    word boundary.
+
+    Args:
+        profile_json (dict): Profile with "summary", "headline" and "experience".
+        token_budget (int): Max tokens of the text (defaults to PROFILE_TEXT_TOKEN_BUDGET, 0 = unlimited).
+    Returns:
+        ProfileText: The text, its estimated tokens and the tokens saved versus the raw concatenation.
+    """
+    if token_budget is None:
+        token_budget = get_profile_token_budget()
+
+    summary = _clean(profile_json.get("summary"))
+    headline = _clean(profile_json.get("headline"))
+    experiences = profile_json.get("experience") or []
+    raw_tokens = estimate_tokens(" ".join(
+        [summary, headline] + [f"{_clean(e.get('title'))} {_clean(e.get('company'))}" for e in experiences]
+    ).strip())
+
+    exp_lines = _experience_lines(experiences)
+    fields = [headline, *exp_lines[:RECENT_EXPERIENCES], summary, *exp_lines[RECENT_EXPERIENCES:]]
+
+    parts = []
+    used = 0
+    # Whole fields are compared: a short line ("Data") is kept even if a longer one contains it
+    seen = set()
+    for field in fields:
+        if not field or _key(field) in seen:
+            continue
+        seen.add(_key(field))
+        if token_budget:
+            remaining = token_budget - used
+            if remaining <= 0:
+                break
+            field = _truncate(field, remaining)
+            if not field:
+                continue
+        parts.append(field)
+        used += estimate_tokens(field) + 1
+
+    text = "\n".join(parts)
+    tokens = estimate_tokens(text)
+    saved = max(raw_tokens - tokens, 0)
+    metrics.incr("profile_tokens", tokens)
+    metrics.incr("profile_tokens_saved", saved)
+    return ProfileText(text, tokens, saved)
+
+
+def get_profile_text(profile_json, token_budget: Optional[int] = None) -> str:
     """
     Concatenate relevant fields from a LinkedIn profile JSON to a single text string.
     """
-    text = profile_json.get("summary", "") + " " + profile_json.get("headline", "")
-    for exp in profile_json.get("experience", []):
-        text += f" {exp.get('title', '')} {exp.get('company', '')}"
-    return text.strip()
\ No newline at end of file
+    return build_profile_text(profile_json, token_budget).text
+
@@ -0,0 +1,133 @@
+"""
+Shared HTTP client for scrapers and API helpers.
+
+One `requests.Session` per process keeps TLS connections alive between calls
+(polling loops hit the same host dozens of times per profile), retries 429 and
+5xx answers with exponential backoff (honouring Retry-After), and applies a
+per-host timeout to every request.
+
+Example usage:
+    from utils.http_client import get_http_client
+
+    http = get_http_client()
+    resp = http.get("https://api.brightdata.com/datasets/v3/progress/abc", headers=headers)
+    print(http.connection_stats())
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import metrics
+
+Timeout = Tuple[float, float]  # (connect, read) in seconds
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Per-host (connect, read) timeouts; other hosts use HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT
+HOST_TIMEOUTS: Dict[str, Timeout] = {
+    "api.brightdata.com": (5, 30),
+    "nubela.co": (5, 60),
+    "api.airtable.com": (5, 30),
+}
+
+
+class _IdempotentRetry(Retry):
+    """
+    Retry policy that never replays a POST the server may have processed: besides
+    connection failures, a POST is only retried on 429 (request rejected). Other
+    methods follow the default idempotent-methods policy.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return status_code == 429 and bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class PooledHTTPClient:
+    def __init__(
+        self,
+        pool_size: int = 20,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        default_timeout: Timeout = (5, 30),
+        host_timeouts: Optional[Dict[str, Timeout]] = None,
+    ):
+        self.default_timeout = default_timeout
+        self.host_timeouts = dict(HOST_TIMEOUTS if host_timeouts is None else host_timeouts)
+
+        retry = _IdempotentRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def timeout_for(self, url: str) -> Timeout:
+        return self.host_timeouts.get(urlsplit(url).hostname or "", self.default_timeout)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        response = self.session.request(method, url, **kwargs)
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            metrics.incr("http_retries", len(retries.history))
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Requests sent and TCP/TLS connections opened, summed over all pooled hosts."""
+        pools = self._adapter.poolmanager.pools
+        requests_sent = connections = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                requests_sent += pool.num_requests
+                connections += pool.num_connections
+        return {
+            "requests": requests_sent,
+            "connections": connections,
+            "reused": max(0, requests_sent - connections),
+        }
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[PooledHTTPClient] = None
+_client_lock = threading.Lock()
+
+def get_http_client() -> PooledHTTPClient:
+    """Process-wide client configured from HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR,
+    HTTP_CONNECT_TIMEOUT and HTTP_READ_TIMEOUT."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = PooledHTTPClient(
+                pool_size=int(os.getenv("HTTP_POOL_SIZE", 20)),
+                max_retries=int(os.getenv("HTTP_MAX_RETRIES", 3)),
+                backoff_factor=float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5)),
+                default_timeout=(
+                    float(os.getenv("HTTP_CONNECT_TIMEOUT", 5)),
+                    float(os.getenv("HTTP_READ_TIMEOUT", 30)),
+                ),
+            )
+        return _client
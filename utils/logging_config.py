@@ -0,0 +1,88 @@
+"""
+Logging configuration shared by every entry point (loguru).
+
+Library code only does `from loguru import logger` and logs with lazy brace
+formatting (`logger.debug("Snapshot {} status: {}", snapshot_id, state)`), so a
+message below LOG_LEVEL is dropped before its arguments are formatted.
+`configure_logging()` is called once by the CLI scripts and installs:
+    - a console sink on stderr at LOG_LEVEL;
+    - a rotating file sink in LOG_DIRECTORY/omni.log (JSON lines when LOG_JSON=true).
+Both sinks use `enqueue=True`: records are written by a background thread and
+the worker threads never block on stdout or disk.
+
+Repetitive messages (BrightData polling, waiting loops) go through `log_sampled`,
+which only emits the first occurrence and then one every LOG_SAMPLE_EVERY.
+
+Example usage:
+    from utils.logging_config import configure_logging, log_sampled
+
+    configure_logging()
+    log_sampled("brightdata_poll", "DEBUG", "📶 Snapshot {} status: {}", snapshot_id, state)
+"""
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+from loguru import logger
+
+CONSOLE_FORMAT = "<green>{time:HH:mm:ss}</green> | <level>{level: <7}</level> | <cyan>{name}</cyan> | {message}"
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <7} | {name}:{function}:{line} | {message}"
+
+_configured = False
+_configure_lock = threading.Lock()
+
+_sample_counts: Dict[str, int] = {}
+_sample_lock = threading.Lock()
+
+
+def configure_logging(level: Optional[str] = None, log_dir: Optional[str] = None, force: bool = False):
+    """
+    Replace loguru's default sink with the console and file sinks described above.
+    Safe to call several times: only the first call (or a call with force=True) configures.
+    Args:
+        level (str): Minimum level, defaulting to LOG_LEVEL (INFO).
+        log_dir (str): Directory of omni.log, defaulting to LOG_DIRECTORY (./data/logs).
+    """
+    global _configured
+    with _configure_lock:
+        if _configured and not force:
+            return
+        level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+        log_dir = log_dir or os.getenv("LOG_DIRECTORY", "./data/logs")
+        serialize = os.getenv("LOG_JSON", "false").lower() in {"1", "true", "yes"}
+
+        logger.remove()
+        logger.add(sys.stderr, level=level, format=CONSOLE_FORMAT, enqueue=True, backtrace=False, diagnose=False)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+            logger.add(
+                os.path.join(log_dir, "omni.log"), level=level, format=FILE_FORMAT, serialize=serialize,
+                rotation=os.getenv("LOG_ROTATION", "10 MB"), retention=int(os.getenv("LOG_RETENTION", 5)),
+                enqueue=True, backtrace=True, diagnose=False, encoding="utf-8",
+            )
+        _configured = True
+
+
+def get_sample_every() -> int:
+    return max(1, int(os.getenv("LOG_SAMPLE_EVERY", 20)))
+
+
+def should_sample(key: str, every: Optional[int] = None) -> bool:
+    """True for the 1st, (every+1)th, (2*every+1)th... call with this key."""
+    every = every or get_sample_every()
+    with _sample_lock:
+        count = _sample_counts.get(key, 0)
+        _sample_counts[key] = count + 1
+    return count % every == 0
+
+
+def log_sampled(key: str, level: str, message: str, *args, every: Optional[int] = None, **kwargs):
+    """Log `message` only for a sample of the calls sharing `key` (see should_sample)."""
+    if should_sample(key, every):
+        logger.opt(depth=1).log(level, message, *args, **kwargs)
+
+
+def flush():
+    """Wait until the enqueued records are written (before printing tables to stdout, or exiting)."""
+    logger.complete()
@@ -0,0 +1,217 @@
+"""
+Per-row, per-stage timings and counters for the enrichment pipeline.
+
+Code anywhere in the pipeline times a stage or bumps a counter; the values are
+attributed to the row being processed by the current thread (see `row`) and
+aggregated for the whole run. Each finished row is written as one JSON line to
+the metrics file, and `summary_table()` renders the per-stage breakdown at the
+end of a run: it tells whether BrightData polling or OpenAI is the bottleneck.
+
+Stages: prepass, prefetch, url_normalization, cache_lookup, scrape_trigger, poll_wait, snapshot_fetch,
+profile_fetch, rate_limit_wait, text_build, llm_call, manual_tagging, validation.
+Counters: scrape_cache_hits/misses, llm_cache_hits/misses, http_retries,
+retry_queued, llm_prompt_tokens, llm_completion_tokens, profile_tokens, profile_tokens_saved,
+tier_local, tier_llm.
+Labels (per row only): tier, tier_reason of the tiered method.
+
+Example usage:
+    from utils import metrics
+
+    metrics.start_run("data/metrics/enrich_metrics.jsonl")
+    with metrics.row(row_key):
+        with metrics.stage("llm_call"):
+            ...
+        metrics.incr("llm_prompt_tokens", usage.prompt_tokens)
+    print(metrics.summary_table())
+    metrics.finish_run()
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+class RunMetrics:
+    """Aggregated stage durations and counters of a run, plus the optional JSONL row log."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.durations: Dict[str, List[float]] = {}
+        # Time of each stage spent inside rows, the base of the "% row time" column
+        self.row_durations: Dict[str, float] = {}
+        self.counters: Dict[str, float] = {}
+        self.rows = 0
+        self.row_seconds = 0.0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def _current_row(self) -> Optional[dict]:
+        return getattr(self._local, "row", None)
+
+    def add_time(self, name: str, seconds: float):
+        current = self._current_row()
+        with self._lock:
+            self.durations.setdefault(name, []).append(seconds)
+            if current is not None:
+                self.row_durations[name] = self.row_durations.get(name, 0.0) + seconds
+        if current is not None:
+            current["stages"][name] = current["stages"].get(name, 0.0) + seconds
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        current = self._current_row()
+        if current is not None:
+            current["counters"][name] = current["counters"].get(name, 0) + value
+
+    def annotate(self, name: str, value):
+        """Attach a label (e.g. the tier chosen for the row) to the current row, if any."""
+        current = self._current_row()
+        if current is not None:
+            current["labels"][name] = value
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    @contextmanager
+    def row(self, key: str):
+        """Attribute the stages and counters of the enclosed block to row `key`."""
+        current = {"row": key, "stages": {}, "counters": {}, "labels": {}}
+        previous = self._current_row()
+        self._local.row = current
+        start = time.perf_counter()
+        status, error = "ok", None
+        try:
+            yield current
+        except Exception as e:
+            status, error = "error", type(e).__name__
+            raise
+        finally:
+            self._local.row = previous
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.rows += 1
+                self.row_seconds += seconds
+            self._write({
+                "at": datetime.now(timezone.utc).isoformat(),
+                "row": key,
+                "status": status,
+                "error": error,
+                "seconds": round(seconds, 6),
+                "stages": {name: round(value, 6) for name, value in current["stages"].items()},
+                "counters": current["counters"],
+                "labels": current["labels"],
+            })
+
+    def _write(self, entry: dict):
+        if self._file is None:
+            return
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def summary(self) -> Dict[str, dict]:
+        """{stage: {"count", "total", "p50", "p95"}} in seconds."""
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self.durations.items()}
+        return {
+            name: {
+                "count": len(values),
+                "total": sum(values),
+                "p50": values[int(0.50 * (len(values) - 1))],
+                "p95": values[int(0.95 * (len(values) - 1))],
+            }
+            for name, values in durations.items()
+        }
+
+    def summary_table(self) -> str:
+        stages = self.summary()
+        lines = [
+            f"{'stage':<18} {'calls':>7} {'total s':>9} {'p50 ms':>8} {'p95 ms':>8} {'% row time':>10}",
+            "-" * 65,
+        ]
+        for name, s in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+            # Run-level stages (pre-pass, prefetch) are not part of any row: no share
+            in_rows = self.row_durations.get(name)
+            share = f"{100 * in_rows / self.row_seconds:>9.0f}%" if in_rows and self.row_seconds else ""
+            lines.append(
+                f"{name:<18} {s['count']:>7} {s['total']:>9.1f} {s['p50'] * 1000:>8.0f} {s['p95'] * 1000:>8.0f} {share:>10}"
+            )
+        elapsed = time.perf_counter() - self.started
+        lines.append("-" * 65)
+        lines.append(f"{self.rows} row(s) in {elapsed:.1f}s")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<24} {value:>12,.0f}")
+        return "\n".join(lines)
+
+
+_run = RunMetrics()
+_run_lock = threading.Lock()
+
+
+def start_run(path: Optional[str] = None) -> RunMetrics:
+    """
+    Start collecting a new run. Rows are logged to `path`, defaulting to METRICS_PATH
+    (data/metrics/enrich_metrics.jsonl); METRICS_ENABLED=false keeps the aggregates only.
+    """
+    global _run
+    if path is None and os.getenv("METRICS_ENABLED", "true").lower() in {"1", "true", "yes"}:
+        path = os.getenv("METRICS_PATH", "data/metrics/enrich_metrics.jsonl")
+    with _run_lock:
+        _run.close()
+        _run = RunMetrics(path)
+        return _run
+
+
+def finish_run() -> RunMetrics:
+    with _run_lock:
+        _run.close()
+        return _run
+
+
+def current_run() -> RunMetrics:
+    return _run
+
+
+def stage(name: str):
+    return _run.stage(name)
+
+
+def add_time(name: str, seconds: float):
+    _run.add_time(name, seconds)
+
+
+def incr(name: str, value: float = 1):
+    _run.incr(name, value)
+
+
+def annotate(name: str, value):
+    _run.annotate(name, value)
+
+
+def row(key: str):
+    return _run.row(key)
+
+
+def summary_table() -> str:
+    return _run.summary_table()
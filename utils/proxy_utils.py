@@ -1,19 +1,14 @@
 import requests
-import os
 from typing import Optional, Dict, Any
 from loguru import logger
 from dotenv import load_dotenv
+from utils.http_client import get_http_client
+from utils.throttle import is_backend_failure
 
 # Load environment variables
 load_dotenv()
 
-# Configuration des chemins
-LOG_DIRECTORY = os.getenv("LOG_DIRECTORY", "./data/logs")
-os.makedirs(LOG_DIRECTORY, exist_ok=True)
-
-# Configuration du logger
-log_path = os.path.join(LOG_DIRECTORY, "api_calls.log")
-logger.add(log_path, rotation="1 MB", level="INFO", backtrace=True, diagnose=True)
+# Les sinks (console, fichier LOG_DIRECTORY/omni.log) sont configurés par utils.logging_config
 
 def make_api_request(
     api_endpoint: str,
@@ -30,14 +25,19 @@ def make_api_request(
     
     Returns:
         Optional[Dict[str, Any]]: La réponse JSON si la requête réussit, None en cas d'erreur.
+    Raises:
+        RequestException: Erreurs de transport, timeouts, 429 et 5xx, pour que le disjoncteur
+            du fournisseur les compte (un 404 renvoie simplement None).
     """
     try:
-        response = requests.get(api_endpoint, headers=headers, params=params)
+        response = get_http_client().get(api_endpoint, headers=headers, params=params)
         response.raise_for_status()  # Vérifie les erreurs HTTP
-        logger.info("Requête réussie.")
+        logger.debug("Requête réussie : {}", api_endpoint)
         return response.json()  # Parse la réponse JSON
     except requests.exceptions.RequestException as e:
-        logger.error(f"Erreur lors de l'appel à l'API : {e}")
+        logger.error("Erreur lors de l'appel à l'API : {}", e)
+        if is_backend_failure(e):
+            raise
         return None
 
 def fetch_profile_by_details(
@@ -77,7 +77,7 @@ def fetch_profile_by_details(
     if location:
         params['location'] = location
 
-    logger.info(f"Paramètres envoyés : {params}")
+    logger.debug("Paramètres envoyés : {}", params)
     return make_api_request(API_ENDPOINT, headers, params)
 
 def fetch_profile(linkedin_profile_url: str, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
@@ -104,5 +104,5 @@ def fetch_profile(linkedin_profile_url: str, headers: Dict[str, str]) -> Optiona
         'fallback_to_cache': 'on-error',
     }
 
-    logger.info(f"Paramètres envoyés pour l'URL LinkedIn : {params}")
+    logger.debug("Paramètres envoyés pour l'URL LinkedIn : {}", params)
     return make_api_request(API_ENDPOINT, headers, params)
\ No newline at end of file
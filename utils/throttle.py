@@ -0,0 +1,277 @@
+"""
+Client-side rate limiting and circuit breaking per provider.
+
+Every backend (BrightData, Proxycurl, linkedin_api, OpenAI, Airtable) gets one process-wide
+`ProviderGuard` holding:
+    - a token bucket, so that worker threads never burst above the provider's rate
+      (cookie-based linkedin_api sessions get banned when they do);
+    - a circuit breaker, which opens after consecutive failures: while it is open,
+      calls fail immediately with CircuitOpenError instead of each row waiting for a
+      full timeout, and the row can be retried later. Only errors saying the provider
+      is unhealthy count as failures (`is_backend_failure`: transport errors, timeouts,
+      429 and 5xx); a bad request or a missing profile does not.
+
+Configuration (per provider prefix: BRIGHTDATA, PROXYCURL, LINKEDIN_API, OPENAI, AIRTABLE):
+    {PREFIX}_RATE_LIMIT         requests per second (0 = unlimited)
+    {PREFIX}_RATE_BURST         requests allowed back to back
+    {PREFIX}_BREAKER_THRESHOLD  consecutive failures before the circuit opens (0 = never)
+    {PREFIX}_BREAKER_COOLDOWN   seconds before a trial call is let through
+
+Example usage:
+    guard = get_provider_guard("proxycurl")
+    with guard:                       # fail fast if open, wait for a token, record the outcome
+        data = fetch_profile(url, headers)
+
+    with guard.circuit():             # several requests in one unit of work
+        guard.throttle()
+        trigger()
+        guard.throttle()
+        poll()
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import httpx
+import requests
+from loguru import logger
+
+from utils import metrics
+
+# (requests per second, burst, failure threshold, cooldown seconds)
+PROVIDER_DEFAULTS = {
+    "brightdata": (2.0, 5, 5, 60.0),
+    "proxycurl": (5.0, 5, 5, 60.0),
+    "linkedin_api": (0.2, 1, 3, 300.0),
+    "openai": (None, None, 5, 30.0),  # rate defaults to OPENAI_RPM / 60
+    # Airtable allows 5 requests per second per base: evenly spaced, with a margin for network jitter
+    "airtable": (4.5, 1, 5, 30.0),
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} circuit is open, retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class BackendUnavailable(RuntimeError):
+    """The provider answered, but cannot serve the request right now (e.g. a failed snapshot job)."""
+
+
+_TRANSPORT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    BackendUnavailable,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    httpx.TransportError,
+)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_backend_failure(exc: BaseException) -> bool:
+    """
+    Whether an error says the provider is unhealthy (transport error, timeout, 429, 5xx),
+    as opposed to a problem with the request itself (404, validation, parsing).
+    """
+    if not isinstance(exc, Exception):
+        return False
+    if isinstance(exc, _TRANSPORT_ERRORS):
+        return True
+    # The SDK is only imported by the LLM code: its errors cannot occur before that
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(exc, openai.APIConnectionError):
+        return True
+    status = _status_code(exc)
+    return status is not None and (status == 429 or status >= 500)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `reserve` books tokens ahead and returns how long the
+    caller has to wait, so sync and async callers share the same bucket and are served
+    in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, float(capacity or rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1):
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 1):
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Closed → open after `failure_threshold` consecutive failures; once `cooldown`
+    seconds have passed a single trial call is let through (half-open): its success
+    closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call must not reach the provider."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return
+            retry_after = max(0.0, self._opened_at + self.cooldown - time.monotonic())
+            raise CircuitOpenError(self.name, retry_after or self.cooldown)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_neutral(self):
+        """The call ended with an error that says nothing about the provider: only free the trial slot."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or (self.failure_threshold and self.failures >= self.failure_threshold):
+                if self._opened_at is None or self._trial_running:
+                    logger.warning("🔌 {} circuit opened after {} failure(s), cooling down {:.0f}s", self.name, self.failures, self.cooldown)
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class ProviderGuard:
+    """Rate limiter + circuit breaker of one provider."""
+
+    def __init__(self, name: str, bucket: Optional[TokenBucket], breaker: CircuitBreaker):
+        self.name = name
+        self.bucket = bucket
+        self.breaker = breaker
+
+    def throttle(self, requests: int = 1):
+        if self.bucket is not None:
+            wait = self.bucket.reserve(requests)
+            if wait:
+                metrics.add_time("rate_limit_wait", wait)
+                time.sleep(wait)
+
+    async def athrottle(self, requests: int = 1):
+        if self.bucket is not None:
+            wait = self.bucket.reserve(requests)
+            if wait:
+                metrics.add_time("rate_limit_wait", wait)
+                await asyncio.sleep(wait)
+
+    def record(self, exc: Optional[BaseException]):
+        """Record the outcome of a call: success, provider failure, or an error unrelated to the provider's health."""
+        if exc is None:
+            self.breaker.record_success()
+        elif is_backend_failure(exc):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_neutral()
+
+    @contextmanager
+    def circuit(self):
+        """Fail fast while the circuit is open and record the outcome of the block."""
+        self.breaker.before_call()
+        try:
+            yield self
+        except BaseException as e:
+            self.record(e)
+            raise
+        self.record(None)
+
+    def __enter__(self):
+        self.breaker.before_call()
+        self.throttle()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record(exc)
+        return False
+
+
+def _env(prefix: str, suffix: str, default, cast):
+    value = os.getenv(f"{prefix}_{suffix}")
+    return cast(value) if value not in (None, "") else default
+
+
+def build_provider_guard(name: str) -> ProviderGuard:
+    """Guard configured from the environment (see module docstring)."""
+    rate, burst, threshold, cooldown = PROVIDER_DEFAULTS.get(name, (0.0, None, 5, 60.0))
+    if name == "openai" and rate is None:
+        rate = float(os.getenv("OPENAI_RPM", 500)) / 60
+
+    prefix = name.upper()
+    rate = _env(prefix, "RATE_LIMIT", rate, float)
+    burst = _env(prefix, "RATE_BURST", burst, float)
+    threshold = _env(prefix, "BREAKER_THRESHOLD", threshold, int)
+    cooldown = _env(prefix, "BREAKER_COOLDOWN", cooldown, float)
+
+    bucket = TokenBucket(rate, burst) if rate else None
+    return ProviderGuard(name, bucket, CircuitBreaker(name, threshold, cooldown))
+
+
+_guards: Dict[str, ProviderGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_provider_guard(name: str) -> ProviderGuard:
+    """Process-wide guard of a provider, shared by every scraper/client instance."""
+    with _guards_lock:
+        if name not in _guards:
+            _guards[name] = build_provider_guard(name)
+        return _guards[name]